@@ -0,0 +1,359 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Computes the link bandwidth that the video modes of an EDID need.
+
+The modes whose pixel clock is known are evaluated at each chroma format and
+color depth the display accepts: the detailed timings of the base block and
+of CEA and VTB extensions, and the VICs of CEA video data blocks. Each one is
+checked against the TMDS character rate of HDMI links and the payload rate of
+DisplayPort links.
+
+The display accepts RGB, plus the YCbCr formats given by the feature byte of
+an EDID 1.4 digital base block and by the flags of CEA extensions. YCbCr
+4:2:0 comes from the YCbCr 4:2:0 Video and Capability Map Data Blocks. The
+largest color depth is that of an EDID 1.4 digital base block, else 8 bits.
+
+Typical use:
+
+  for mb in bandwidth.GetModeBandwidths(e):
+    if not mb.fits[0]:
+      ...
+"""
+
+import collections
+
+import data_block
+import descriptor
+import extensions
+import layout
+import video_block
+import visitor
+
+
+FORMAT_RGB = 'RGB 4:4:4'
+FORMAT_YCBCR444 = 'YCbCr 4:4:4'
+FORMAT_YCBCR422 = 'YCbCr 4:2:2'
+FORMAT_YCBCR420 = 'YCbCr 4:2:0'
+
+COLOR_FORMATS = (FORMAT_RGB, FORMAT_YCBCR444, FORMAT_YCBCR422, FORMAT_YCBCR420)
+
+# Bits per primary color evaluated, up to the largest the display accepts
+COLOR_DEPTHS = (6, 8, 10, 12, 16)
+
+LINK_TMDS = 'HDMI TMDS'
+LINK_DISPLAYPORT = 'DisplayPort'
+
+# limit is the largest TMDS character rate in kHz for LINK_TMDS, and the
+# largest payload rate in Mbit/s, after 8b/10b coding, for LINK_DISPLAYPORT.
+Link = collections.namedtuple('Link', ['name', 'kind', 'limit'])
+
+HDMI_1_4 = Link('HDMI 1.4', LINK_TMDS, 340000)
+HDMI_2_0 = Link('HDMI 2.0', LINK_TMDS, 600000)
+DP_RBR = Link('DisplayPort RBR, 4 lanes', LINK_DISPLAYPORT, 5184)
+DP_HBR = Link('DisplayPort HBR, 4 lanes', LINK_DISPLAYPORT, 8640)
+DP_HBR2 = Link('DisplayPort HBR2, 4 lanes', LINK_DISPLAYPORT, 17280)
+DP_HBR3 = Link('DisplayPort HBR3, 4 lanes', LINK_DISPLAYPORT, 25920)
+
+LINKS = (HDMI_1_4, HDMI_2_0, DP_RBR, DP_HBR, DP_HBR2, DP_HBR3)
+
+
+# pixel_clock is in kHz, as sent (after pixel repetition). tmds_clock is in
+# kHz, or None if HDMI does not carry the format at that depth; data_rate is
+# in Mbit/s. fits holds whether the mode fits each of the links evaluated.
+ModeBandwidth = collections.namedtuple('ModeBandwidth', [
+    'width', 'height', 'refresh', 'interlaced',
+    'vic',  # None for detailed timings
+    'pixel_clock',
+    'color_format',  # One of the FORMAT_* constants
+    'bits_per_color',
+    'tmds_clock',
+    'data_rate',
+    'fits'
+])
+
+
+# Bits of the formats of a mode, in the order of COLOR_FORMATS. _ANY stands
+# for the formats the display accepts for all modes, known once every CEA
+# extension has been seen.
+_RGB = 0x01
+_YCBCR444 = 0x02
+_YCBCR422 = 0x04
+_YCBCR420 = 0x08
+_ANY = 0x10
+
+# The formats of the color encoding bits (4-3) of byte 18h of EDID 1.4
+_BASE_FORMATS = (_RGB, _RGB | _YCBCR444, _RGB | _YCBCR422,
+                 _RGB | _YCBCR444 | _YCBCR422)
+
+_SAMPLES_PER_PIXEL = {
+    FORMAT_RGB: 3.0,
+    FORMAT_YCBCR444: 3.0,
+    FORMAT_YCBCR422: 2.0,
+    FORMAT_YCBCR420: 1.5
+}
+
+# YCbCr has no 6-bit form, and HDMI only carries 8 bits and up, with 4:2:2
+# limited to 12 bits.
+_DEPTHS = {
+    FORMAT_RGB: frozenset([6, 8, 10, 12, 16]),
+    FORMAT_YCBCR444: frozenset([8, 10, 12, 16]),
+    FORMAT_YCBCR422: frozenset([8, 10, 12, 16]),
+    FORMAT_YCBCR420: frozenset([8, 10, 12, 16])
+}
+
+_TMDS_DEPTHS = {
+    FORMAT_RGB: frozenset([8, 10, 12, 16]),
+    FORMAT_YCBCR444: frozenset([8, 10, 12, 16]),
+    FORMAT_YCBCR422: frozenset([8, 10, 12]),
+    FORMAT_YCBCR420: frozenset([8, 10, 12, 16])
+}
+
+_DEFAULT_DEPTH = 8
+
+
+def IsValidDepth(color_format, bits_per_color):
+  """Checks whether a chroma format is defined at a color depth.
+
+  Args:
+    color_format: One of the FORMAT_* constants.
+    bits_per_color: The integer number of bits per primary color.
+
+  Returns:
+    True if the format has that depth.
+  """
+  return bits_per_color in _DEPTHS[color_format]
+
+
+def TmdsClock(pixel_clock, color_format, bits_per_color):
+  """Computes the TMDS character rate HDMI needs to carry a mode.
+
+  Deep color raises the rate of RGB and YCbCr 4:4:4 in proportion to the
+  depth. YCbCr 4:2:2 is sent at the pixel clock up to 12 bits, and YCbCr
+  4:2:0 at half the rate of 4:4:4.
+
+  Args:
+    pixel_clock: The pixel clock of the mode, in kHz.
+    color_format: One of the FORMAT_* constants.
+    bits_per_color: The integer number of bits per primary color.
+
+  Returns:
+    A float (in kHz), or None if HDMI does not carry the format at that depth.
+  """
+  if bits_per_color not in _TMDS_DEPTHS[color_format]:
+    return None
+  if color_format == FORMAT_YCBCR422:
+    return float(pixel_clock)
+  if color_format == FORMAT_YCBCR420:
+    return pixel_clock * bits_per_color / 16.0
+  return pixel_clock * bits_per_color / 8.0
+
+
+def DataRate(pixel_clock, color_format, bits_per_color):
+  """Computes the rate of the video data of a mode, without link coding.
+
+  Args:
+    pixel_clock: The pixel clock of the mode, in kHz.
+    color_format: One of the FORMAT_* constants.
+    bits_per_color: The integer number of bits per primary color.
+
+  Returns:
+    A float (in Mbit/s).
+  """
+  return (pixel_clock * bits_per_color * _SAMPLES_PER_PIXEL[color_format] /
+          1000.0)
+
+
+def Fits(link, tmds_clock, data_rate):
+  """Checks whether a mode fits the budget of a link.
+
+  Args:
+    link: A Link record.
+    tmds_clock: The TMDS character rate of the mode (in kHz), or None.
+    data_rate: The rate of the video data of the mode (in Mbit/s).
+
+  Returns:
+    True if the mode fits.
+  """
+  if link.kind == LINK_TMDS:
+    return tmds_clock is not None and tmds_clock <= link.limit
+  return data_rate <= link.limit
+
+
+class BandwidthCollector(visitor.Visitor):
+  """Gathers the timed modes of an EDID and the formats it accepts."""
+
+  def __init__(self):
+    """Creates a BandwidthCollector object."""
+    self._order = []
+    self._formats = {}
+    self._sink_formats = _RGB
+    self._max_depth = _DEFAULT_DEPTH
+    self._edid = None
+
+  def _Add(self, width, height, refresh, interlaced, pixel_clock, vic,
+           formats):
+    """Records a mode.
+
+    Args:
+      width: The width in pixels.
+      height: The height of the frame in lines.
+      refresh: The refresh rate in Hz, as an integer.
+      interlaced: Whether the mode is interlaced.
+      pixel_clock: The pixel clock in kHz, as an integer.
+      vic: The VIC of the mode, or None for detailed timings.
+      formats: The bits of the formats of the mode.
+    """
+    key = (width, height, refresh, interlaced, pixel_clock, vic)
+    bits = self._formats.get(key)
+    if bits is None:
+      self._order.append(key)
+      bits = 0
+    self._formats[key] = bits | formats
+
+  def _AddDetailedTiming(self, desc):
+    """Records the mode of a detailed timing descriptor.
+
+    Args:
+      desc: A descriptor.Descriptor object; only detailed timings are used.
+    """
+    if isinstance(desc, descriptor.DetailedTimingDescriptor):
+      refresh = desc.refresh_rate
+      if refresh:
+        interlaced = desc.interlaced
+        height = desc.v_active_lines * (2 if interlaced else 1)
+        self._Add(desc.h_active_pixels, height, int(round(refresh)),
+                  interlaced, int(round(desc.pixel_clock * 1000)), None, _ANY)
+
+  def _AddVic(self, vic, formats):
+    """Records the mode of a VIC.
+
+    Args:
+      vic: The integer VIC.
+      formats: The bits of the formats of the mode.
+    """
+    fmt = video_block.GetVideoFormat(vic)
+    if fmt:
+      self._Add(fmt.width, fmt.height, fmt.refresh, fmt.interlaced,
+                fmt.pixel_clock, vic, formats)
+
+  def VisitEdid(self, e):
+    """Records the formats and color depth of the base block.
+
+    Args:
+      e: The edid.Edid object being walked.
+    """
+    self._edid = e
+    base = e.base_block
+    if base.video_input & 0x80 and (base.version, base.revision) >= (1, 4):
+      self._sink_formats = _BASE_FORMATS[(base.features >> 3) & 0x03]
+      self._max_depth = (e.basic_display.bits_per_primary_color or
+                         _DEFAULT_DEPTH)
+
+  def VisitDescriptor(self, desc, index):
+    """Records a detailed timing of the base block.
+
+    Args:
+      desc: A descriptor.Descriptor object.
+      index: The index (0-3) of the descriptor within the base EDID.
+    """
+    self._AddDetailedTiming(desc)
+
+  def VisitExtension(self, ext, index):
+    """Records the timed modes and formats of a CEA or VTB extension.
+
+    Args:
+      ext: An extensions.Extension object.
+      index: The index of the extension (starting at 1).
+    """
+    if isinstance(ext, extensions.CEAExtension):
+      if ext.ycbcr444_support:
+        self._sink_formats |= _YCBCR444
+      if ext.ycbcr422_support:
+        self._sink_formats |= _YCBCR422
+      for desc in ext.dtds:
+        self._AddDetailedTiming(desc)
+
+      # The capability map refers to the SVDs of the video data blocks in
+      # order, and may come before them.
+      svds = []
+      all_ycbcr420 = False
+      ycbcr420 = frozenset()
+      for db in ext.data_blocks or []:
+        if db.type == data_block.DB_TYPE_VIDEO:
+          svds.extend(db.short_video_descriptors)
+        elif db.type == data_block.DB_TYPE_YCBCR420_VIDEO:
+          for svd in db.short_video_descriptors:
+            self._AddVic(svd.vic, _YCBCR420)
+        elif db.type == data_block.DB_TYPE_YCBCR420_CAPABILITY_MAP:
+          if db.length == 1:  # No bitmap: all SVDs
+            all_ycbcr420 = True
+          else:
+            ycbcr420 = frozenset(db.supported_descriptor_indices)
+      for x, svd in enumerate(svds):
+        if all_ycbcr420 or x in ycbcr420:
+          self._AddVic(svd.vic, _ANY | _YCBCR420)
+        else:
+          self._AddVic(svd.vic, _ANY)
+
+    elif isinstance(ext, extensions.VTBExtension):
+      # As in modes.ModeCollector, only the DTDs the layout has regions for
+      block = ext.GetBlock()
+      edid_layout = self._edid.layout
+      region = edid_layout.Find(layout.REGION_EXTENSION)[index - 1]
+      for r in edid_layout.Find(layout.REGION_DTD, region):
+        self._AddDetailedTiming(descriptor.GetDescriptor(
+            block, r.start - region.start, self._edid.edid_version))
+
+  def GetBandwidths(self, links=LINKS):
+    """Evaluates the modes gathered so far.
+
+    Args:
+      links: A sequence of Link records to check the modes against.
+
+    Returns:
+      A list of ModeBandwidth records, one for each mode, format and depth the
+      display accepts.
+    """
+    sink_formats = self._sink_formats
+    max_depth = self._max_depth
+    results = []
+
+    for key in self._order:
+      width, height, refresh, interlaced, pixel_clock, vic = key
+      bits = self._formats[key]
+      if bits & _ANY:
+        bits |= sink_formats
+      for x, color_format in enumerate(COLOR_FORMATS):
+        if not bits & (1 << x):
+          continue
+        for depth in COLOR_DEPTHS:
+          if depth > max_depth or depth not in _DEPTHS[color_format]:
+            continue
+          tmds_clock = TmdsClock(pixel_clock, color_format, depth)
+          data_rate = DataRate(pixel_clock, color_format, depth)
+          results.append(ModeBandwidth(
+              width, height, refresh, interlaced, vic, pixel_clock,
+              color_format, depth, tmds_clock, data_rate,
+              tuple(Fits(link, tmds_clock, data_rate) for link in links)))
+
+    return results
+
+
+def GetModeBandwidths(e, links=LINKS):
+  """Evaluates the bandwidth of the timed modes of an EDID.
+
+  Each mode is evaluated at every format and depth the display accepts.
+
+  Args:
+    e: The edid.Edid object.
+    links: A sequence of Link records to check the modes against.
+
+  Returns:
+    A list of ModeBandwidth records.
+  """
+  collector = BandwidthCollector()
+  visitor.Walk(e, [collector])
+  return collector.GetBandwidths(links)
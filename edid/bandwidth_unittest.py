@@ -0,0 +1,122 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for bandwidth.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import unittest
+
+import bandwidth
+import edid
+import unittest_util
+
+
+class RateTest(unittest.TestCase):
+  """Tests TmdsClock, DataRate and Fits on a 148.5 MHz mode."""
+
+  def testTmdsClock(self):
+    self.assertEqual(bandwidth.TmdsClock(148500, bandwidth.FORMAT_RGB, 8),
+                     148500)
+    self.assertEqual(bandwidth.TmdsClock(148500, bandwidth.FORMAT_RGB, 10),
+                     185625)
+    self.assertEqual(
+        bandwidth.TmdsClock(148500, bandwidth.FORMAT_YCBCR422, 12), 148500)
+    self.assertEqual(
+        bandwidth.TmdsClock(148500, bandwidth.FORMAT_YCBCR420, 8), 74250)
+    # Not carried by HDMI
+    self.assertIsNone(bandwidth.TmdsClock(148500, bandwidth.FORMAT_RGB, 6))
+    self.assertIsNone(
+        bandwidth.TmdsClock(148500, bandwidth.FORMAT_YCBCR422, 16))
+
+  def testDataRate(self):
+    self.assertEqual(bandwidth.DataRate(148500, bandwidth.FORMAT_RGB, 8),
+                     3564)
+    self.assertEqual(
+        bandwidth.DataRate(148500, bandwidth.FORMAT_YCBCR422, 8), 2376)
+    self.assertEqual(
+        bandwidth.DataRate(148500, bandwidth.FORMAT_YCBCR420, 8), 1782)
+
+  def testFits(self):
+    # 3840x2160 @ 60 Hz in RGB, 8 bits
+    tmds_clock = bandwidth.TmdsClock(594000, bandwidth.FORMAT_RGB, 8)
+    data_rate = bandwidth.DataRate(594000, bandwidth.FORMAT_RGB, 8)
+    self.assertEqual(
+        [bandwidth.Fits(link, tmds_clock, data_rate)
+         for link in bandwidth.LINKS],
+        [False, True, False, False, True, True])
+    self.assertFalse(bandwidth.Fits(bandwidth.HDMI_2_0, None, 0))
+    self.assertTrue(bandwidth.Fits(bandwidth.DP_RBR, None, 5184))
+
+
+class GetModeBandwidthsTest(unittest.TestCase):
+  """Tests GetModeBandwidths on test_edid."""
+
+  def setUp(self):
+    self.edid = unittest_util.ReadTestEdid()
+
+  def _Find(self, results, width, height, refresh, vic):
+    """Fetches the evaluations of one mode.
+
+    Args:
+      results: A list of ModeBandwidth records.
+      width: The width in pixels.
+      height: The height of the frame in lines.
+      refresh: The refresh rate in Hz.
+      vic: The VIC of the mode, or None for a detailed timing.
+
+    Returns:
+      A dict of the ModeBandwidth records by color format and depth.
+    """
+    return dict(((mb.color_format, mb.bits_per_color), mb) for mb in results
+                if (mb.width, mb.height, mb.refresh, mb.vic) ==
+                (width, height, refresh, vic))
+
+  def testPreferredTiming(self):
+    found = self._Find(bandwidth.GetModeBandwidths(edid.Edid(self.edid)),
+                       1920, 1080, 60, None)
+    # 8 bits per color, and YCbCr 4:4:4 and 4:2:2 from the base block
+    self.assertEqual(sorted(found), [
+        (bandwidth.FORMAT_RGB, 6), (bandwidth.FORMAT_RGB, 8),
+        (bandwidth.FORMAT_YCBCR422, 8), (bandwidth.FORMAT_YCBCR444, 8)])
+
+    mb = found[bandwidth.FORMAT_RGB, 8]
+    self.assertEqual(mb.pixel_clock, 148500)
+    self.assertEqual(mb.tmds_clock, 148500)
+    self.assertEqual(mb.data_rate, 3564)
+    self.assertEqual(mb.fits, (True,) * len(bandwidth.LINKS))
+
+    # 6 bits only fits DisplayPort
+    self.assertEqual(found[bandwidth.FORMAT_RGB, 6].fits,
+                     (False, False, True, True, True, True))
+
+  def testVics(self):
+    results = bandwidth.GetModeBandwidths(edid.Edid(self.edid))
+    self.assertEqual(
+        sorted(set(mb.vic for mb in results if mb.vic is not None)),
+        [3, 4, 16, 19, 31])
+    mb = self._Find(results, 720, 480, 60, 3)[bandwidth.FORMAT_RGB, 8]
+    self.assertEqual(mb.pixel_clock, 27027)
+
+  def testColorDepth(self):
+    # 10 bits per primary color
+    self.edid[0x14] = (self.edid[0x14] & 0x8F) | 0x30
+    found = self._Find(bandwidth.GetModeBandwidths(edid.Edid(self.edid)),
+                       1920, 1080, 60, None)
+    self.assertEqual(found[bandwidth.FORMAT_RGB, 10].tmds_clock, 185625)
+    self.assertIn((bandwidth.FORMAT_YCBCR422, 10), found)
+    self.assertNotIn((bandwidth.FORMAT_RGB, 12), found)
+
+  def testLinks(self):
+    results = bandwidth.GetModeBandwidths(edid.Edid(self.edid),
+                                          [bandwidth.HDMI_1_4])
+    self.assertTrue(all(len(mb.fits) == 1 for mb in results))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,138 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Decodes all fixed-position fields of the 128-byte base EDID in one pass.
+
+The vendor/product section (bytes 08h-13h), basic display section (14h-18h),
+chromaticity section (19h-22h), established timings (23h-25h), extension count
+(7Eh) and checksum (7Fh) are unpacked with a single struct call into a
+BaseBlock record, which edid.Edid, basic_display.BasicDisplay and
+chromaticity.Chromaticity read their properties from.
+"""
+
+import collections
+import struct
+
+
+# Header (skipped), manufacturer ID (2 bytes, big endian), product code and
+# serial number (little endian), week, year, version, revision, 5 basic display
+# bytes, 2 chromaticity low-bit bytes, 8 chromaticity high-bit bytes, 3
+# established timing bytes, standard timings and descriptors (skipped),
+# extension count, checksum.
+_BASE_FORMAT = struct.Struct('<8x2BHI4B5B2B8B3B88xBB')
+
+
+BaseBlock = collections.namedtuple('BaseBlock', [
+    'manufacturer',  # 16-bit packed manufacturer ID
+    'product_code',
+    'serial_number',  # 0 if unset
+    'week',
+    'year',  # Years since 1990
+    'version',
+    'revision',
+    'video_input',  # Byte 14h
+    'horizontal_size',  # Byte 15h
+    'vertical_size',  # Byte 16h
+    'gamma',  # Byte 17h
+    'features',  # Byte 18h
+    'red_x',
+    'red_y',
+    'grn_x',
+    'grn_y',
+    'blue_x',
+    'blue_y',
+    'wht_x',
+    'wht_y',
+    'established_timings',  # Bytes 23h-25h as a 24-bit integer
+    'extension_count',
+    'checksum'
+])
+
+# The index just past the last byte each field of BaseBlock is read from
+_FIELD_ENDS = (0x0A, 0x0C, 0x10, 0x11, 0x12, 0x13, 0x14, 0x15, 0x16, 0x17,
+               0x18, 0x19, 0x1C, 0x1D, 0x1E, 0x1F, 0x20, 0x21, 0x22, 0x23,
+               0x26, 0x7F, 0x80)
+
+_NewTuple = tuple.__new__
+
+# The BaseBlock subclasses for base blocks cut short, by their length
+_short_classes = {}
+
+
+def _MissingField(name):
+  """Creates a property for a field that lies past the end of the EDID.
+
+  Args:
+    name: The name of the field.
+
+  Returns:
+    A property that raises IndexError.
+  """
+  def Get(unused_self):
+    raise IndexError('Base EDID block is too short to hold %s' % name)
+  return property(Get)
+
+
+def _GetShortClass(length):
+  """Fetches the BaseBlock subclass for a base block cut short.
+
+  Args:
+    length: The number of bytes of the base block, less than 128.
+
+  Returns:
+    A subclass of BaseBlock whose fields past length raise IndexError.
+  """
+  try:
+    return _short_classes[length]
+  except KeyError:
+    pass
+
+  attrs = {'__slots__': ()}
+  for name, end in zip(BaseBlock._fields, _FIELD_ENDS):
+    if end > length:
+      attrs[name] = _MissingField(name)
+  cls = _short_classes[length] = type('ShortBaseBlock', (BaseBlock,), attrs)
+  return cls
+
+
+def DecodeBaseBlock(edid, offset=0):
+  """Unpacks the fixed-position fields of a base EDID.
+
+  Args:
+    edid: The bytes of the EDID (any object supporting the buffer interface,
+        such as a bytearray or str).
+    offset: The index at which the base block starts.
+
+  Returns:
+    A BaseBlock record. If fewer than 128 bytes are available at offset, the
+    fields that lie past the end raise IndexError when read.
+  """
+  cls = BaseBlock
+  length = len(edid) - offset
+  if length < _BASE_FORMAT.size:
+    # Unpack the bytes there are, padded with zeroes
+    cls = _GetShortClass(max(length, 0))
+    edid = bytearray(edid[offset:]) + bytearray(_BASE_FORMAT.size - length)
+    offset = 0
+
+  (m_hi, m_lo, product, serial, week, year, version, revision, video_input,
+   h_size, v_size, gamma, features, rg_lo, bw_lo, rx, ry, gx, gy, bx, by, wx,
+   wy, et_1, et_2, et_3, ext_count, checksum) = _BASE_FORMAT.unpack_from(
+       edid, offset)
+
+  # tuple.__new__ skips the argument handling of BaseBlock.__new__, which
+  # costs more than the unpacking itself.
+  return _NewTuple(cls, (
+      (m_hi << 8) + m_lo, product, serial, week, year, version, revision,
+      video_input, h_size, v_size, gamma, features,
+      (rx << 2) + ((rg_lo >> 6) & 0x03),
+      (ry << 2) + ((rg_lo >> 4) & 0x03),
+      (gx << 2) + ((rg_lo >> 2) & 0x03),
+      (gy << 2) + (rg_lo & 0x03),
+      (bx << 2) + ((bw_lo >> 6) & 0x03),
+      (by << 2) + ((bw_lo >> 4) & 0x03),
+      (wx << 2) + ((bw_lo >> 2) & 0x03),
+      (wy << 2) + (bw_lo & 0x03),
+      (et_1 << 16) + (et_2 << 8) + et_3, ext_count, checksum))
@@ -9,17 +9,58 @@ Basic display info is stored in bytes 14h-18h of the base EDID.
 """
 
 
+# The values of the properties of BasicDisplay that are looked up from a few
+# bits, indexed by those bits. color_bit_depth is bits 6-4 of byte 14h,
+# digital_supports bits 3-0 and signal_level bits 6-5.
+COLOR_BIT_DEPTHS = (
+    None,
+    '6 Bits per Primary Color',
+    '8 Bits per Primary Color',
+    '10 Bits per Primary Color',
+    '12 Bits per Primary Color',
+    '14 Bits per Primary Color',
+    '16 Bits per Primary Color',
+    'Reserved (Do Not Use)'
+)
+
+# The number of bits per primary color of each entry of COLOR_BIT_DEPTHS
+BITS_PER_PRIMARY_COLOR = (None, 6, 8, 10, 12, 14, 16, None)
+
+DIGITAL_SUPPORTS = (
+    None, 'DVI', 'HDMI-a', 'HDMI-b', 'MDDI', 'DisplayPort'
+) + ('Reserved: Should not be used',) * 10
+
+SIGNAL_LEVELS = ('+0.7/-0.3 V', '+0.714/-0.286 V', '+1.0/-0.4 V', '+0.7/0 V')
+
+# display_type is indexed by the video input type (bit 7 of byte 14h) followed
+# by bits 4-3 of byte 18h.
+DISPLAY_TYPES = (
+    # Analog
+    'Monochrome/Grayscale',
+    'RGB color',
+    'Non-RGB color',
+    'Undefined',
+    # Digital
+    'RGB 4:4:4',
+    'RGB 4:4:4 + YCrCb 4:4:4',
+    'RGB 4:4:4 + YCrCb 4:2:2',
+    'RGB 4:4:4 + YCrCb 4:4:4 + YCrCb 4:2:2'
+)
+
+
 class BasicDisplay(object):
   """Class for parsing basic display block info from base EDID."""
 
-  def __init__(self, e, version):
+  __slots__ = ('_base', '_version')
+
+  def __init__(self, base, version):
     """Creates a BasicDisplay object.
 
     Args:
-      e: The edid (in list form).
+      base: The base_block.BaseBlock record of the EDID.
       version: A string indicating the EDID version (e.g., '1.4').
     """
-    self._edid = e
+    self._base = base
     self._version = version
 
   @property
@@ -32,7 +73,7 @@ class BasicDisplay(object):
     Returns:
       0 (Analog) or 1 (Digital).
     """
-    return (self._edid[0x14] >> 7) & 0x01
+    return (self._base.video_input >> 7) & 0x01
 
   ######################################
   # FOR DIGITAL VIDEO SIGNAL INTERFACE #
@@ -47,28 +88,19 @@ class BasicDisplay(object):
     Returns:
       A string indicating the number of bits per primary color.
     """
-    cbd = (self._edid[0x14] & 0x70) >> 4
+    return COLOR_BIT_DEPTHS[(self._base.video_input & 0x70) >> 4]
 
-    bits = 0
+  @property
+  def bits_per_primary_color(self):
+    """Fetches color bit depth as a number.
 
-    if cbd == 0x00:
-      return None
-    elif cbd == 0x01:
-      bits = 6
-    elif cbd == 0x02:
-      bits = 8
-    elif cbd == 0x03:
-      bits = 10
-    elif cbd == 0x04:
-      bits = 12
-    elif cbd == 0x05:
-      bits = 14
-    elif cbd == 0x06:
-      bits = 16
-    elif cbd == 0x07:
-      return 'Reserved (Do Not Use)'
-
-    return '%d Bits per Primary Color' % bits
+    For digital video signal interface only (not applicable for analog).
+
+    Returns:
+      An integer indicating the number of bits per primary color, or None if
+      undefined or reserved.
+    """
+    return BITS_PER_PRIMARY_COLOR[(self._base.video_input & 0x70) >> 4]
 
   @property
   def digital_supports(self):
@@ -79,22 +111,7 @@ class BasicDisplay(object):
     Returns:
       A string indicating the support.
     """
-    supp = self._edid[0x14] & 0x0F
-
-    if supp == 0x00:
-      return None
-    elif supp == 0x01:
-      return 'DVI'
-    elif supp == 0x02:
-      return 'HDMI-a'
-    elif supp == 0x03:
-      return 'HDMI-b'
-    elif supp == 0x04:
-      return 'MDDI'
-    elif supp == 0x05:
-      return 'DisplayPort'
-    else:
-      return 'Reserved: Should not be used'
+    return DIGITAL_SUPPORTS[self._base.video_input & 0x0F]
 
   #####################################
   # FOR ANALOG VIDEO SIGNAL INTERFACE #
@@ -110,16 +127,7 @@ class BasicDisplay(object):
     Returns:
       A string indicating video white and sync levels.
     """
-    vid_input = (self._edid[0x14] >> 5) & 0x03
-
-    if vid_input == 0x00:
-      return '+0.7/-0.3 V'
-    elif vid_input == 0x01:
-      return '+0.714/-0.286 V'
-    elif vid_input == 0x02:
-      return '+1.0/-0.4 V'
-    elif vid_input == 0x03:
-      return '+0.7/0 V'
+    return SIGNAL_LEVELS[(self._base.video_input >> 5) & 0x03]
 
   @property
   def blank_black(self):
@@ -130,7 +138,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether blank-to-black is expected.
     """
-    return self._edid[0x14] & 0x10 != 0
+    return self._base.video_input & 0x10 != 0
 
   @property
   def separate_sync(self):
@@ -141,7 +149,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether separate sync is supported.
     """
-    return self._edid[0x14] & 0x08 != 0
+    return self._base.video_input & 0x08 != 0
 
   @property
   def composite_sync(self):
@@ -152,7 +160,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether composite sync is supported.
     """
-    return self._edid[0x14] & 0x04 != 0
+    return self._base.video_input & 0x04 != 0
 
   @property
   def green_sync(self):
@@ -163,7 +171,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether green sync is supported.
     """
-    return self._edid[0x14] & 0x02 != 0
+    return self._base.video_input & 0x02 != 0
 
   @property
   def vsync_pulse(self):
@@ -175,7 +183,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether VSync pulse serration is supported.
     """
-    return self._edid[0x14] & 0x01 != 0
+    return self._base.video_input & 0x01 != 0
 
   ########################
   # BOTH INTERFACE TYPES #
@@ -188,8 +196,8 @@ class BasicDisplay(object):
     Returns:
       An integer that represents the maximum horizontal dimensions, or None.
     """
-    if self._edid[0x16]:
-      return self._edid[0x15]
+    if self._base.vertical_size:
+      return self._base.horizontal_size
     else:
       return None
 
@@ -200,8 +208,8 @@ class BasicDisplay(object):
     Returns:
       An integer that represents the maximum vertical dimensions, or None.
     """
-    if self._edid[0x15]:
-      return self._edid[0x16]
+    if self._base.horizontal_size:
+      return self._base.vertical_size
     else:
       return None
 
@@ -212,8 +220,8 @@ class BasicDisplay(object):
     Returns:
       A float indicating aspect ratio (portrait), or None.
     """
-    if not self._edid[0x15] and self._edid[0x16]:
-      aspect_ratio = 100.0 / (self._edid[0x16] + 99.0)
+    if not self._base.horizontal_size and self._base.vertical_size:
+      aspect_ratio = 100.0 / (self._base.vertical_size + 99.0)
       return '%.2f : 1' % aspect_ratio
     else:
       return None
@@ -225,8 +233,8 @@ class BasicDisplay(object):
     Returns:
       A float indicating aspect ratio (landscape), or None.
     """
-    if not self._edid[0x16] and self._edid[0x15]:
-      aspect_ratio = (self._edid[0x15] + 99.0) / 100.0
+    if not self._base.vertical_size and self._base.horizontal_size:
+      aspect_ratio = (self._base.horizontal_size + 99.0) / 100.0
       return '%.2f : 1' % aspect_ratio
     else:
       return None
@@ -241,7 +249,7 @@ class BasicDisplay(object):
     Returns:
       A float representing the display gamma.
     """
-    return (self._edid[0x17] + 100) / 100.0
+    return (self._base.gamma + 100) / 100.0
 
   # SUPPORTED FEATURES SECTION
 
@@ -252,7 +260,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether DPM standby is supported.
     """
-    return self._edid[0x18] & 0x80 != 0
+    return self._base.features & 0x80 != 0
 
   @property
   def dpm_suspend(self):
@@ -261,7 +269,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether DPM suspend is supported.
     """
-    return self._edid[0x18] & 0x40 != 0
+    return self._base.features & 0x40 != 0
 
   @property
   def active_off(self):
@@ -270,7 +278,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether DPM active-off is supported.
     """
-    return self._edid[0x18] & 0x20 != 0
+    return self._base.features & 0x20 != 0
 
   @property
   def display_type(self):
@@ -279,28 +287,8 @@ class BasicDisplay(object):
     Returns:
       A string that indicates display type.
     """
-    code = (self._edid[0x18] >> 3) & 0x03
-    color_type = ''
-
-    if self.video_input_type:  # Digital
-      if code == 0x00:
-        color_type = 'RGB 4:4:4'
-      elif code == 0x01:
-        color_type = 'RGB 4:4:4 + YCrCb 4:4:4'
-      elif code == 0x02:
-        color_type = 'RGB 4:4:4 + YCrCb 4:2:2'
-      elif code == 0x03:
-        color_type = 'RGB 4:4:4 + YCrCb 4:4:4 + YCrCb 4:2:2'
-    else:  # Analog
-      if code == 0x00:
-        color_type = 'Monochrome/Grayscale'
-      elif code == 0x01:
-        color_type = 'RGB color'
-      elif code == 0x02:
-        color_type = 'Non-RGB color'
-      elif code == 0x03:
-        color_type = 'Undefined'
-    return color_type
+    code = (self._base.features >> 3) & 0x03
+    return DISPLAY_TYPES[(self.video_input_type << 2) | code]
 
   @property
   def srgb_as_default(self):
@@ -309,7 +297,7 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether standard sRGB color space is supported.
     """
-    return self._edid[0x18] & 0x04 != 0
+    return self._base.features & 0x04 != 0
 
   @property
   def native_preferred_timing_mode(self):
@@ -321,7 +309,7 @@ class BasicDisplay(object):
       A boolean that indicates whether preferred timing mode includes native
       timing pixel format and refresh rate.
     """
-    return self._edid[0x18] & 0x02 != 0
+    return self._base.features & 0x02 != 0
 
   @property
   def cont_freq_support(self):
@@ -330,5 +318,5 @@ class BasicDisplay(object):
     Returns:
       A boolean that indicates whether continuous frequency is supported.
     """
-    return self._edid[0x18] & 0x01 != 0
+    return self._base.features & 0x01 != 0
 
@@ -13,13 +13,15 @@ Chromaticity object processes the 10-bit CIE xy coordinates: RGBW.
 class Chromaticity(object):
   """Class for parsing chromaticity section of base EDID."""
 
-  def __init__(self, edid):
+  __slots__ = ('_base',)
+
+  def __init__(self, base):
     """Creates a Chromaticity object.
 
     Args:
-      edid: The edid (in list form).
+      base: The base_block.BaseBlock record of the EDID.
     """
-    self._edid = edid
+    self._base = base
 
   @property
   def red_x(self):
@@ -28,7 +30,7 @@ class Chromaticity(object):
     Returns:
       An integer representing the Red X coordinate.
     """
-    return (self._edid[0x1B] << 2) + ((self._edid[0x19] >> 6) & 0x03)
+    return self._base.red_x
 
   @property
   def red_y(self):
@@ -37,7 +39,7 @@ class Chromaticity(object):
     Returns:
       An integer representing the Red Y coordinate.
     """
-    return (self._edid[0x1C] << 2) + ((self._edid[0x19] >> 4) & 0x03)
+    return self._base.red_y
 
   @property
   def grn_x(self):
@@ -46,7 +48,7 @@ class Chromaticity(object):
     Returns:
       An integer representing the Green X coordinate.
     """
-    return (self._edid[0x1D] << 2) + ((self._edid[0x19] >> 2) & 0x03)
+    return self._base.grn_x
 
   @property
   def grn_y(self):
@@ -55,7 +57,7 @@ class Chromaticity(object):
     Returns:
       An integer representing the Green Y coordinate.
     """
-    return (self._edid[0x1E] << 2) + (self._edid[0x19] & 0x03)
+    return self._base.grn_y
 
   @property
   def blue_x(self):
@@ -64,7 +66,7 @@ class Chromaticity(object):
     Returns:
       An integer representing the Blue X coordinate.
     """
-    return (self._edid[0x1F] << 2) + ((self._edid[0x1A] >> 6) & 0x03)
+    return self._base.blue_x
 
   @property
   def blue_y(self):
@@ -73,7 +75,7 @@ class Chromaticity(object):
     Returns:
       An integer representing the Blue Y coordinate.
     """
-    return (self._edid[0x20] << 2) + ((self._edid[0x1A] >> 4) & 0x03)
+    return self._base.blue_y
 
   @property
   def wht_x(self):
@@ -82,7 +84,7 @@ class Chromaticity(object):
     Returns:
       An integer representing the White X coordinate.
     """
-    return (self._edid[0x21] << 2) + ((self._edid[0x1A] >> 2) & 0x03)
+    return self._base.wht_x
 
   @property
   def wht_y(self):
@@ -91,4 +93,4 @@ class Chromaticity(object):
     Returns:
       An integer representing the White Y coordinate.
     """
-    return (self._edid[0x22] << 2) + (self._edid[0x1A] & 0x03)
+    return self._base.wht_y
@@ -11,6 +11,50 @@ import error
 import tools
 
 
+# The refresh rates of CVTs, with the bit of byte 2 that marks each supported
+_REFRESH_RATES = [
+    [0x10, '50Hz'],
+    [0x08, '60Hz'],
+    [0x04, '75Hz'],
+    [0x02, '85Hz'],
+    [0x01, '60Hz (reduced blanking)']
+]
+
+_REFRESH_RATE_FLAGS = tools.FlagTable(_REFRESH_RATES)
+
+# aspect_ratio, by bits 3-2 of byte 1
+_ASPECT_RATIOS = ('4:3 AR', '16:9 AR', '16:10 AR', '15:9 AR')
+
+# The bit of byte 2 marking each refresh rate as supported, by name
+_REFRESH_RATE_BITS = dict((name, bit) for bit, name in _REFRESH_RATES)
+
+
+def _PreferredRate(b):
+  """Decodes the preferred refresh rate from byte 2 of a CVT.
+
+  Args:
+    b: The value of byte 2.
+
+  Returns:
+    A string indicating the preferred refresh rate.
+  """
+  pref_code = (b >> 5) & 0x03  # Ranges 00-11 (0-3)
+  supp_code = b & 0x1F  # 5 bits long
+
+  if pref_code == 0x01 and supp_code & 0x01:
+    pref_code = 4
+  return _REFRESH_RATES[pref_code][1]
+
+
+# preferred_vertical_rate, by the value of byte 2
+_PREFERRED_RATES = [_PreferredRate(b) for b in xrange(0, 256)]
+
+# The values of byte 2 whose preferred rate is not marked as supported
+_UNSUPPORTED_PREFERRED = frozenset(
+    b for b in xrange(0, 256)
+    if not b & _REFRESH_RATE_BITS[_PREFERRED_RATES[b]])
+
+
 def GetCoordinatedVideoTiming(edid, start_index):
   """Returns a CoordinatedVideoTiming object if valid block exists.
 
@@ -31,13 +75,7 @@ def GetCoordinatedVideoTiming(edid, start_index):
 class CoordinatedVideoTiming(object):
   """Returns a CoordinatedVideoTiming object and its properties."""
 
-  _ref_rates = [
-      [0x10, '50Hz'],
-      [0x08, '60Hz'],
-      [0x04, '75Hz'],
-      [0x02, '85Hz'],
-      [0x01, '60Hz (reduced blanking)']
-  ]
+  __slots__ = ('_block',)
 
   def __init__(self, edid, start_index):
     """Creates a CoordinatedVideoTiming object.
@@ -55,7 +93,7 @@ class CoordinatedVideoTiming(object):
     Returns:
       The list of bytes of the coordinated video timing block.
     """
-    return self._block
+    return list(self._block)
 
   @property
   def active_vertical_lines(self):
@@ -74,19 +112,7 @@ class CoordinatedVideoTiming(object):
     Returns:
       A string indicating the aspect ratio.
     """
-    ar = (self._block[1] >> 2) & 0x03
-    asp_ratio = ''
-
-    if ar == 0x00:
-      asp_ratio = '4:3 AR'
-    elif ar == 0x01:
-      asp_ratio = '16:9 AR'
-    elif ar == 0x02:
-      asp_ratio = '16:10 AR'
-    elif ar == 0x03:
-      asp_ratio = '15:9 AR'
-
-    return asp_ratio
+    return _ASPECT_RATIOS[(self._block[1] >> 2) & 0x03]
 
   @property
   def preferred_vertical_rate(self):
@@ -96,23 +122,16 @@ class CoordinatedVideoTiming(object):
       A string indicating the preferred refresh rate; the returned value should
       also be included in supported_vertical_rates.
     """
-    pref_code = (self._block[2] >> 5) & 0x03  # Ranges 00-11 (0-3)
-    supp_code = self._block[2] & 0x1F  # 5 bits long
-
-    if pref_code == 0x01 and supp_code & 0x01:
-      pref_code = 4
-    return self._ref_rates[pref_code][1]
+    return _PREFERRED_RATES[self._block[2]]
 
   @property
   def supported_vertical_rates(self):
     """Fetches the list of supported refresh rates.
 
     Returns:
-      A dict of strings and booleans, each representing a refresh rate and
-      whether it is supported.
+      A tools.FlagSet of the supported refresh rates.
     """
-    supp_code = self._block[2] & 0x1F
-    return tools.DictFilter(self._ref_rates, supp_code)
+    return _REFRESH_RATE_FLAGS.Decode(self._block[2])
 
   def CheckErrors(self, index=None):
     """Checks for errors in the coordinated video timing block.
@@ -121,27 +140,45 @@ class CoordinatedVideoTiming(object):
       index: The index of the CoordinatedVideoTiming object within the EDID.
 
     Returns:
-      An error.Error object specifying details, if there is one; else, None.
+      A list of error.Error objects, empty if there are none.
+    """
+    return list(self._IterErrors(index))
+
+  def HasErrors(self):
+    """Checks whether CheckErrors would find errors, stopping at the first.
+
+    Returns:
+      True if the coordinated video timing has errors.
     """
-    loc = 'Coordinated video timing block %s' % ('#%d' % index if index else '')
-    errors = []
+    for _ in self._IterErrors():
+      return True
+    return False
+
+  def _IterErrors(self, index=None):
+    """Finds the errors of the coordinated video timing block, one at a time.
 
-    # Check that preferred refresh rate is supported
-    if self.preferred_vertical_rate not in self.supported_vertical_rates:
-      errors.append(error.Error(loc, 'Preferred refresh rate not supported',
-                                '%s supported' % self.preferred_vertical_rate,
-                                'Supported: %s' %
-                                self.supported_vertical_rates))
+    Args:
+      index: The index of the CoordinatedVideoTiming object within the EDID.
+
+    Yields:
+      error.Error objects.
+    """
+    # Check that preferred refresh rate is supported. The supported rates are
+    # only built for the error.
+    if self._block[2] in _UNSUPPORTED_PREFERRED:
+      yield error.NewError(
+          error.ERROR_CVT_PREFERRED_RATE,
+          (index, self.preferred_vertical_rate,
+           self.supported_vertical_rates.AsDict()),
+          offset=2)
 
     # Check for reserved 0 bits
     if self._block[1] & 0x03:
       # Error: Bits 1-0 of byte 2 in CVT should be set to '00'
-      errors.append(error.Error(loc, 'Bits 1-0 of byte 2 incorrectly set',
-                                0x00, self._block[1] & 0x03))
+      yield error.NewError(error.ERROR_CVT_RESERVED_BITS_1_0,
+                           (index, self._block[1] & 0x03), offset=1)
 
     if self._block[2] & 0x80:
       # Error: Bit 7 of byte 3 in CVT should be set to '0'
-      errors.append(error.Error(loc, 'Bit 7 of byte 3 incorrectly set', 0x00,
-                                self._block[2] & 0x80))
-
-    return errors
+      yield error.NewError(error.ERROR_CVT_RESERVED_BIT_7,
+                           (index, self._block[2] & 0x80), offset=2)
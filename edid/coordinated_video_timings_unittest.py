@@ -0,0 +1,79 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for coordinated_video_timings.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import unittest
+
+import coordinated_video_timings as cvt_module
+import error
+
+
+def MakeCvt(rates):
+  """Creates a 1728x1080 (16:10) CVT with a given byte 2.
+
+  Args:
+    rates: The value of byte 2: the preferred and supported refresh rates.
+
+  Returns:
+    A coordinated_video_timings.CoordinatedVideoTiming object.
+  """
+  return cvt_module.GetCoordinatedVideoTiming(
+      bytearray([0x1B, 0x28, rates]), 0)
+
+
+class PreferredRateTest(unittest.TestCase):
+  """Tests the check that the preferred refresh rate is supported."""
+
+  def _Codes(self, cvt):
+    """Lists the codes of the errors of a CVT.
+
+    Args:
+      cvt: A coordinated_video_timings.CoordinatedVideoTiming object.
+
+    Returns:
+      A list of integer error codes.
+    """
+    return [err.code for err in cvt.CheckErrors()]
+
+  def testSupported(self):
+    # Preferred 60 Hz, supported 60 Hz
+    cvt = MakeCvt(0x28)
+    self.assertEqual(cvt.preferred_vertical_rate, '60Hz')
+    self.assertEqual(self._Codes(cvt), [])
+    self.assertFalse(cvt.HasErrors())
+
+  def testReducedBlanking(self):
+    # Preferred 60 Hz with reduced blanking, which is the only rate supported
+    self.assertEqual(MakeCvt(0x21).preferred_vertical_rate,
+                     '60Hz (reduced blanking)')
+    self.assertEqual(self._Codes(MakeCvt(0x21)), [])
+
+  def testNotSupported(self):
+    # Preferred 50 Hz, supported 60 Hz
+    cvt = MakeCvt(0x08)
+    self.assertEqual(self._Codes(cvt), [error.ERROR_CVT_PREFERRED_RATE])
+    self.assertTrue(cvt.HasErrors())
+    err = cvt.CheckErrors(1)[0]
+    self.assertEqual(err.offset, 2)
+    self.assertEqual(err.found, 'Supported: %s' %
+                     cvt.supported_vertical_rates.AsDict())
+
+  def testEveryByte(self):
+    for rates in xrange(0x100):
+      cvt = MakeCvt(rates)
+      supported = cvt.supported_vertical_rates[cvt.preferred_vertical_rate]
+      self.assertEqual(
+          error.ERROR_CVT_PREFERRED_RATE in self._Codes(cvt), not supported,
+          hex(rates))
+
+
+if __name__ == '__main__':
+  unittest.main()
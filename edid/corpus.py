@@ -0,0 +1,758 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Checks and decodes many EDIDs at once, as NumPy arrays.
+
+A corpus of EDIDs is held as one (N, 128 * k) array of uint8, one row per
+EDID, padded with zeros to the length of the longest one, along with the
+true length of each EDID. Operations on a corpus work on whole columns of that
+array rather than on one Python object per EDID, and give the same results as
+the corresponding functions of the rest of the package, which remain the
+reference.
+
+NumPy is only needed by this module; the rest of the package does not use it.
+"""
+
+import collections
+
+import bandwidth
+import basic_display
+import descriptor
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+
+# Bits of the failures returned by CheckCorpus, one per check of error_check
+FAILED_HEADER = 0x01
+FAILED_CHECKSUM = 0x02
+FAILED_LENGTH = 0x04
+FAILED_WEEK = 0x08
+FAILED_EXTENSION_COUNT = 0x10
+
+# Bits of the flags returned by CheckRangeLimits, one per limit a DTD exceeds
+OUT_OF_RANGE_VERTICAL_RATE = 0x01
+OUT_OF_RANGE_HORIZONTAL_RATE = 0x02
+OUT_OF_RANGE_PIXEL_CLOCK = 0x04
+
+_MAGIC_HEADER = [0x00, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0x00]
+
+# Fields of the structured array returned by DecodeBaseBlocks, named after the
+# properties of edid.Edid, basic_display.BasicDisplay and
+# chromaticity.Chromaticity they hold. Properties that may be None are stored
+# as -1 (integers) or NaN (floats). String properties are stored as their
+# index in the table of basic_display; aspect ratios as the float they are
+# formatted from, and edid_version as version and revision. GetBaseBlockRecord
+# converts a row back into the values of the properties.
+BASE_BLOCK_FIELDS = [
+    # edid.Edid
+    ('manufacturer_id', 'S3'),
+    ('product_code', 'u2'),
+    ('serial_number', 'i8'),
+    ('manufacturing_week', 'i2'),
+    ('manufacturing_year', 'i2'),
+    ('model_year', 'i2'),
+    ('version', 'u1'),
+    ('revision', 'u1'),
+    ('extension_count', 'u1'),
+    # basic_display.BasicDisplay
+    ('video_input_type', 'u1'),
+    ('color_bit_depth', 'u1'),  # Index in COLOR_BIT_DEPTHS
+    ('digital_supports', 'u1'),  # Index in DIGITAL_SUPPORTS
+    ('signal_level', 'u1'),  # Index in SIGNAL_LEVELS
+    ('blank_black', '?'),
+    ('separate_sync', '?'),
+    ('composite_sync', '?'),
+    ('green_sync', '?'),
+    ('vsync_pulse', '?'),
+    ('horizontal_dim', 'i2'),
+    ('vertical_dim', 'i2'),
+    ('aspect_ratio_portrait', 'f8'),
+    ('aspect_ratio_landscape', 'f8'),
+    ('display_gamma', 'f8'),
+    ('dpm_standby', '?'),
+    ('dpm_suspend', '?'),
+    ('active_off', '?'),
+    ('display_type', 'u1'),  # Index in DISPLAY_TYPES
+    ('srgb_as_default', '?'),
+    ('native_preferred_timing_mode', '?'),
+    ('cont_freq_support', '?'),
+    # chromaticity.Chromaticity
+    ('red_x', 'u2'),
+    ('red_y', 'u2'),
+    ('grn_x', 'u2'),
+    ('grn_y', 'u2'),
+    ('blue_x', 'u2'),
+    ('blue_y', 'u2'),
+    ('wht_x', 'u2'),
+    ('wht_y', 'u2')
+]
+
+# The tables the string fields index, as looked up by GetBaseBlockRecord
+_FIELD_TABLES = {
+    'color_bit_depth': basic_display.COLOR_BIT_DEPTHS,
+    'digital_supports': basic_display.DIGITAL_SUPPORTS,
+    'signal_level': basic_display.SIGNAL_LEVELS,
+    'display_type': basic_display.DISPLAY_TYPES
+}
+
+_OPTIONAL_FIELDS = frozenset([
+    'serial_number', 'manufacturing_week', 'manufacturing_year', 'model_year',
+    'horizontal_dim', 'vertical_dim'
+])
+
+# Bits of byte 14h (video input) and 18h (features) held by the boolean fields
+_VIDEO_INPUT_FLAGS = [
+    ('blank_black', 0x10),
+    ('separate_sync', 0x08),
+    ('composite_sync', 0x04),
+    ('green_sync', 0x02),
+    ('vsync_pulse', 0x01)
+]
+
+_FEATURE_FLAGS = [
+    ('dpm_standby', 0x80),
+    ('dpm_suspend', 0x40),
+    ('active_off', 0x20),
+    ('srgb_as_default', 0x04),
+    ('native_preferred_timing_mode', 0x02),
+    ('cont_freq_support', 0x01)
+]
+
+# The chromaticity fields, with the byte of their 8 high bits, the byte of
+# their 2 low bits and the shift of those low bits.
+_CHROMATICITY_FIELDS = [
+    ('red_x', 0x1B, 0x19, 6),
+    ('red_y', 0x1C, 0x19, 4),
+    ('grn_x', 0x1D, 0x19, 2),
+    ('grn_y', 0x1E, 0x19, 0),
+    ('blue_x', 0x1F, 0x1A, 6),
+    ('blue_y', 0x20, 0x1A, 4),
+    ('wht_x', 0x21, 0x1A, 2),
+    ('wht_y', 0x22, 0x1A, 0)
+]
+
+
+# data is the (N, 128 * k) uint8 array of the EDIDs, padded with zeros, and
+# lengths the (N,) array of their lengths in bytes.
+Corpus = collections.namedtuple('Corpus', ['data', 'lengths'])
+
+# failures is the (N,) array of FAILED_* bits of each EDID, and bad_blocks
+# the (N, k) boolean array of the 128-byte blocks whose checksum is wrong.
+CorpusChecks = collections.namedtuple('CorpusChecks',
+                                      ['failures', 'bad_blocks'])
+
+# Fields of the structured array returned by DecodeDtds. edid is the row of the
+# EDID in the corpus, block the index of the 128-byte block the DTD is in and
+# offset the index of its first byte within the EDID; the other fields are
+# named after the properties of descriptor.DetailedTimingDescriptor they hold.
+# refresh_rate and line_rate are NaN where the properties are None.
+# stereo_mode is stored as its index in descriptor.STEREO_MODES, and sync_type
+# as the bits that descriptor.GetSyncType describes.
+DTD_FIELDS = [
+    ('edid', 'i8'),
+    ('block', 'u1'),
+    ('offset', 'i8'),
+    ('pixel_clock', 'f8'),
+    ('h_active_pixels', 'u2'),
+    ('h_blanking_pixels', 'u2'),
+    ('v_active_lines', 'u2'),
+    ('v_blanking_lines', 'u2'),
+    ('h_sync_offset', 'u2'),
+    ('h_sync_pulse', 'u2'),
+    ('v_sync_offset', 'u1'),
+    ('v_sync_pulse', 'u1'),
+    ('h_display_size', 'u2'),
+    ('v_display_size', 'u2'),
+    ('h_border_pixels', 'u1'),
+    ('v_border_lines', 'u1'),
+    ('interlaced', '?'),
+    ('stereo_mode', 'u1'),
+    ('sync_type', 'u1'),
+    ('h_total_pixels', 'u2'),
+    ('v_total_lines', 'u2'),
+    ('refresh_rate', 'f8'),
+    ('line_rate', 'f8')
+]
+
+_DTD_LOCATION_FIELDS = ('edid', 'block', 'offset')
+
+# The fields of a DTD made of a byte and some high bits from another byte:
+# the byte of the low 8 bits, the byte of the high bits, their mask and the
+# left shift that moves them into place.
+_DTD_SPLIT_FIELDS = [
+    ('h_active_pixels', 2, 4, 0xF0, 4),
+    ('h_blanking_pixels', 3, 4, 0x0F, 8),
+    ('v_active_lines', 5, 7, 0xF0, 4),
+    ('v_blanking_lines', 6, 7, 0x0F, 8),
+    ('h_sync_offset', 8, 11, 0xC0, 2),
+    ('h_sync_pulse', 9, 11, 0x30, 4),
+    ('h_display_size', 12, 14, 0xF0, 4),
+    ('v_display_size', 13, 14, 0x0F, 8)
+]
+
+# tmds_clock (kHz, NaN where HDMI does not carry the format at that depth) and
+# data_rate (Mbit/s) are (M, F, D) arrays, for the M DTDs of DecodeDtds at the
+# F formats of bandwidth.COLOR_FORMATS and the D depths of
+# bandwidth.COLOR_DEPTHS. supported is the (M, F, D) boolean array of the
+# formats and depths the display of each DTD accepts, and fits the
+# (M, F, D, L) boolean array of the modes that fit each of the L links.
+DtdBandwidths = collections.namedtuple(
+    'DtdBandwidths', ['tmds_clock', 'data_rate', 'supported', 'fits'])
+
+_CEA_TAG = 0x02
+_VTB_TAG = 0x10
+_RANGE_TAG = 0xFD
+_MAX_EXTENSION_DTDS = 6  # As many 18-byte DTDs as fit in 123 bytes
+
+
+def _RequireNumpy():
+  """Checks that NumPy can be used.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  if numpy is None:
+    raise ImportError('The edid.corpus module requires NumPy')
+
+
+def LoadCorpus(blobs):
+  """Gathers EDIDs into a Corpus.
+
+  Args:
+    blobs: A list of the bytes (str or bytearray) of each EDID.
+
+  Returns:
+    A Corpus record.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  _RequireNumpy()
+
+  lengths = numpy.array([len(b) for b in blobs], dtype=numpy.int64)
+  longest = lengths.max() if len(blobs) else 0
+  width = max(128, -(-longest // 128) * 128)  # Whole blocks, at least one
+
+  data = numpy.zeros((len(blobs), width), dtype=numpy.uint8)
+  for x, blob in enumerate(blobs):
+    data[x, :len(blob)] = numpy.frombuffer(bytes(blob), dtype=numpy.uint8)
+
+  return Corpus(data, lengths)
+
+
+def CorpusFromArray(data):
+  """Wraps an array of EDIDs of the same length into a Corpus.
+
+  Args:
+    data: An (N, L) array of uint8, one EDID of L bytes per row.
+
+  Returns:
+    A Corpus record. The array is padded to whole blocks if needed, else used
+    as is.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  _RequireNumpy()
+
+  data = numpy.asarray(data, dtype=numpy.uint8)
+  n, length = data.shape
+  width = max(128, -(-length // 128) * 128)
+  if width != length:
+    padded = numpy.zeros((n, width), dtype=numpy.uint8)
+    padded[:, :length] = data
+    data = padded
+
+  return Corpus(data, numpy.full(n, length, dtype=numpy.int64))
+
+
+def CheckCorpus(corpus):
+  """Runs the checks of the raw bytes of error_check over a whole corpus.
+
+  These are the header, per-block checksum, length, week of manufacture and
+  extension count checks; an EDID passes them when error_check.GetErrors
+  reports no error of those kinds. EDIDs too short to hold the week or the
+  extension count fail that check, where GetErrors raises an IndexError.
+
+  Args:
+    corpus: A Corpus record.
+
+  Returns:
+    A CorpusChecks record.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  _RequireNumpy()
+
+  data, lengths = corpus
+  n, width = data.shape
+  blocks = width // 128
+
+  failures = numpy.zeros(n, dtype=numpy.uint8)
+
+  header = numpy.array(_MAGIC_HEADER, dtype=numpy.uint8)
+  bad_header = (data[:, :8] != header).any(axis=1) | (lengths < 8)
+  failures[bad_header] |= FAILED_HEADER
+
+  # Summing in uint8 wraps around, giving each sum modulo 256. The padding is
+  # zeros, so it does not change the sum of a block cut short.
+  sums = data.reshape(n, blocks, 128).sum(axis=2, dtype=numpy.uint8)
+  starts = numpy.arange(0, width, 128)
+  bad_blocks = (sums != 0) & (starts < lengths[:, numpy.newaxis])
+  failures[bad_blocks.any(axis=1)] |= FAILED_CHECKSUM
+
+  failures[lengths % 128 != 0] |= FAILED_LENGTH
+
+  week = data[:, 0x10]
+  bad_week = ((week > 54) & (week != 255)) | (lengths <= 0x10)
+  failures[bad_week] |= FAILED_WEEK
+
+  ext_count = data[:, 0x7E].astype(numpy.int64)
+  bad_count = (ext_count + 1 != lengths // 128) | (lengths <= 0x7E)
+  failures[bad_count] |= FAILED_EXTENSION_COUNT
+
+  return CorpusChecks(failures, bad_blocks)
+
+
+def DecodeBaseBlocks(corpus):
+  """Decodes the fixed-position fields of the base block of every EDID.
+
+  This is the columnar counterpart of base_block.DecodeBaseBlock and of the
+  properties built on it. Rows of EDIDs shorter than 128 bytes, for which
+  edid.Edid raises an IndexError, hold the fields decoded from the zero
+  padding.
+
+  Args:
+    corpus: A Corpus record.
+
+  Returns:
+    An (N,) NumPy structured array with the fields of BASE_BLOCK_FIELDS.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  _RequireNumpy()
+
+  data = corpus.data
+  n = data.shape[0]
+  columns = numpy.zeros(n, dtype=BASE_BLOCK_FIELDS)
+
+  def Byte(offset):
+    return data[:, offset].astype(numpy.int64)
+
+  manufacturer = (Byte(0x08) << 8) | Byte(0x09)
+  letters = numpy.empty((n, 3), dtype=numpy.uint8)
+  letters[:, 0] = ((manufacturer >> 10) & 0x1F) + 64
+  letters[:, 1] = ((manufacturer >> 5) & 0x1F) + 64
+  letters[:, 2] = (manufacturer & 0x1F) + 64
+  columns['manufacturer_id'] = letters.view('S3').ravel()
+
+  columns['product_code'] = Byte(0x0A) | (Byte(0x0B) << 8)
+  serial = (Byte(0x0C) | (Byte(0x0D) << 8) | (Byte(0x0E) << 16) |
+            (Byte(0x0F) << 24))
+  columns['serial_number'] = numpy.where(serial != 0, serial, -1)
+
+  week = Byte(0x10)
+  year = Byte(0x11) + 1990
+  model = week == 255
+  columns['manufacturing_week'] = numpy.where((week == 0) | model, -1, week)
+  columns['manufacturing_year'] = numpy.where(model, -1, year)
+  columns['model_year'] = numpy.where(model, year, -1)
+
+  columns['version'] = data[:, 0x12]
+  columns['revision'] = data[:, 0x13]
+  columns['extension_count'] = data[:, 0x7E]
+
+  video_input = data[:, 0x14]
+  input_type = video_input >> 7
+  columns['video_input_type'] = input_type
+  columns['color_bit_depth'] = (video_input & 0x70) >> 4
+  columns['digital_supports'] = video_input & 0x0F
+  columns['signal_level'] = (video_input >> 5) & 0x03
+  for name, mask in _VIDEO_INPUT_FLAGS:
+    columns[name] = video_input & mask != 0
+
+  h_size = Byte(0x15)
+  v_size = Byte(0x16)
+  columns['horizontal_dim'] = numpy.where(v_size != 0, h_size, -1)
+  columns['vertical_dim'] = numpy.where(h_size != 0, v_size, -1)
+  # The same float operations as BasicDisplay, so the values format the same
+  columns['aspect_ratio_portrait'] = numpy.where(
+      (h_size == 0) & (v_size != 0), 100.0 / (v_size + 99.0), numpy.nan)
+  columns['aspect_ratio_landscape'] = numpy.where(
+      (v_size == 0) & (h_size != 0), (h_size + 99.0) / 100.0, numpy.nan)
+  columns['display_gamma'] = (Byte(0x17) + 100) / 100.0
+
+  features = data[:, 0x18]
+  for name, mask in _FEATURE_FLAGS:
+    columns[name] = features & mask != 0
+  columns['display_type'] = (input_type << 2) | ((features >> 3) & 0x03)
+
+  for name, high, low, shift in _CHROMATICITY_FIELDS:
+    columns[name] = (Byte(high) << 2) | ((Byte(low) >> shift) & 0x03)
+
+  return columns
+
+
+def GetBaseBlockRecord(columns, index):
+  """Converts a row of DecodeBaseBlocks back into the values of properties.
+
+  Args:
+    columns: The structured array returned by DecodeBaseBlocks.
+    index: The index of the EDID in the corpus.
+
+  Returns:
+    A dict mapping the name of each property of edid.Edid,
+    basic_display.BasicDisplay and chromaticity.Chromaticity decoded by
+    DecodeBaseBlocks to the value that property returns.
+  """
+  row = columns[index]
+  record = {}
+
+  for name, kind in BASE_BLOCK_FIELDS:
+    value = row[name].item()
+    if name in _FIELD_TABLES:
+      value = _FIELD_TABLES[name][value]
+    elif name in _OPTIONAL_FIELDS and value == -1:
+      value = None
+    elif name.startswith('aspect_ratio_'):
+      value = None if value != value else '%.2f : 1' % value  # NaN is None
+    record[name] = value
+
+  record['edid_version'] = '%d.%d' % (record.pop('version'),
+                                      record.pop('revision'))
+  return record
+
+
+def _DtdSlots(corpus):
+  """Finds the 18-byte DTDs of every EDID of a corpus.
+
+  DTDs are looked for where layout.Layout has a region for them: the four
+  descriptors of the base block, and the DTD regions of the CEA and VTB
+  extensions counted by the base block and not cut short. Of those, the ones
+  that GetDescriptor decodes as display descriptors are left out.
+
+  Args:
+    corpus: A Corpus record.
+
+  Returns:
+    A tuple of three (M,) arrays: the row of the EDID in the corpus, the index
+    of the block and the offset within the EDID of each DTD, ordered by row and
+    offset.
+  """
+  data, lengths = corpus
+  n, width = data.shape
+  rows_all = numpy.arange(n)
+  found = []
+
+  def Add(valid, block, offset):
+    rows = numpy.nonzero(valid)[0]
+    found.append((rows, numpy.full(len(rows), block, dtype=numpy.int64),
+                  offset[rows]))
+
+  def IsDtd(start):
+    # Display descriptors start with three zero bytes
+    return ((data[rows_all, start] != 0) | (data[rows_all, start + 1] != 0) |
+            (data[rows_all, start + 2] != 0))
+
+  for x in xrange(0, 4):
+    start = numpy.full(n, 0x36 + (x * 18), dtype=numpy.int64)
+    Add(IsDtd(start), 0, start)
+
+  ext_count = data[:, 0x7E]
+  for index in xrange(1, width // 128):
+    ext_start = 128 * index
+    present = (ext_count >= index) & (lengths >= ext_start + 128)
+    tag = data[:, ext_start]
+    byte_2 = data[:, ext_start + 2].astype(numpy.int64)
+
+    # CEA: DTDs follow one another from the offset in byte 2 until the first
+    # whose pixel clock is zero.
+    is_open = present & (tag == _CEA_TAG)
+    for x in xrange(0, _MAX_EXTENSION_DTDS + 1):
+      rel = byte_2 + (x * 18)
+      is_open &= rel + 18 <= 127
+      start = ext_start + numpy.minimum(rel, 109)
+      is_open &= (data[rows_all, start] != 0) | (data[rows_all, start + 1] != 0)
+      Add(is_open, index, start)
+
+    # VTB: byte 2 is the number of DTDs, which start at byte 5
+    is_vtb = present & (tag == _VTB_TAG)
+    for x in xrange(0, _MAX_EXTENSION_DTDS):
+      start = numpy.full(n, ext_start + 5 + (x * 18), dtype=numpy.int64)
+      Add(is_vtb & (x < byte_2) & IsDtd(start), index, start)
+
+  rows, blocks, offsets = [numpy.concatenate(column) for column in zip(*found)]
+  order = numpy.lexsort((offsets, rows))
+  return rows[order], blocks[order], offsets[order]
+
+
+def DecodeDtds(corpus):
+  """Decodes every Detailed Timing Descriptor of every EDID of a corpus.
+
+  This is the columnar counterpart of the properties of
+  descriptor.DetailedTimingDescriptor, including the totals, refresh rate and
+  line rate derived from them.
+
+  Args:
+    corpus: A Corpus record.
+
+  Returns:
+    An (M,) NumPy structured array with the fields of DTD_FIELDS, one row per
+    DTD, ordered by EDID and by offset within the EDID.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  _RequireNumpy()
+
+  rows, blocks, offsets = _DtdSlots(corpus)
+  dtds = numpy.zeros(len(rows), dtype=DTD_FIELDS)
+  dtds['edid'] = rows
+  dtds['block'] = blocks
+  dtds['offset'] = offsets
+
+  # One (M, 18) array of the bytes of all the DTDs
+  raw = corpus.data[rows[:, numpy.newaxis],
+                    offsets[:, numpy.newaxis] + numpy.arange(18)]
+  raw = raw.astype(numpy.int64)
+
+  clock = (raw[:, 1] << 8) + raw[:, 0]
+  dtds['pixel_clock'] = clock / 100.0
+
+  for name, low, high, mask, shift in _DTD_SPLIT_FIELDS:
+    dtds[name] = ((raw[:, high] & mask) << shift) + raw[:, low]
+
+  dtds['v_sync_offset'] = (((raw[:, 11] & 0x0C) << 2) +
+                           ((raw[:, 10] & 0xF0) >> 4))
+  dtds['v_sync_pulse'] = ((raw[:, 11] & 0x03) << 4) + (raw[:, 10] & 0x0F)
+  dtds['h_border_pixels'] = raw[:, 15]
+  dtds['v_border_lines'] = raw[:, 16]
+
+  features = raw[:, 17]
+  dtds['interlaced'] = features & 0x80 != 0
+  # Bits 6-5 and bit 0, as DetailedTimingDescriptor.stereo_mode
+  dtds['stereo_mode'] = ((features & 0x60) >> 4) | (features & 0x01)
+  dtds['sync_type'] = (features >> 1) & 0x0F
+
+  h_total = (dtds['h_active_pixels'].astype(numpy.int64) +
+             dtds['h_blanking_pixels'])
+  v_total = (dtds['v_active_lines'].astype(numpy.int64) +
+             dtds['v_blanking_lines'])
+  dtds['h_total_pixels'] = h_total
+  dtds['v_total_lines'] = v_total
+
+  # Zero totals give NaN for the None of the properties; dividing by
+  # max(total, 1) avoids division warnings.
+  total = h_total * v_total
+  dtds['refresh_rate'] = numpy.where(
+      total != 0, clock * 10000.0 / numpy.maximum(total, 1), numpy.nan)
+  dtds['line_rate'] = numpy.where(
+      h_total != 0, clock * 10.0 / numpy.maximum(h_total, 1), numpy.nan)
+
+  return dtds
+
+
+def GetDtdRecord(dtds, index):
+  """Converts a row of DecodeDtds back into the values of properties.
+
+  Args:
+    dtds: The structured array returned by DecodeDtds.
+    index: The index of the row.
+
+  Returns:
+    A dict mapping the name of each property of
+    descriptor.DetailedTimingDescriptor decoded by DecodeDtds to the value
+    that property returns.
+  """
+  row = dtds[index]
+  record = {}
+
+  for name, kind in DTD_FIELDS:
+    if name in _DTD_LOCATION_FIELDS:
+      continue
+    value = row[name].item()
+    if name == 'stereo_mode':
+      value = descriptor.STEREO_MODES[value]
+    elif name == 'sync_type':
+      value = descriptor.GetSyncType(value)
+    elif kind == 'f8' and value != value:  # NaN is None
+      value = None
+    record[name] = value
+
+  return record
+
+
+def GetDtdBandwidths(corpus, dtds, links=bandwidth.LINKS):
+  """Evaluates the link bandwidth of every DTD of a corpus.
+
+  This is the columnar counterpart of bandwidth.GetModeBandwidths for
+  detailed timings, where the formats and depths the display accepts are
+  marked in supported rather than left out. YCbCr 4:2:0 is never supported
+  for detailed timings.
+
+  Args:
+    corpus: A Corpus record.
+    dtds: The structured array returned by DecodeDtds for the corpus.
+    links: A sequence of bandwidth.Link records to check the modes against.
+
+  Returns:
+    A DtdBandwidths record.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  _RequireNumpy()
+
+  formats = bandwidth.COLOR_FORMATS
+  depths = numpy.array(bandwidth.COLOR_DEPTHS)
+
+  # The requirements of a 1 kHz pixel clock at each format and depth
+  tmds_factor = numpy.array(
+      [[numpy.nan if bandwidth.TmdsClock(1, f, d) is None else
+        bandwidth.TmdsClock(1, f, d) for d in depths] for f in formats])
+  rate_factor = numpy.array(
+      [[bandwidth.DataRate(1, f, d) for d in depths] for f in formats])
+  valid = numpy.array(
+      [[bandwidth.IsValidDepth(f, d) for d in depths] for f in formats])
+
+  # Pixel clocks are held in units of 10 kHz
+  clock = numpy.round(dtds['pixel_clock'] * 100) * 10
+  clock = clock[:, numpy.newaxis, numpy.newaxis]
+  tmds_clock = clock * tmds_factor
+  data_rate = clock * rate_factor
+
+  # The formats and largest depth of each EDID, as in
+  # bandwidth.BandwidthCollector
+  data, lengths = corpus
+  n, width = data.shape
+  video_input = data[:, 0x14]
+  version = data[:, 0x12]
+  digital_1_4 = (((video_input & 0x80) != 0) &
+                 ((version > 1) | ((version == 1) & (data[:, 0x13] >= 4))))
+  encoding = numpy.where(digital_1_4, (data[:, 0x18] >> 3) & 0x03, 0)
+  ycbcr444 = (encoding & 0x01) != 0
+  ycbcr422 = (encoding & 0x02) != 0
+
+  ext_count = data[:, 0x7E]
+  for index in xrange(1, width // 128):
+    ext_start = 128 * index
+    is_cea = ((ext_count >= index) & (lengths >= ext_start + 128) &
+              (data[:, ext_start] == _CEA_TAG))
+    ycbcr444 |= is_cea & ((data[:, ext_start + 3] & 0x20) != 0)
+    ycbcr422 |= is_cea & ((data[:, ext_start + 3] & 0x10) != 0)
+
+  max_depths = numpy.array(
+      [8 if bits is None else bits
+       for bits in basic_display.BITS_PER_PRIMARY_COLOR])
+  max_depth = numpy.where(digital_1_4, max_depths[(video_input >> 4) & 0x07],
+                          8)
+
+  accepted = numpy.column_stack([numpy.ones(n, dtype=bool), ycbcr444,
+                                 ycbcr422, numpy.zeros(n, dtype=bool)])
+  rows = dtds['edid']
+  supported = (accepted[rows][:, :, numpy.newaxis] &
+               (depths <= max_depth[rows][:, numpy.newaxis, numpy.newaxis]) &
+               valid)
+
+  # NaN compares false, so formats HDMI does not carry never fit TMDS links
+  with numpy.errstate(invalid='ignore'):
+    fits = numpy.stack(
+        [tmds_clock <= link.limit if link.kind == bandwidth.LINK_TMDS else
+         data_rate <= link.limit for link in links], axis=-1)
+
+  return DtdBandwidths(tmds_clock, data_rate, supported, fits)
+
+
+def _GetRangeLimits(data):
+  """Decodes the Display Range Limits of every EDID of a corpus.
+
+  As error_check.GetRangeLimitErrors does, only the first Display Range Limits
+  descriptor of the base block is used.
+
+  Args:
+    data: The (N, 128 * k) array of a Corpus record.
+
+  Returns:
+    A tuple of an (N,) boolean array of the EDIDs that have limits without
+    errors of their own, and five (N,) arrays of the minimum and maximum
+    vertical rates (Hz), the minimum and maximum horizontal rates (kHz) and
+    the maximum pixel clock (MHz).
+  """
+  n = data.shape[0]
+  rows = numpy.arange(n)
+
+  found = numpy.zeros(n, dtype=bool)
+  start = numpy.zeros(n, dtype=numpy.int64)
+  for x in xrange(3, -1, -1):  # The first one found is the last one kept
+    at = 0x36 + (x * 18)
+    is_range = ((data[:, at] == 0) & (data[:, at + 1] == 0) &
+                (data[:, at + 2] == 0) & (data[:, at + 3] == _RANGE_TAG))
+    found |= is_range
+    start[is_range] = at
+
+  raw = data[rows[:, numpy.newaxis], start[:, numpy.newaxis] + numpy.arange(18)]
+  raw = raw.astype(numpy.int64)
+
+  # The offsets of descriptor.DisplayRangeDescriptor
+  flags = raw[:, 4]
+  min_v = raw[:, 5] + numpy.where(flags & 0x03 == 0x03, 255, 0)
+  max_v = raw[:, 6] + numpy.where(flags & 0x02, 255, 0)
+  min_h = raw[:, 7] + numpy.where((flags >> 2) & 0x03 == 0x03, 255, 0)
+  max_h = raw[:, 8] + numpy.where(flags & 0x0C, 255, 0)
+  support = raw[:, 10]
+  # descriptor.DisplayRangeCVT takes the additional pixel clock off
+  clock = raw[:, 9] * 10 - numpy.where(support == 0x04,
+                                       (raw[:, 12] >> 2) * 0.25, 0)
+
+  valid = (found & (max_v >= min_v) & (max_h >= min_h) & (clock != 0) &
+           numpy.in1d(support, (0x00, 0x01, 0x02, 0x04)))
+  return valid, min_v, max_v, min_h, max_h, clock
+
+
+def CheckRangeLimits(corpus, dtds):
+  """Checks every DTD of a corpus against the range limits of its EDID.
+
+  This is the columnar counterpart of error_check.GetRangeLimitErrors, for
+  detailed timings: rates are rounded to whole Hz and kHz before they are
+  compared, and DTDs of EDIDs without limits, or with a zero pixel clock or
+  total, pass.
+
+  Args:
+    corpus: A Corpus record.
+    dtds: The structured array returned by DecodeDtds for the corpus.
+
+  Returns:
+    An (M,) uint8 array of the OUT_OF_RANGE_* bits of each DTD.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+  """
+  _RequireNumpy()
+
+  valid, min_v, max_v, min_h, max_h, max_clock = _GetRangeLimits(corpus.data)
+  rows = dtds['edid']
+  clock = dtds['pixel_clock']
+  checked = valid[rows] & (clock != 0) & ~numpy.isnan(dtds['refresh_rate'])
+
+  # round() of Python 2 rounds halves away from zero; rates are not negative
+  refresh = numpy.floor(dtds['refresh_rate'] + 0.5)
+  line_rate = numpy.floor(dtds['line_rate'] + 0.5)
+
+  with numpy.errstate(invalid='ignore'):
+    bad_v = (refresh < min_v[rows]) | (refresh > max_v[rows])
+    bad_h = (line_rate < min_h[rows]) | (line_rate > max_h[rows])
+  bad_clock = clock > max_clock[rows]
+
+  flags = numpy.zeros(len(dtds), dtype=numpy.uint8)
+  flags[checked & bad_v] |= OUT_OF_RANGE_VERTICAL_RATE
+  flags[checked & bad_h] |= OUT_OF_RANGE_HORIZONTAL_RATE
+  flags[checked & bad_clock] |= OUT_OF_RANGE_PIXEL_CLOCK
+
+  return flags
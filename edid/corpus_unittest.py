@@ -0,0 +1,295 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for corpus.py, against the scalar functions it mirrors.
+
+The tests are skipped when NumPy is not installed; test_requirements.txt, at
+the top of the repository, lists it. Run from the top of the repository with:
+
+  pip install -r test_requirements.txt
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import unittest
+
+import bandwidth
+import corpus
+import descriptor
+import edid
+import error
+import error_check
+import layout
+import unittest_util
+
+
+def ScalarDtds(e):
+  """Decodes the DTDs of an EDID at the places its layout has for them.
+
+  Args:
+    e: An edid.Edid object.
+
+  Returns:
+    A list of tuples of the block and offset of each DTD and its
+    descriptor.DetailedTimingDescriptor object, ordered by offset.
+  """
+  edid_layout = e.layout
+  regions = edid_layout.Find(layout.REGION_DESCRIPTOR, edid_layout.base_block)
+  for region in edid_layout.Find(layout.REGION_EXTENSION):
+    regions.extend(edid_layout.Find(layout.REGION_DTD, region))
+
+  dtds = []
+  data = e.GetData()
+  for region in regions:
+    desc = descriptor.GetDescriptor(data, region.start, e.edid_version)
+    if isinstance(desc, descriptor.DetailedTimingDescriptor):
+      dtds.append((region.start // 128, region.start, desc))
+  return sorted(dtds, key=lambda dtd: dtd[1])
+
+
+def ScalarFailures(blob):
+  """Runs the scalar checks that CheckCorpus mirrors on one EDID.
+
+  Args:
+    blob: The bytes of the EDID.
+
+  Returns:
+    A tuple of the corpus.FAILED_* bits of the checks that fail, and the
+    sorted list of the blocks whose checksum is wrong. As documented by
+    CheckCorpus, checks that raise an IndexError count as failures.
+  """
+  failures = 0
+  checks = [
+      (corpus.FAILED_HEADER, error_check._HeaderError),
+      (corpus.FAILED_CHECKSUM, error_check._ChecksumError),
+      (corpus.FAILED_LENGTH, error_check._LengthError),
+      (corpus.FAILED_WEEK, error_check._WeekError),
+      (corpus.FAILED_EXTENSION_COUNT, error_check._ExtensionCountError)
+  ]
+  for bit, check in checks:
+    try:
+      if check(blob):
+        failures |= bit
+    except IndexError:
+      failures |= bit
+  bad_blocks = sorted(err.block for err in error_check._ChecksumError(blob))
+  return failures, bad_blocks
+
+
+@unittest.skipIf(corpus.numpy is None, 'NumPy is not installed')
+class CheckCorpusTest(unittest.TestCase):
+  """Tests corpus.CheckCorpus against the scalar checks of error_check."""
+
+  def assertMatchesScalar(self, blobs):
+    checks = corpus.CheckCorpus(corpus.LoadCorpus(blobs))
+    for x, blob in enumerate(blobs):
+      failures, bad_blocks = ScalarFailures(blob)
+      self.assertEqual(checks.failures[x], failures, 'EDID %d' % x)
+      self.assertEqual(list(checks.bad_blocks[x].nonzero()[0]), bad_blocks,
+                       'EDID %d' % x)
+
+  def testValid(self):
+    blobs = [unittest_util.ReadTestEdid()]
+    checks = corpus.CheckCorpus(corpus.LoadCorpus(blobs))
+    self.assertEqual(checks.failures[0], 0)
+    self.assertMatchesScalar(blobs)
+
+  def testCorruptions(self):
+    header = unittest_util.ReadTestEdid()
+    unittest_util.SetByte(header, 3, 0x00)
+
+    checksum = unittest_util.ReadTestEdid()
+    checksum[200] ^= 0x01
+
+    week = unittest_util.ReadTestEdid()
+    unittest_util.SetByte(week, 0x10, 60)
+
+    base_only = unittest_util.ReadTestEdid()[:128]
+
+    blobs = [header, checksum, week, base_only]
+    blobs.extend(unittest_util.ReadTestEdid()[:length]
+                 for length in (5, 16, 17, 100, 200))
+    self.assertMatchesScalar(blobs)
+
+    failures = corpus.CheckCorpus(corpus.LoadCorpus(blobs)).failures
+    self.assertEqual(failures[0], corpus.FAILED_HEADER)
+    self.assertEqual(failures[1], corpus.FAILED_CHECKSUM)
+    self.assertEqual(failures[2], corpus.FAILED_WEEK)
+    self.assertEqual(failures[3], corpus.FAILED_EXTENSION_COUNT)
+
+  def testMutations(self):
+    self.assertMatchesScalar(unittest_util.MutatedEdids(500, 15))
+
+  def testFromArray(self):
+    blobs = unittest_util.MutatedEdids(50, 16)
+    array = corpus.numpy.array([list(blob) for blob in blobs])
+    checks = corpus.CheckCorpus(corpus.CorpusFromArray(array))
+    for x, blob in enumerate(blobs):
+      self.assertEqual(checks.failures[x], ScalarFailures(blob)[0])
+
+
+@unittest.skipIf(corpus.numpy is None, 'NumPy is not installed')
+class DecodeBaseBlocksTest(unittest.TestCase):
+  """Tests corpus.DecodeBaseBlocks against the properties of edid.Edid."""
+
+  def testMatchesProperties(self):
+    blobs = [unittest_util.ReadTestEdid()] + unittest_util.MutatedEdids(500, 16)
+    columns = corpus.DecodeBaseBlocks(corpus.LoadCorpus(blobs))
+
+    for x, blob in enumerate(blobs):
+      e = edid.Edid(blob)
+      sections = [e, e.basic_display, e.chromaticity]
+      record = corpus.GetBaseBlockRecord(columns, x)
+      for name, value in record.iteritems():
+        section = next(s for s in sections if hasattr(s, name))
+        self.assertEqual(value, getattr(section, name),
+                         'EDID %d, %s' % (x, name))
+
+
+@unittest.skipIf(corpus.numpy is None, 'NumPy is not installed')
+class DecodeDtdsTest(unittest.TestCase):
+  """Tests corpus.DecodeDtds."""
+
+  def testMatchesProperties(self):
+    blobs = [unittest_util.ReadTestEdid()] + unittest_util.MutatedEdids(500, 17)
+    dtds = corpus.DecodeDtds(corpus.LoadCorpus(blobs))
+
+    rows = []
+    for x, blob in enumerate(blobs):
+      for block, offset, desc in ScalarDtds(edid.Edid(blob)):
+        rows.append((x, block, offset, desc))
+
+    self.assertEqual(len(dtds), len(rows))
+    for index, (x, block, offset, desc) in enumerate(rows):
+      self.assertEqual(
+          (dtds['edid'][index], dtds['block'][index], dtds['offset'][index]),
+          (x, block, offset))
+      record = corpus.GetDtdRecord(dtds, index)
+      for name, value in record.iteritems():
+        self.assertEqual(value, getattr(desc, name),
+                         'EDID %d, offset %d, %s' % (x, offset, name))
+
+  def testStereoMode(self):
+    blobs = []
+    for features in (0x1E, 0x21, 0x41, 0x61):
+      blob = unittest_util.ReadTestEdid()
+      blob[0x36 + 17] = features
+      blobs.append(blob)
+
+    dtds = corpus.DecodeDtds(corpus.LoadCorpus(blobs))
+    first = dtds[dtds['offset'] == 0x36]
+    modes = [descriptor.STEREO_MODES[bits] for bits in first['stereo_mode']]
+
+    self.assertEqual(modes, [
+        'No stereo',
+        '2-way interleaved stereo, right image on even lines',
+        '2-way interleaved stereo, left image on even lines',
+        'Side-by-side interleaved stereo'
+    ])
+
+
+def _BandwidthKey(width, height, refresh, interlaced, pixel_clock,
+                  color_format, bits_per_color, tmds_clock, data_rate, fits):
+  """Makes a comparable tuple of the evaluation of a mode.
+
+  Returns:
+    A tuple of the arguments, with data_rate rounded to hide float noise.
+  """
+  return (width, height, refresh, interlaced, pixel_clock, color_format,
+          bits_per_color, tmds_clock, round(data_rate, 6), tuple(fits))
+
+
+@unittest.skipIf(corpus.numpy is None, 'NumPy is not installed')
+class GetDtdBandwidthsTest(unittest.TestCase):
+  """Tests corpus.GetDtdBandwidths against bandwidth.GetModeBandwidths."""
+
+  def testMatchesScalar(self):
+    # The bytes the evaluation reads: the base block up to the extension
+    # count, the format flags of CEA extensions and the extension DTDs. Other
+    # changes to the extensions can make the scalar decoders raise.
+    e = edid.Edid(unittest_util.ReadTestEdid())
+    offsets = range(0x08, 0x7E)
+    for region in e.layout.Find(layout.REGION_EXTENSION):
+      if e.GetData()[region.start] == 0x02:  # CEA
+        offsets.append(region.start + 3)
+      for dtd in e.layout.Find(layout.REGION_DTD, region):
+        offsets.extend(xrange(dtd.start, dtd.end))
+
+    blobs = ([unittest_util.ReadTestEdid()] +
+             unittest_util.MutatedEdids(300, 23, offsets))
+    corp = corpus.LoadCorpus(blobs)
+    dtds = corpus.DecodeDtds(corp)
+    result = corpus.GetDtdBandwidths(corp, dtds)
+
+    found = [set() for _ in blobs]
+    for index in xrange(len(dtds)):
+      refresh = dtds['refresh_rate'][index]
+      if not refresh or refresh != refresh:  # Zero or NaN
+        continue
+      interlaced = bool(dtds['interlaced'][index])
+      lines = int(dtds['v_active_lines'][index]) * (2 if interlaced else 1)
+      clock = int(round(dtds['pixel_clock'][index] * 1000))
+      for f, color_format in enumerate(bandwidth.COLOR_FORMATS):
+        for d, depth in enumerate(bandwidth.COLOR_DEPTHS):
+          if not result.supported[index, f, d]:
+            continue
+          tmds_clock = result.tmds_clock[index, f, d].item()
+          found[dtds['edid'][index]].add(_BandwidthKey(
+              int(dtds['h_active_pixels'][index]), lines,
+              int(round(refresh)), interlaced, clock, color_format, depth,
+              None if tmds_clock != tmds_clock else tmds_clock,
+              result.data_rate[index, f, d].item(),
+              result.fits[index, f, d].tolist()))
+
+    for x, blob in enumerate(blobs):
+      expected = set(
+          _BandwidthKey(mb.width, mb.height, mb.refresh, mb.interlaced,
+                        mb.pixel_clock, mb.color_format, mb.bits_per_color,
+                        mb.tmds_clock, mb.data_rate, mb.fits)
+          for mb in bandwidth.GetModeBandwidths(edid.Edid(blob))
+          if mb.vic is None)
+      self.assertEqual(found[x], expected, 'EDID %d' % x)
+
+
+@unittest.skipIf(corpus.numpy is None, 'NumPy is not installed')
+class CheckRangeLimitsTest(unittest.TestCase):
+  """Tests corpus.CheckRangeLimits against error_check.GetRangeLimitErrors."""
+
+  _BITS = {
+      error.ERROR_MODE_VERTICAL_RATE: corpus.OUT_OF_RANGE_VERTICAL_RATE,
+      error.ERROR_MODE_HORIZONTAL_RATE: corpus.OUT_OF_RANGE_HORIZONTAL_RATE,
+      error.ERROR_MODE_PIXEL_CLOCK: corpus.OUT_OF_RANGE_PIXEL_CLOCK
+  }
+
+  def testMatchesScalar(self):
+    # The base descriptors, which hold the limits, and the extension DTDs
+    e = edid.Edid(unittest_util.ReadTestEdid())
+    offsets = range(0x36, 0x7E)
+    for region in e.layout.Find(layout.REGION_EXTENSION):
+      for dtd in e.layout.Find(layout.REGION_DTD, region):
+        offsets.extend(xrange(dtd.start, dtd.end))
+
+    blobs = ([unittest_util.ReadTestEdid()] +
+             unittest_util.MutatedEdids(500, 24, offsets))
+    dtds = corpus.DecodeDtds(corpus.LoadCorpus(blobs))
+    flags = corpus.CheckRangeLimits(corpus.LoadCorpus(blobs), dtds)
+
+    found = {}
+    for index in flags.nonzero()[0]:
+      found[dtds['edid'][index], dtds['offset'][index]] = flags[index]
+
+    expected = {}
+    for x, blob in enumerate(blobs):
+      e = edid.Edid(blob)
+      for err in e.GetRangeLimitErrors():
+        if err.location.startswith('Detailed Timing Descriptor'):
+          key = (x, err.offset)
+          expected[key] = expected.get(key, 0) | self._BITS[err.code]
+
+    self.assertTrue(expected)
+    self.assertEqual(found, expected)
+
+
+if __name__ == '__main__':
+  unittest.main()
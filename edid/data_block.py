@@ -68,7 +68,7 @@ SAMPLING_FREQ_96KHZ = '96kHz'
 SAMPLING_FREQ_176_4KHZ = '176.4kHz'
 SAMPLING_FREQ_192KHZ = '192kHz'
 
-_freqs = [
+_freqs = tools.FlagTable([
     [0x40, SAMPLING_FREQ_192KHZ],
     [0x20, SAMPLING_FREQ_176_4KHZ],
     [0x10, SAMPLING_FREQ_96KHZ],
@@ -76,16 +76,16 @@ _freqs = [
     [0x04, SAMPLING_FREQ_48KHZ],
     [0x02, SAMPLING_FREQ_44_1KHZ],
     [0x01, SAMPLING_FREQ_32KHZ]
-]
+])
 
 MPS_IMPLICIT = 'MPS implicit'
 MPS_EXPLICIT = 'MPS explicit'
 
-_bits = [
+_bits = tools.FlagTable([
     [0x4, '24 bit'],
     [0x2, '20 bit'],
     [0x1, '16 bit']
-]
+])
 
 
 SVD_NATIVE = 'Native'
@@ -106,7 +106,7 @@ SPEAKER_FRONT_LEFT_RIGHT_HIGH = 'Front Left High / Front Right High'
 SPEAKER_TOP_CENTER = 'Top Center'
 SPEAKER_FRONT_CENTER_HIGH = 'Front Center High'
 
-_speakers = [
+_speakers = tools.FlagTable([
     [0x01, SPEAKER_FRONT_LEFT_RIGHT],
     [0x02, SPEAKER_LFE],
     [0x04, SPEAKER_FRONT_CENTER],
@@ -118,7 +118,7 @@ _speakers = [
     [0x100, SPEAKER_FRONT_LEFT_RIGHT_HIGH],
     [0x200, SPEAKER_TOP_CENTER],
     [0x400, SPEAKER_FRONT_CENTER_HIGH]
-]
+])
 
 
 COLORIMETRY_XVYCC601 = ('Standard Definition Colorimetry based on IEC '
@@ -132,7 +132,7 @@ COLORIMETRY_BT2020_YCC = 'Colorimetry based on ITU-R BT.2020 YCbCr'
 COLORIMETRY_BT2020_RGB = 'Colorimetry based on ITU-R BT.2020 RGB'
 
 
-_colors = [
+_colors = tools.FlagTable([
     [0x01, COLORIMETRY_XVYCC601],
     [0x02, COLORIMETRY_XVYCC709],
     [0x04, COLORIMETRY_SYCC601],
@@ -141,7 +141,7 @@ _colors = [
     [0x20, COLORIMETRY_BT2020_CYCC],
     [0x40, COLORIMETRY_BT2020_YCC],
     [0x80, COLORIMETRY_BT2020_RGB]
-]
+])
 
 
 OU_UNDEFINED = 'No Data'
@@ -169,73 +169,85 @@ INFO_FRAME_TYPE_UNKNOWN = 'Unknown'
 def GetDataBlock(edid, start):
   """Creates a DataBlock object based on the type specified in the tag.
 
+  The decoder is looked up in tables indexed by the header byte and, for
+  extended tags, by the extended tag byte (see RegisterDataBlock).
+
   Args:
-    edid: The list of bytes that make up the EDID.
+    edid: The bytes that make up the EDID (or extension).
     start: Index of the first byte of the data block.
 
   Returns:
     A DataBlock object.
   """
-  tag = (edid[start] >> 5) & 0x07
-  length = edid[start] & 0x1F
-
-  block = edid[start:(start + length + 1)]
-
-  if tag == 0x00:
-    return DataBlock(block, DB_TYPE_RESERVED)
-  elif tag == 0x01:
-    return AudioBlock(block)
-  elif tag == 0x02:
-    return VideoBlock(block, DB_TYPE_VIDEO)
-  elif tag == 0x03:
-    return VendorSpecificBlock(block, DB_TYPE_VENDOR_SPECIFIC)
-  elif tag == 0x04:
-    return SpeakerBlock(block)
-  elif tag == 0x05:
-    return DataBlock(block, DB_TYPE_VESA_DISPLAY_TRANSFER_CHAR)
-  elif tag == 0x06:
-    return DataBlock(block, DB_TYPE_RESERVED)
-  elif tag == 0x07:
-    ext_tag = edid[start + 1]
-    if ext_tag == 0x00:
-      return VideoCapabilityBlock(block)
-    elif ext_tag == 0x01:
-      return VendorSpecificBlock(block, DB_TYPE_VENDOR_SPECIFIC_VIDEO)
-    elif ext_tag == 0x02:
-      return DataBlock(block, DB_TYPE_VESA_DISPLAY_DEVICE)
-    elif ext_tag == 0x03:
-      return DataBlock(block, DB_TYPE_VESA_VIDEO_TIMING)
-    elif ext_tag == 0x04:
-      return DataBlock(block, DB_TYPE_HDMI_VIDEO)
-    elif ext_tag == 0x05:
-      return ColorimetryDataBlock(block)
-    elif ext_tag >= 0x06 and ext_tag <= 0x0C:
-      return DataBlock(block, DB_TYPE_RESERVED)
-    elif ext_tag == 0x0D:
-      return VideoFormatPrefBlock(block)
-    elif ext_tag == 0x0E:
-      return VideoBlock(block, DB_TYPE_YCBCR420_VIDEO)
-    elif ext_tag == 0x0F:
-      return YCBCR420CapabilityMapBlock(block)
-    elif ext_tag == 0x10:
-      return DataBlock(block, DB_TYPE_MISC_AUDIO_FIELDS)
-    elif ext_tag == 0x11:
-      return VendorSpecificBlock(block, DB_TYPE_VENDOR_SPECIFIC_AUDIO)
-    elif ext_tag == 0x12:
-      return DataBlock(block, DB_TYPE_HDMI_AUDIO)
-    elif ext_tag >= 0x13 and ext_tag <= 0x1F:
-      return DataBlock(block, DB_TYPE_RESERVED)
-    elif ext_tag == 0x20:
-      return InfoFrameDataBlock(block)
-    elif ext_tag >= 0x21 and ext_tag <= 0xFF:
-      return DataBlock(block, DB_TYPE_RESERVED)
-
-  return DataBlock(block, DB_TYPE_UNKNOWN)
+  header = edid[start]
+
+  block = edid[start:(start + (header & 0x1F) + 1)]
+
+  decoder = _decoders[header]
+  if decoder is None:  # Tag 0x07: look up the extended tag
+    decoder = _extended_decoders[edid[start + 1]]
+
+  return decoder(block)
+
+
+# Counts the calls to RegisterDataBlock, so that caches of decoded blocks can
+# tell when they are stale
+decoder_generation = 0
+
+
+def RegisterDataBlock(tag, decoder, ext_tag=None):
+  """Plugs a decoder for a type of data block into GetDataBlock.
+
+  A decoder for a vendor-specific block would typically check the IEEE OUI
+  and hand blocks of other vendors on to the decoder it replaced.
+
+  The call bumps decoder_generation, which extensions.GetExtension checks to
+  drop the extensions it decoded with the old decoder. Edid objects created
+  earlier keep the sections they have decoded until Invalidate is called,
+  and results stored in a parse_cache.ParseCache are not affected: use
+  ParseCache.Clear, or a cache directory of its own for each set of
+  decoders.
+
+  Args:
+    tag: The 3-bit tag code of the data block.
+    decoder: A callable that takes the bytes of the data block (header
+        included) and returns a DataBlock object.
+    ext_tag: The extended tag code, required when tag is 0x07.
+
+  Returns:
+    The decoder previously registered for the tag.
+
+  Raises:
+    ValueError: If the tag (or extended tag) is out of range, or if an
+        extended tag is missing or given for a tag other than 0x07.
+  """
+  global decoder_generation
+  if not 0x00 <= tag <= 0x07:
+    raise ValueError('Invalid data block tag 0x%02X' % tag)
+
+  if tag == 0x07:
+    if ext_tag is None or not 0x00 <= ext_tag <= 0xFF:
+      raise ValueError('Invalid extended tag %r' % ext_tag)
+    previous = _extended_decoders[ext_tag]
+    _extended_decoders[ext_tag] = decoder
+    decoder_generation += 1
+    return previous
+
+  if ext_tag is not None:
+    raise ValueError('Extended tag given for data block tag 0x%02X' % tag)
+
+  previous = _decoders[tag << 5]
+  for length in xrange(0x20):
+    _decoders[(tag << 5) | length] = decoder
+  decoder_generation += 1
+  return previous
 
 
 class DataBlock(object):
   """Defines a basic Data Block object, with length, type, etc."""
 
+  __slots__ = ('_block', '_type')
+
   def __init__(self, block, my_type):
     """Creates a basic DataBlock object.
 
@@ -252,7 +264,7 @@ class DataBlock(object):
     Returns:
       A list of bytes that make up the data block.
     """
-    return self._block
+    return list(self._block)
 
   @property
   def type(self):
@@ -301,12 +313,14 @@ class DataBlock(object):
     Returns:
       A list that holds the data in the rest of the block.
     """
-    return self._block[1:self.length + 1]
+    return list(self._block[1:self.length + 1])
 
 
 class AudioBlock(DataBlock):
   """Defines an Audio Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates an AudioBlock object.
 
@@ -399,6 +413,8 @@ class AudioBlock(DataBlock):
 class ShortAudioDescriptor(object):
   """Defines a Short Audio Descriptor within an Audio Data Block."""
 
+  __slots__ = ('_block', '_type')
+
   # Expects a 3 byte block
   def __init__(self, block, my_type):
     """Creates a basic ShortAudioDescriptor object.
@@ -446,15 +462,16 @@ class ShortAudioDescriptor(object):
     However, those bits are set to 0 so will never translate as supported.
 
     Returns:
-      A dict of string constants and bools that indicate sampling frequencies
-      and whether each one is supported.
+      A tools.FlagSet of the supported sampling frequencies.
     """
-    return tools.DictFilter(_freqs, self._block[1] & 0x7F)
+    return _freqs.Decode(self._block[1] & 0x7F)
 
 
 class AudioDescriptorLpcm(ShortAudioDescriptor):
   """Defines a LPCM Short Audio Descriptor inside Audio Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block, my_type):
     """Creates an AudioDescriptorLpcm object.
 
@@ -469,15 +486,16 @@ class AudioDescriptorLpcm(ShortAudioDescriptor):
     """Fetches the supported bit depths.
 
     Returns:
-      A dict of strings and bools that indicate bit depths and whether each one
-      is supported.
+      A tools.FlagSet of the supported bit depths.
     """
-    return tools.DictFilter(_bits, self._block[2] & 0x07)
+    return _bits.Decode(self._block[2] & 0x07)
 
 
 class AudioDescriptorBitRate(ShortAudioDescriptor):
   """Defines a BitRate Short Audio Descriptor inside Audio Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block, my_type):
     """Creates a AudioDescriptorBitRate object.
 
@@ -500,6 +518,8 @@ class AudioDescriptorBitRate(ShortAudioDescriptor):
 class AudioDescriptorOther(ShortAudioDescriptor):
   """Defines nonspecialized Short Audio Descriptor inside Audio Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block, my_type):
     """Creates a nonspecialized AudioDescriptorOther object.
 
@@ -522,6 +542,8 @@ class AudioDescriptorOther(ShortAudioDescriptor):
 class AudioDescriptorExtendedMpeg4(ShortAudioDescriptor):
   """Defines Extended MPEG4 Short Audio Descriptor inside Audio Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block, my_type):
     """Creates an AudioDescriptorExtendedMpeg4 object.
 
@@ -575,6 +597,8 @@ class AudioDescriptorExtendedMpeg4(ShortAudioDescriptor):
 class AudioDescriptorExtendedDra(ShortAudioDescriptor):
   """Defines Extended DRA Short Audio Descriptor inside Audio Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block, my_type):
     """Creates an AudioDescriptorExtendedDra object.
 
@@ -606,6 +630,8 @@ class AudioDescriptorExtendedDra(ShortAudioDescriptor):
 class VideoBlock(DataBlock):
   """Defines a Video Data Block."""
 
+  __slots__ = ('_offset',)
+
   def __init__(self, block, my_type):
     """Creates a VideoBlock object.
 
@@ -634,6 +660,8 @@ class VideoBlock(DataBlock):
 class ShortVideoDescriptor(object):
   """Defines a Short Video Descriptor."""
 
+  __slots__ = ('_byte',)
+
   def __init__(self, byte):
     """Creates a ShortVideoDescriptor object.
 
@@ -673,6 +701,8 @@ class ShortVideoDescriptor(object):
 class VendorSpecificBlock(DataBlock):
   """Defines a Vendor Specific Data Block."""
 
+  __slots__ = ('_offset',)
+
   def __init__(self, block, my_type):
     """Creates a VendorSpecificBlock object.
 
@@ -703,12 +733,14 @@ class VendorSpecificBlock(DataBlock):
     Returns:
       A list of bytes in the Vendor Specific Block.
     """
-    return self._block[4 + self._offset : len(self._block)]
+    return list(self._block[4 + self._offset : len(self._block)])
 
 
 class SpeakerBlock(DataBlock):
   """Defines a Speaker Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a SpeakerBlock object.
 
@@ -722,15 +754,17 @@ class SpeakerBlock(DataBlock):
     """Fetches the speaker allocation.
 
     Returns:
-      A dict of strings and bools indicating the speaker allocation.
+      A tools.FlagSet of the allocated speakers.
     """
     alloc_bits = ((self._block[2] & 0x07) << 8) + self._block[1]
-    return tools.DictFilter(_speakers, alloc_bits)
+    return _speakers.Decode(alloc_bits)
 
 
 class VideoCapabilityBlock(DataBlock):
   """Defines a Video Capability Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a VideoCapabilityBlock object.
 
@@ -818,6 +852,8 @@ class VideoCapabilityBlock(DataBlock):
 class ColorimetryDataBlock(DataBlock):
   """Defines a Colorimetry Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a ColorimetryDataBlock object.
 
@@ -831,9 +867,9 @@ class ColorimetryDataBlock(DataBlock):
     """Fetches the colorimetry.
 
     Returns:
-      A dict of strings and bools indicating the colorimetry.
+      A tools.FlagSet of the supported colorimetries.
     """
-    return tools.DictFilter(_colors, self._block[2])
+    return _colors.Decode(self._block[2])
 
   @property
   def metadata(self):
@@ -850,6 +886,8 @@ class ColorimetryDataBlock(DataBlock):
 class VideoFormatPrefBlock(DataBlock):
   """Defines a Video Format Preference Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a VideoFormatPrefBlock object.
 
@@ -885,6 +923,8 @@ class VideoFormatPrefBlock(DataBlock):
 class VideoPreference(object):
   """Defines a Video Preference object."""
 
+  __slots__ = ('_byte', '_type')
+
   def __init__(self, byte, atype):
     """Creates a VideoPreference object.
 
@@ -916,6 +956,8 @@ class VideoPreference(object):
 class VideoPreferenceVic(VideoPreference):
   """Defines a Video Preference VIC object."""
 
+  __slots__ = ()
+
   def __init__(self, byte):
     """Creates a Video Preference VIC object.
 
@@ -937,6 +979,8 @@ class VideoPreferenceVic(VideoPreference):
 class VideoPreferenceDtd(VideoPreference):
   """Defines a Video Preference DTD object."""
 
+  __slots__ = ()
+
   def __init__(self, byte):
     """Creates a Video Preference DTD object.
 
@@ -958,6 +1002,8 @@ class VideoPreferenceDtd(VideoPreference):
 class VideoPreferenceReserved(VideoPreference):
   """Defines a Video Preference Reserved object."""
 
+  __slots__ = ()
+
   def __init__(self, byte):
     """Creates a Video Preference Reserved object.
 
@@ -979,6 +1025,8 @@ class VideoPreferenceReserved(VideoPreference):
 class YCBCR420CapabilityMapBlock(DataBlock):
   """Defines a YCbCr 4:2:0 Capability Map Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a YCBCR420CapabilityMapBlock object.
 
@@ -1015,6 +1063,8 @@ class YCBCR420CapabilityMapBlock(DataBlock):
 class InfoFrameDataBlock(DataBlock):
   """Defines an InfoFrame Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a basic InfoFrameDataBlock object.
 
@@ -1086,6 +1136,8 @@ class InfoFrameDataBlock(DataBlock):
 class InfoFrameDescriptor(object):
   """Defines an InfoFrameDescriptor inside InfoFrame Data Block."""
 
+  __slots__ = ('_block', '_type')
+
   def __init__(self, block, my_type):
     """Creates an InfoFrameDescriptor object.
 
@@ -1130,12 +1182,14 @@ class InfoFrameDescriptor(object):
     Returns:
       A list of bytes that make up the data payload; may be an empty list.
     """
-    return self._block[1:self.payload_length + 1]
+    return list(self._block[1:self.payload_length + 1])
 
 
 class InfoFrameProcessingDescriptor(InfoFrameDescriptor):
   """Defines an InfoFrame Processing Descriptor Header."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates an InfoFrameProcessingDescriptor object.
 
@@ -1158,6 +1212,8 @@ class InfoFrameProcessingDescriptor(InfoFrameDescriptor):
 class InfoFrameVendorSpecific(InfoFrameDescriptor):
   """Defines InfoFrame Vendor Specific Desc inside InfoFrame Data Block."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates an InfoFrameVendorSpecific object.
 
@@ -1178,3 +1234,54 @@ class InfoFrameVendorSpecific(InfoFrameDescriptor):
         self._block[2],
         self._block[1]
     )
+
+
+# The dispatch tables used by GetDataBlock are built below, once the DataBlock
+# classes exist.
+
+
+def _Decoder(cls, my_type):
+  """Fetches a decoder for a DataBlock class whose constructor takes a type.
+
+  Args:
+    cls: The DataBlock class.
+    my_type: The string indicating the type of the data block.
+
+  Returns:
+    A callable that takes the bytes of the data block.
+  """
+  return lambda block: cls(block, my_type)
+
+
+_reserved = _Decoder(DataBlock, DB_TYPE_RESERVED)
+
+_tag_decoders = [
+    _reserved,  # 0x00
+    AudioBlock,
+    _Decoder(VideoBlock, DB_TYPE_VIDEO),
+    _Decoder(VendorSpecificBlock, DB_TYPE_VENDOR_SPECIFIC),
+    SpeakerBlock,
+    _Decoder(DataBlock, DB_TYPE_VESA_DISPLAY_TRANSFER_CHAR),
+    _reserved,  # 0x06
+    None  # 0x07: extended tag
+]
+
+# Indexed by the whole header byte: the tag in bits 7-5 and length in 4-0
+_decoders = [_tag_decoders[header >> 5] for header in xrange(0x100)]
+
+_extended_decoders = [_reserved] * 0x100
+_extended_decoders[0x00] = VideoCapabilityBlock
+_extended_decoders[0x01] = _Decoder(VendorSpecificBlock,
+                                    DB_TYPE_VENDOR_SPECIFIC_VIDEO)
+_extended_decoders[0x02] = _Decoder(DataBlock, DB_TYPE_VESA_DISPLAY_DEVICE)
+_extended_decoders[0x03] = _Decoder(DataBlock, DB_TYPE_VESA_VIDEO_TIMING)
+_extended_decoders[0x04] = _Decoder(DataBlock, DB_TYPE_HDMI_VIDEO)
+_extended_decoders[0x05] = ColorimetryDataBlock
+_extended_decoders[0x0D] = VideoFormatPrefBlock
+_extended_decoders[0x0E] = _Decoder(VideoBlock, DB_TYPE_YCBCR420_VIDEO)
+_extended_decoders[0x0F] = YCBCR420CapabilityMapBlock
+_extended_decoders[0x10] = _Decoder(DataBlock, DB_TYPE_MISC_AUDIO_FIELDS)
+_extended_decoders[0x11] = _Decoder(VendorSpecificBlock,
+                                    DB_TYPE_VENDOR_SPECIFIC_AUDIO)
+_extended_decoders[0x12] = _Decoder(DataBlock, DB_TYPE_HDMI_AUDIO)
+_extended_decoders[0x20] = InfoFrameDataBlock
@@ -35,11 +35,30 @@ SUBTYPE_DISPLAY_RANGE_CVT = 'CVT supported'
 SUBTYPE_DISPLAY_RANGE_UNKNOWN = 'Unknown'
 
 
+_DUMMY_HEADER = bytearray([0x00, 0x00, 0x00, 0x10, 0x00])
+
+# The stereo modes of a Detailed Timing Descriptor, indexed as computed by
+# DetailedTimingDescriptor.stereo_mode
+STEREO_MODES = (
+    'No stereo',
+    'No stereo',
+    'Field sequential stereo, right image when stereo sync signal = 1',
+    '2-way interleaved stereo, right image on even lines',
+    'Field sequential stereo, left image when stereo sync signal = 1',
+    '2-way interleaved stereo, left image on even lines',
+    '4-way interleaved stereo',
+    'Side-by-side interleaved stereo'
+)
+
+
 def GetDescriptor(edid, start, version):
   """Fetches a descriptor object.
 
+  Display descriptors are decoded by the decoder that a table indexed by
+  their tag holds (see RegisterDescriptor).
+
   Args:
-    edid: The list of bytes that make up the EDID.
+    edid: The bytes that make up the EDID (or extension).
     start: The index in the edid at which the descriptor starts.
     version: The string indicating the version of the EDID.
 
@@ -48,33 +67,49 @@ def GetDescriptor(edid, start, version):
   """
   block = edid[start:start + 18]
 
-  class_map = {
-      0xFF: ProductSerialNumberDescriptor,
-      0xFE: AlphanumDataStringDescriptor,
-      0xFD: GetDisplayRangeDescriptor,
-      0xFC: DisplayProductNameDescriptor,
-      0xFB: ColorPointDescriptor,
-      0xF9: DisplayColorDescriptor,
-      0xF8: CoordinatedVideoTimingsDescriptor,
-      0xF7: EstablishedTimingsIIIDescriptor,
-      0x10: DummyDescriptor
-  }
-
   if block[0] == block[1] == block[2] == 0x00:
-    tag = block[3]
-    if tag in class_map:
-      return class_map[tag](block)
-    elif tag == 0xFA:
-      return StandardTimingDescriptor(block, version)
-    elif tag >= 0x00 and tag <= 0x0F:
-      return ManuSpecifiedDescriptor(block)
-    else:  # tag >= 0x11 and tag <= 0xF6
-      return ReservedDescriptor(block)
+    return _decoders[block[3]](block, version)
 
   else:  # Detailed timing descriptor
     return DetailedTimingDescriptor(block)
 
 
+# Counts the calls to RegisterDescriptor, so that caches of decoded
+# descriptors can tell when they are stale
+decoder_generation = 0
+
+
+def RegisterDescriptor(tag, decoder):
+  """Plugs a decoder for a type of display descriptor into GetDescriptor.
+
+  The call bumps decoder_generation, which extensions.GetExtension checks to
+  drop the extensions whose descriptors were decoded with the old decoder. The
+  base descriptors an existing Edid object has decoded are kept until its
+  Invalidate method is called, and the results in a parse_cache.ParseCache
+  must be removed with ParseCache.Clear.
+
+  Args:
+    tag: The display descriptor tag (byte 3 of the descriptor).
+    decoder: A callable that takes the 18 bytes of the descriptor and the
+        string indicating the version of the EDID, and returns a Descriptor
+        object.
+
+  Returns:
+    The decoder previously registered for the tag.
+
+  Raises:
+    ValueError: If the tag is out of range.
+  """
+  if not 0x00 <= tag <= 0xFF:
+    raise ValueError('Invalid display descriptor tag %r' % tag)
+
+  global decoder_generation
+  previous = _decoders[tag]
+  _decoders[tag] = decoder
+  decoder_generation += 1
+  return previous
+
+
 def GetDisplayRangeDescriptor(block):
   """Fetches some type of Display Range Descriptor.
 
@@ -100,6 +135,8 @@ def GetDisplayRangeDescriptor(block):
 class Descriptor(object):
   """Defines a single descriptor and its properties."""
 
+  __slots__ = ('_block', '_type')
+
   def __init__(self, block, my_type):
     """Creates a Descriptor object.
 
@@ -125,7 +162,7 @@ class Descriptor(object):
     Returns:
       A list of bytes that make up this descriptor.
     """
-    return self._block
+    return list(self._block)
 
   def CheckErrors(self, index=None):
     """Checks the validity of this descriptor.
@@ -134,14 +171,40 @@ class Descriptor(object):
       index: The integer index of the descriptor being checked.
 
     Returns:
-      A list of error.Error objects. The list is None or empty if no errors.
+      A list of error.Error objects. The list is empty if no errors.
+    """
+    return list(self._IterErrors(index))
+
+  def HasErrors(self):
+    """Checks whether CheckErrors would find errors, stopping at the first.
+
+    Returns:
+      True if the descriptor has errors.
+    """
+    for _ in self._IterErrors():
+      return True
+    return False
+
+  def _IterErrors(self, index=None):
+    """Finds the errors of this descriptor, one at a time.
+
+    This is the only place the checks of a descriptor type are written;
+    descriptors that have checks override it.
+
+    Args:
+      index: The integer index of the descriptor being checked.
+
+    Returns:
+      An iterator over error.Error objects.
     """
-    pass
+    return iter(())
 
 
 class StringDescriptor(Descriptor):
   """Analyzes a String Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block, my_type):
     """Creates a StringDescriptor object.
 
@@ -169,25 +232,25 @@ class StringDescriptor(Descriptor):
 
     return alphanum_data
 
-  def CheckErrors(self, index=None):
-    """Checks the StringDescriptor for errors.
+  def _IterErrors(self, index=None):
+    """Finds the errors of the StringDescriptor.
 
     Args:
       index: The integer index of the descriptor.
 
-    Returns:
-      A list of error.Error objects, or None.
+    Yields:
+      error.Error objects.
     """
     if self._block[4] != 0x00:
-      loc = '%s %s' % (self._type, '#%d' % index if index else '')
-      return [error.Error(loc, 'Byte 5', 0x00, self._block[4])]
-    else:
-      return None
+      yield error.NewError(error.ERROR_STRING_DESCRIPTOR_BYTE_5,
+                           (self._type, index, self._block[4]), offset=4)
 
 
 class ProductSerialNumberDescriptor(StringDescriptor):
   """Analyzes a Product Serial Number Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a ProductSerialNumberDescriptor object.
 
@@ -200,6 +263,8 @@ class ProductSerialNumberDescriptor(StringDescriptor):
 class AlphanumDataStringDescriptor(StringDescriptor):
   """Analyzes an Alphanumerical Data String Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates an AlphanumDataStringDescriptor object.
 
@@ -212,6 +277,8 @@ class AlphanumDataStringDescriptor(StringDescriptor):
 class DisplayProductNameDescriptor(StringDescriptor):
   """Analyzes a Display Product Name Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a DisplayProductNameDescriptor object.
 
@@ -224,6 +291,8 @@ class DisplayProductNameDescriptor(StringDescriptor):
 class DisplayRangeDescriptor(Descriptor):
   """Analyzes a Display Range Descriptor."""
 
+  __slots__ = ('_subtype',)
+
   def __init__(self, block, subtype):
     """Creates a DisplayRangeDescriptor object.
 
@@ -333,8 +402,8 @@ class DisplayRangeDescriptor(Descriptor):
     """
     return self._block[9] * 10
 
-  def CheckErrors(self, index=None):
-    """Checks for errors.
+  def _IterErrors(self, index=None):
+    """Finds errors.
 
     Errors may include maximum values being less than minimum values, or
     invalid support flag values.
@@ -342,49 +411,40 @@ class DisplayRangeDescriptor(Descriptor):
     Args:
       index: The integer index of this descriptor (1-4).
 
-    Returns:
-      A list of error.Error objects.
+    Yields:
+      error.Error objects.
     """
-    errors = []
-
     max_vert = self.max_vertical_rate
     min_vert = self.min_vertical_rate
 
     max_hor = self.max_horizontal_rate
     min_hor = self.min_horizontal_rate
 
-    loc = '%s %s' % (self._type, '#%d' % index if index else '')
+    my_type = self._type
 
     if max_vert < min_vert:
-      errors.append(error.Error(loc, 'Maximum vertical rate less than minimum',
-                                'Max vert: %d\tMin vert: %d' % (max_vert,
-                                                                min_vert)))
+      yield error.NewError(error.ERROR_RANGE_VERTICAL_RATES,
+                           (my_type, index, max_vert, min_vert), offset=5)
 
     if max_hor < min_hor:
-      errors.append(error.Error(loc, 'Maximum horizontal rate less than '
-                                'minimum', '', 'Max hor: %d\tMin hor: %d' %
-                                (max_hor, min_hor)))
+      yield error.NewError(error.ERROR_RANGE_HORIZONTAL_RATES,
+                           (my_type, index, max_hor, min_hor), offset=7)
 
     if not self.pixel_clock:
-      errors.append(error.Error(loc, 'Pixel clock value invalid', 'Non-zero',
-                                self.pixel_clock))
-
-    val = [0x00, 0x01, 0x02, 0x04]
-
-    val_str = '0x00 0x01 0x02 0x04'
-
-    if self._block[10] not in val:
-      my_err = error.Error(loc + '- byte 10', 'Invalid value for Video Timing '
-                           'Support Flags', val_str, '0x%02X' % self._block[10])
-      errors.append(my_err)
+      yield error.NewError(error.ERROR_RANGE_PIXEL_CLOCK,
+                           (my_type, index, self.pixel_clock), offset=9)
 
-    return errors
+    if self._block[10] not in (0x00, 0x01, 0x02, 0x04):
+      yield error.NewError(error.ERROR_RANGE_SUPPORT_FLAGS,
+                           (my_type, index, self._block[10]), offset=10)
 
 
 # NB: This class is untested - no sample EDIDs to check
 class DisplayRangeGTF(DisplayRangeDescriptor):
   """Analyzes a Display Range GTF Descriptor (subtype of Display Range)."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a DisplayRangeGTF object.
 
@@ -442,6 +502,8 @@ class DisplayRangeGTF(DisplayRangeDescriptor):
 class DisplayRangeCVT(DisplayRangeDescriptor):
   """Analyzes a Display Range CVT Descriptor (subtype of Display Range)."""
 
+  __slots__ = ()
+
   _aspect_ratios = [
       [0x80, '4:3 AR'],
       [0x40, '16:9 AR'],
@@ -449,6 +511,19 @@ class DisplayRangeCVT(DisplayRangeDescriptor):
       [0x10, '5:4 AR'],
       [0x08, '15:9 AR']
   ]
+  _aspect_ratio_flags = tools.FlagTable(_aspect_ratios)
+
+  _blanking_flags = tools.FlagTable([
+      [0x08, 'Standard CVT Blanking'],
+      [0x10, 'Reduced CVT Blanking']
+  ])
+
+  _scaling_flags = tools.FlagTable([
+      [0x80, 'Horizontal Shrink'],
+      [0x40, 'Horizontal Stretch'],
+      [0x20, 'Vertical Shrink'],
+      [0x10, 'Vertical Stretch']
+  ])
 
   def __init__(self, block):
     """Creates a DisplayRangeDescriptor object.
@@ -509,9 +584,9 @@ class DisplayRangeCVT(DisplayRangeDescriptor):
     """Fetches supported aspect ratios.
 
     Returns:
-      A dict of strings and bools specifying supported aspect ratios.
+      A tools.FlagSet of the supported aspect ratios.
     """
-    return tools.DictFilter(self._aspect_ratios, self._block[14])
+    return self._aspect_ratio_flags.Decode(self._block[14])
 
   @property
   def preferred_aspect_ratio(self):
@@ -530,32 +605,18 @@ class DisplayRangeCVT(DisplayRangeDescriptor):
     """Fetches the CVT blanking support.
 
     Returns:
-      A collections.OrderedDict of string keys and boolean values indicating
-      types of CVT blanking support.
+      A tools.FlagSet of the supported types of CVT blanking.
     """
-    b = collections.OrderedDict()
-
-    b['Standard CVT Blanking'] = bool(self._block[15] & 0x08)
-    b['Reduced CVT Blanking'] = bool(self._block[15] & 0x10)
-
-    return b
+    return self._blanking_flags.Decode(self._block[15])
 
   @property
   def display_scaling_support(self):
     """Fetches the types of display scaling support.
 
     Returns:
-      A collections.OrderedDict of string keys and boolean values indicating the
-      supported types of display scaling.
+      A tools.FlagSet of the supported types of display scaling.
     """
-    d = collections.OrderedDict()
-
-    d['Horizontal Shrink'] = bool(self._block[16] & 0x80)
-    d['Horizontal Stretch'] = bool(self._block[16] & 0x40)
-    d['Vertical Shrink'] = bool(self._block[16] & 0x20)
-    d['Vertical Stretch'] = bool(self._block[16] & 0x10)
-
-    return d
+    return self._scaling_flags.Decode(self._block[16])
 
   @property
   def preferred_vert_refresh(self):
@@ -571,6 +632,8 @@ class DisplayRangeCVT(DisplayRangeDescriptor):
 class ColorPointDescriptor(Descriptor):
   """Analyzes a Color Point Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a ColorPointDescriptor object.
 
@@ -597,27 +660,24 @@ class ColorPointDescriptor(Descriptor):
     """
     return ColorPoint(self._block, 10)
 
-  def CheckErrors(self, index=None):
-    """Checks the ColorPointDescriptor for errors.
+  def _IterErrors(self, index=None):
+    """Finds the errors of the ColorPointDescriptor.
 
     Args:
       index: The integer index of the descriptor.
 
-    Returns:
-      A list of error.Error objects.
+    Yields:
+      error.Error objects.
     """
-    errors = []
-
     if self._block[5] == 0x00:
-      errors.append(error.Error('ColorPointDescriptor', 'First color point is '
-                                'invalid', 'Non-0 value', 0x00))
-
-    return errors
+      yield error.NewError(error.ERROR_COLOR_POINT, offset=5)
 
 
 class ColorPoint(object):
   """Analyzes a single Color Point within a Color Point Descriptor."""
 
+  __slots__ = ('_block',)
+
   def __init__(self, block, start):
     """Creates a ColorPoint object.
 
@@ -672,6 +732,8 @@ class ColorPoint(object):
 class StandardTimingDescriptor(Descriptor):
   """Analyzes a Standard Timing Descriptor."""
 
+  __slots__ = ('_version',)
+
   def __init__(self, block, version):
     """Creates a StandardTimingDescriptor object.
 
@@ -691,7 +753,8 @@ class StandardTimingDescriptor(Descriptor):
     """
     sts = []
 
-    for x in xrange(0, 7):
+    # Six standard timings in bytes 5-16; byte 17 is padding (0x0A)
+    for x in xrange(0, 6):
       st = standard_timings.GetStandardTiming(self._block, 5 + (x*2),
                                               self._version)
       if st:
@@ -703,6 +766,8 @@ class StandardTimingDescriptor(Descriptor):
 class DisplayColorDescriptor(Descriptor):
   """Analyzes a Display Color Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a DisplayColorDescriptor object.
 
@@ -769,6 +834,8 @@ class DisplayColorDescriptor(Descriptor):
 class CoordinatedVideoTimingsDescriptor(Descriptor):
   """Analyzes a Coordinated Video Timings Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a CoordinatedVideoTimingsDescriptor object.
 
@@ -793,29 +860,78 @@ class CoordinatedVideoTimingsDescriptor(Descriptor):
 
     return cvts
 
-  def CheckErrors(self, index=None):
-    """Checks the CoordinatedVideoTimingsDescriptor for errors.
+  def _IterErrors(self, index=None):
+    """Finds the errors of the CoordinatedVideoTimingsDescriptor.
 
     Args:
       index: The integer index of the descriptor.
 
-    Returns:
-      A list of error.Error objects.
+    Yields:
+      error.Error objects.
     """
-    errors = []
-    cvts = self.coordinated_video_timings
-
-    for x in xrange(0, len(cvts)):
-      err = cvts[x].CheckErrors(x + 1)
-      if err:
-        errors.append(err)
+    count = 0
 
-    return errors
+    for x in xrange(0, 4):
+      start = 6 + (x * 3)
+      cvt = cvt_module.GetCoordinatedVideoTiming(self._block, start)
+      if cvt:
+        count += 1
+        for e in cvt.CheckErrors(count):
+          yield e.Place(start)
 
 
 class EstablishedTimingsIIIDescriptor(Descriptor):
   """Analyzes an Established Timings III Descriptor."""
 
+  __slots__ = ()
+
+  _timings = tools.FlagTable([
+      [0x80000000000, '640 x 350 @ 85 Hz'],
+      [0x40000000000, '640 x 400 @ 85 Hz'],
+      [0x20000000000, '720 x 400 @ 85 Hz'],
+      [0x10000000000, '640 x 480 @ 85 Hz'],
+      [0x8000000000, '848 x 480 @ 60 Hz'],
+      [0x4000000000, '800 x 600 @ 85 Hz'],
+      [0x2000000000, '1024 x 768 @ 85 Hz'],
+      [0x1000000000, '1152 x 864 @ 75 Hz'],
+      [0x800000000, '1280 x 768 @ 60 Hz (RB)'],
+      [0x400000000, '1280 x 768 @ 60 Hz'],
+      [0x200000000, '1280 x 768 @ 75 Hz'],
+      [0x100000000, '1280 x 768 @ 85 Hz'],
+      [0x80000000, '1280 x 960 @ 60 Hz'],
+      [0x40000000, '1280 x 960 @ 85 Hz'],
+      [0x20000000, '1280 x 1024 @ 60 Hz'],
+      [0x10000000, '1280 x 1024 @ 85 Hz'],
+      [0x8000000, '1360 x 768 @ 60 Hz'],
+      [0x4000000, '1440 x 900 @ 60 Hz (RB)'],
+      [0x2000000, '1440 x 900 @ 60 Hz'],
+      [0x1000000, '1440 x 900 @ 75 Hz'],
+      [0x800000, '1440 x 900 @ 85 Hz'],
+      [0x400000, '1400 x 1050 @ 60 Hz (RB)'],
+      [0x200000, '1400 x 1050 @ 60 Hz'],
+      [0x100000, '1400 x 1050 @ 75 Hz'],
+      [0x80000, '1400 x 1050 @ 85 Hz'],
+      [0x40000, '1680 x 1050 @ 60 Hz (RB)'],
+      [0x20000, '1680 x 1050 @ 60 Hz'],
+      [0x10000, '1680 x 1050 @ 75 Hz'],
+      [0x8000, '1680 x 1050 @ 85 Hz'],
+      [0x4000, '1600 x 1200 @ 60 Hz'],
+      [0x2000, '1600 x 1200 @ 65 Hz'],
+      [0x1000, '1600 x 1200 @ 70 Hz'],
+      [0x800, '1600 x 1200 @ 75 Hz'],
+      [0x400, '1600 x 1200 @ 85 Hz'],
+      [0x200, '1792 x 1344 @ 60 Hz'],
+      [0x100, '1792 x 1344 @ 75 Hz'],
+      [0x80, '1856 x 1392 @ 60 Hz'],
+      [0x40, '1856 x 1392 @ 75 Hz'],
+      [0x20, '1920 x 1200 @ 60 Hz (RB)'],
+      [0x10, '1920 x 1200 @ 60 Hz'],
+      [0x8, '1920 x 1200 @ 75 Hz'],
+      [0x4, '1920 x 1200 @ 85 Hz'],
+      [0x2, '1920 x 1440 @ 60 Hz'],
+      [0x1, '1920 x 1440 @ 75 Hz']
+  ])
+
   def __init__(self, block):
     """Creates an EstablishedTimingsIIIDescriptor object.
 
@@ -823,71 +939,33 @@ class EstablishedTimingsIIIDescriptor(Descriptor):
       block: A list of 18-bytes that make up this descriptor.
     """
     Descriptor.__init__(self, block, TYPE_ESTABLISHED_TIMINGS_III)
-    self._timings = [
-        [0x80000000000, '640 x 350 @ 85 Hz'],
-        [0x40000000000, '640 x 400 @ 85 Hz'],
-        [0x20000000000, '720 x 400 @ 85 Hz'],
-        [0x10000000000, '640 x 480 @ 85 Hz'],
-        [0x8000000000, '848 x 480 @ 60 Hz'],
-        [0x4000000000, '800 x 600 @ 85 Hz'],
-        [0x2000000000, '1024 x 768 @ 85 Hz'],
-        [0x1000000000, '1152 x 864 @ 75 Hz'],
-        [0x800000000, '1280 x 768 @ 60 Hz (RB)'],
-        [0x400000000, '1280 x 768 @ 60 Hz'],
-        [0x200000000, '1280 x 768 @ 75 Hz'],
-        [0x100000000, '1280 x 768 @ 85 Hz'],
-        [0x80000000, '1280 x 960 @ 60 Hz'],
-        [0x40000000, '1280 x 960 @ 85 Hz'],
-        [0x20000000, '1280 x 1024 @ 60 Hz'],
-        [0x10000000, '1280 x 1024 @ 85 Hz'],
-        [0x8000000, '1360 x 768 @ 60 Hz'],
-        [0x4000000, '1440 x 900 @ 60 Hz (RB)'],
-        [0x2000000, '1440 x 900 @ 60 Hz'],
-        [0x1000000, '1440 x 900 @ 75 Hz'],
-        [0x800000, '1440 x 900 @ 85 Hz'],
-        [0x400000, '1400 x 1050 @ 60 Hz (RB)'],
-        [0x200000, '1400 x 1050 @ 60 Hz'],
-        [0x100000, '1400 x 1050 @ 75 Hz'],
-        [0x80000, '1400 x 1050 @ 85 Hz'],
-        [0x40000, '1680 x 1050 @ 60 Hz (RB)'],
-        [0x20000, '1680 x 1050 @ 60 Hz'],
-        [0x10000, '1680 x 1050 @ 75 Hz'],
-        [0x8000, '1680 x 1050 @ 85 Hz'],
-        [0x4000, '1600 x 1200 @ 60 Hz'],
-        [0x2000, '1600 x 1200 @ 65 Hz'],
-        [0x1000, '1600 x 1200 @ 70 Hz'],
-        [0x800, '1600 x 1200 @ 75 Hz'],
-        [0x400, '1600 x 1200 @ 85 Hz'],
-        [0x200, '1792 x 1344 @ 60 Hz'],
-        [0x100, '1792 x 1344 @ 75 Hz'],
-        [0x80, '1856 x 1392 @ 60 Hz'],
-        [0x40, '1856 x 1392 @ 75 Hz'],
-        [0x20, '1920 x 1200 @ 60 Hz (RB)'],
-        [0x10, '1920 x 1200 @ 60 Hz'],
-        [0x8, '1920 x 1200 @ 75 Hz'],
-        [0x4, '1920 x 1200 @ 85 Hz'],
-        [0x2, '1920 x 1440 @ 60 Hz'],
-        [0x1, '1920 x 1440 @ 75 Hz']
-    ]
 
   @property
   def established_timings(self):
     """Fetches the supported established timings.
 
     Returns:
-      A dict of strings and bools denoting the supported established timings.
+      A tools.FlagSet of the supported established timings.
     """
     # Bytes 6-10 plus first half of 11
     timing_byte = ((self._block[6] << 36) + (self._block[7] << 28) +
                    (self._block[8] << 20) + (self._block[9] << 12) +
                    (self._block[10] << 4) + (self._block[11] >> 4))
-    return tools.DictFilter(self._timings, timing_byte)
+    return self._timings.Decode(timing_byte)
+
+
+# The names of all the timings of an Established Timings III Descriptor, in
+# bit order
+ESTABLISHED_TIMINGS_III_NAMES = tuple(
+    EstablishedTimingsIIIDescriptor._timings.names)
 
 
 # This descriptor is not supposed to be used yet
 class ReservedDescriptor(Descriptor):
   """Defines a ReservedDescriptor (which should not yet appear in EDID)."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a ReservedDescriptor object.
 
@@ -901,6 +979,8 @@ class ReservedDescriptor(Descriptor):
 class DummyDescriptor(Descriptor):
   """Defines a Dummy (placeholder) Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a DummyDescriptor object.
 
@@ -910,33 +990,30 @@ class DummyDescriptor(Descriptor):
     Descriptor.__init__(self, block, TYPE_DUMMY)
 
   # First 5 bytes of Dummy Descriptor should be 0x00
-  def CheckErrors(self, index=None):
-    """Checks the DummyDescriptor for errors.
+  def _IterErrors(self, index=None):
+    """Finds the errors of the DummyDescriptor.
 
     Args:
       index: The integer index of this descriptor (1-4).
 
-    Returns:
-      A list of error.Error objects.
+    Yields:
+      error.Error objects.
     """
-    errors = []
-    loc = '%s %s' % (self._type, '#%d' % index if index else '')
-
-    if self._block[0:5] != [0x00, 0x00, 0x00, 0x10, 0x00]:
-      found_header = '0x%02X ' * 5 % tuple(self._block[0:5])
-      errors.append(error.Error(loc, 'Bytes 0-4', '0x00 0x00 0x00 0x10 0x00',
-                                found_header))
-    if self._block[5:18] != [0x00] * 13:
-      found_body = '0x%02X ' * 13 % tuple(self._block[5:18])
-      errors.append(error.Error(loc, 'Bytes 5-18', 'All 0x00',
-                                found_body))
-
-    return errors
+    if bytearray(self._block[0:5]) != _DUMMY_HEADER:
+      yield error.NewError(error.ERROR_DUMMY_HEADER,
+                           (self._type, index, tuple(self._block[0:5])),
+                           offset=0)
+    if any(self._block[5:18]):
+      yield error.NewError(error.ERROR_DUMMY_BODY,
+                           (self._type, index, tuple(self._block[5:18])),
+                           offset=5)
 
 
 class ManuSpecifiedDescriptor(Descriptor):
   """Defines a Manufacturer Specified Descriptor."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a ManuSpecifiedDescriptor object.
 
@@ -951,12 +1028,14 @@ class ManuSpecifiedDescriptor(Descriptor):
     Returns:
       A list of bytes that make up the data blob.
     """
-    return self._block[5:18]
+    return list(self._block[5:18])
 
 
 class DetailedTimingDescriptor(Descriptor):
   """Defines a Detailed Timing Descriptor, perhaps the most common type."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a DetailedTiming Descriptorobject.
 
@@ -1113,20 +1192,9 @@ class DetailedTimingDescriptor(Descriptor):
     Returns:
       A string indicating the stereo mode.
     """
-    # Bits 6-5 | Stereo mode
-    stereo_bits = (self._block[17] & 0x60) >> 4 + (self._block[17] & 0x01)
-    stereo_map = [
-        'No stereo',
-        'No stereo',
-        'Field sequential stereo, right image when stereo sync signal = 1',
-        '2-way interleaved stereo, right image on even lines',
-        'Field sequential stereo, left image when stereo sync signal = 1',
-        '2-way interleaved stereo, left image on even lines',
-        '4-way interleaved stereo',
-        'Side-by-side interleaved stereo'
-    ]
-
-    return stereo_map[stereo_bits]
+    # Bits 6-5 and bit 0 | Stereo mode
+    stereo_bits = ((self._block[17] & 0x60) >> 4) | (self._block[17] & 0x01)
+    return STEREO_MODES[stereo_bits]
 
   @property
   def sync_type(self):
@@ -1135,31 +1203,117 @@ class DetailedTimingDescriptor(Descriptor):
     Returns:
       A dict of strings and bools indicating sync signal definition types.
     """
-    s = collections.OrderedDict()
-    s['Type'] = None
+    # Bits 4-1 | Sync signal definitions
+    return GetSyncType((self._block[17] >> 1) & 0x0F)
 
-    # Bits 4-1 | Sync signal definitions:
-    sync_bits = (self._block[17] >> 1) & 0x0F
-    if not sync_bits & 0x08:  # Analog sync signal definitions
+  @property
+  def h_total_pixels(self):
+    """Fetches the total number of pixels per line, active and blanking.
 
-      if not sync_bits & 0x04:
-        s['Type'] = 'Analog Composite Sync'
-      else:
-        s['Type'] = 'Bipolar Analog Composite Sync'
+    Returns:
+      An integer denoting the horizontal total.
+    """
+    block = self._block
+    return (((block[4] & 0xF0) << 4) + block[2] +
+            ((block[4] & 0x0F) << 8) + block[3])
+
+  @property
+  def v_total_lines(self):
+    """Fetches the total number of lines, active and blanking.
+
+    Returns:
+      An integer denoting the vertical total.
+    """
+    block = self._block
+    return (((block[7] & 0xF0) << 4) + block[5] +
+            ((block[7] & 0x0F) << 8) + block[6])
+
+  @property
+  def refresh_rate(self):
+    """Fetches the vertical refresh rate (the field rate if interlaced).
+
+    Returns:
+      A float denoting the refresh rate (in Hz), or None if either total is 0.
+    """
+    total = self.h_total_pixels * self.v_total_lines
+    if not total:
+      return None
+    # Bytes 0-1 are the pixel clock in units of 10 kHz
+    return ((self._block[1] << 8) + self._block[0]) * 10000.0 / total
+
+  @property
+  def line_rate(self):
+    """Fetches the horizontal line rate.
+
+    Returns:
+      A float denoting the line rate (in kHz), or None if the horizontal total
+      is 0.
+    """
+    h_total = self.h_total_pixels
+    if not h_total:
+      return None
+    return ((self._block[1] << 8) + self._block[0]) * 10.0 / h_total
+
+
+def GetSyncType(sync_bits):
+  """Describes the sync signal definitions of a Detailed Timing Descriptor.
+
+  Args:
+    sync_bits: The integer made of bits 4-1 of byte 17 of the descriptor.
 
+  Returns:
+    A dict of strings and bools indicating sync signal definition types.
+  """
+  s = collections.OrderedDict()
+  s['Type'] = None
+
+  if not sync_bits & 0x08:  # Analog sync signal definitions
+
+    if not sync_bits & 0x04:
+      s['Type'] = 'Analog Composite Sync'
+    else:
+      s['Type'] = 'Bipolar Analog Composite Sync'
+
+    s['Serrations'] = bool(sync_bits & 0x02)
+    s['Sync on RGB'] = bool(sync_bits & 0x01)
+
+  else:  # Digital sync signal definitions
+    if not sync_bits & 0x04:
+      s['Type'] = 'Digital Composite Sync'
       s['Serrations'] = bool(sync_bits & 0x02)
-      s['Sync on RGB'] = bool(sync_bits & 0x01)
+    else:
+      s['Type'] = 'Digital Separate Sync'
+      s['Vertical sync'] = 'Positive' if sync_bits & 0x02 else 'Negative'
 
-    else:  # Digital sync signal definitions
-      if not sync_bits & 0x04:
-        s['Type'] = 'Digital Composite Sync'
-        s['Serrations'] = bool(sync_bits & 0x02)
-      else:
-        s['Type'] = 'Digital Separate Sync'
-        s['Vertical sync'] = 'Positive' if sync_bits & 0x02 else 'Negative'
+    s['Horizontal sync (outside of V-sync)'] = ('Positive' if sync_bits & 0x01
+                                                else 'Negative')
 
-      s['Horizontal sync (outside of V-sync)'] = ('Positive' if sync_bits & 0x01
-                                                  else 'Negative')
+  return s
 
-    return s
 
+def _Decoder(cls):
+  """Fetches a decoder for a Descriptor class that does not need the version.
+
+  Args:
+    cls: The Descriptor class (or function returning a Descriptor).
+
+  Returns:
+    A callable that takes the bytes of the descriptor and the EDID version.
+  """
+  return lambda block, unused_version: cls(block)
+
+
+# The dispatch table used by GetDescriptor, built once the Descriptor classes
+# exist. Entries take the descriptor bytes and the EDID version.
+_decoders = ([_Decoder(ManuSpecifiedDescriptor)] * 0x10 +  # 0x00-0x0F
+             [_Decoder(ReservedDescriptor)] * 0xF0)  # 0x10-0xFF
+_decoders[0x10] = _Decoder(DummyDescriptor)
+_decoders[0xF7] = _Decoder(EstablishedTimingsIIIDescriptor)
+_decoders[0xF8] = _Decoder(CoordinatedVideoTimingsDescriptor)
+_decoders[0xF9] = _Decoder(DisplayColorDescriptor)
+_decoders[0xFA] = StandardTimingDescriptor
+_decoders[0xFB] = _Decoder(ColorPointDescriptor)
+_decoders[0xFC] = _Decoder(DisplayProductNameDescriptor)
+_decoders[0xFD] = _Decoder(GetDisplayRangeDescriptor)
+_decoders[0xFE] = _Decoder(AlphanumDataStringDescriptor)
+_decoders[0xFF] = _Decoder(ProductSerialNumberDescriptor)
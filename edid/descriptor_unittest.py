@@ -0,0 +1,88 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for descriptor.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import unittest
+
+import descriptor
+import unittest_util
+
+
+# The 1920x1080 @ 60 Hz preferred timing of test_edid
+_DTD = bytearray([0x02, 0x3A, 0x80, 0x18, 0x71, 0x38, 0x2D, 0x40, 0x58, 0x2C,
+                  0x45, 0x00, 0x0F, 0x48, 0x42, 0x00, 0x00, 0x1E])
+
+
+def MakeDtd(features):
+  """Creates a DetailedTimingDescriptor with a given features byte.
+
+  Args:
+    features: The value of byte 17 of the descriptor.
+
+  Returns:
+    A descriptor.DetailedTimingDescriptor object.
+  """
+  block = bytearray(_DTD)
+  block[17] = features
+  return descriptor.GetDescriptor(block, 0, '1.4')
+
+
+class StereoModeTest(unittest.TestCase):
+  """Tests DetailedTimingDescriptor.stereo_mode."""
+
+  def testNoStereo(self):
+    self.assertEqual(MakeDtd(0x1E).stereo_mode, 'No stereo')
+    self.assertEqual(MakeDtd(0x01).stereo_mode, 'No stereo')
+
+  def testTwoWayInterleaved(self):
+    # Bits 6-5 = 01 and bit 0 = 1
+    self.assertEqual(MakeDtd(0x21).stereo_mode,
+                     '2-way interleaved stereo, right image on even lines')
+    self.assertEqual(MakeDtd(0x41).stereo_mode,
+                     '2-way interleaved stereo, left image on even lines')
+
+  def testSideBySide(self):
+    self.assertEqual(MakeDtd(0x61).stereo_mode,
+                     'Side-by-side interleaved stereo')
+
+  def testEveryBitPattern(self):
+    for bits in xrange(8):
+      features = ((bits & 0x06) << 4) | (bits & 0x01)
+      self.assertEqual(MakeDtd(features).stereo_mode,
+                       descriptor.STEREO_MODES[bits])
+
+
+class HasErrorsTest(unittest.TestCase):
+  """Tests that HasErrors agrees with CheckErrors."""
+
+  def testAgreesWithCheckErrors(self):
+    edid = unittest_util.ReadTestEdid()
+    checked = set()
+
+    for start in (0x36, 0x48, 0x5A, 0x6C):
+      for offset in xrange(0, 18):
+        for value in (0x00, 0x01, 0x0A, 0x10, 0x80, 0xF8, 0xFB, 0xFF):
+          block = edid[start : start + 18]
+          block[offset] = value
+          desc = descriptor.GetDescriptor(block, 0, '1.4')
+          checked.add(desc.type)
+          self.assertEqual(desc.HasErrors(), bool(desc.CheckErrors(1)),
+                           '%s, byte %d = 0x%02X' % (desc.type, offset, value))
+
+    for my_type in (descriptor.TYPE_DUMMY, descriptor.TYPE_COLOR_POINT_DATA,
+                    descriptor.TYPE_CVT_TIMING,
+                    descriptor.TYPE_DISPLAY_RANGE_LIMITS,
+                    descriptor.TYPE_DISPLAY_PRODUCT_NAME):
+      self.assertIn(my_type, checked)
+
+
+if __name__ == '__main__':
+  unittest.main()
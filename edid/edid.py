@@ -5,27 +5,69 @@
 
 """Provides EDID class with methods for parsing info."""
 
-import array
-
+import base_block
 import basic_display
 import chromaticity
 import descriptor
 import error_check
 import established_timings
 import extensions
+import layout
+import modes
 import standard_timings
+import summary
+import tools
 
 
 class Edid(object):
   """Defines methods and properties for accesing an EDID object's content."""
 
-  def __init__(self, e):
-    """Creates an Edid object with a list of bytes.
+  def __init__(self, e, cache=None):
+    """Creates an Edid object with the bytes that make up the EDID.
+
+    The bytes are held in a single bytearray, which stores one byte per byte of
+    EDID rather than one Python object per byte. A bytearray passed in is used
+    as is; any other sequence of bytes (str, memoryview or a list of integers)
+    is converted once here.
+
+    Sections of the EDID are decoded lazily, the first time they are
+    accessed, and the resulting objects are cached on this Edid, so that later
+    accesses are plain attribute lookups. If the
+    bytearray passed in is modified afterwards, call Invalidate so that the
+    cached objects are rebuilt from the new contents.
 
     Args:
-      e: The list of bytes that make up this EDID.
+      e: The bytes that make up this EDID.
+      cache: An optional parse_cache.ParseCache, which lets GetErrors reuse the
+          errors found earlier in an identical EDID.
     """
-    self._edid = e
+    self._edid = e if isinstance(e, bytearray) else bytearray(e)
+    self._cache = {}
+    self._parse_cache = cache
+
+  def _GetCached(self, key, build):
+    """Fetches a decoded section of the EDID, building it on first use.
+
+    Args:
+      key: A hashable key identifying the section.
+      build: A callable with no arguments that decodes the section.
+
+    Returns:
+      The cached result of build().
+    """
+    try:
+      return self._cache[key]
+    except KeyError:
+      value = self._cache[key] = build()
+      return value
+
+  def Invalidate(self):
+    """Drops all cached sections so they are decoded again on next access.
+
+    Must be called after modifying the underlying bytearray in place.
+    """
+    tools.ClearCachedProperties(self)
+    self._cache.clear()
 
   def GetData(self, start=None, end=None):
     """Fetches the raw data for the entire or part of the EDID.
@@ -37,7 +79,38 @@ class Edid(object):
     Returns:
       A list of bytes.
     """
-    return self._edid[start:end]
+    return list(self._edid[start:end])
+
+  @property
+  def data(self):
+    """Fetches the bytes of the EDID, without copying them.
+
+    Returns:
+      The bytearray holding this EDID. Call Invalidate after modifying it.
+    """
+    return self._edid
+
+  @tools.CachedProperty
+  def base_block(self):
+    """Fetches the fixed-position fields of the base EDID, decoded in one pass.
+
+    Returns:
+      A base_block.BaseBlock record.
+    """
+    return base_block.DecodeBaseBlock(self._edid)
+
+  @tools.CachedProperty
+  def summary(self):
+    """Fetches the identity and preferred timing of the display.
+
+    Only the bytes holding them are read, without decoding any section of the
+    EDID, so this is much cheaper than the properties it matches when nothing
+    else is needed.
+
+    Returns:
+      A summary.Summary record.
+    """
+    return summary.GetSummary(self._edid)
 
   @property
   def manufacturer_id(self):
@@ -46,7 +119,7 @@ class Edid(object):
     Returns:
       A three letter string that represents the manufacturer ID.
     """
-    manu_id = ((self._edid[0x08] << 8) + self._edid[0x09])
+    manu_id = self.base_block.manufacturer
 
     c1 = self._ConvertToLetter((manu_id >> 10) & 0x1F)
     c2 = self._ConvertToLetter((manu_id >> 5) & 0x1F)
@@ -65,7 +138,7 @@ class Edid(object):
       An integer denoting the product code.
     """
 
-    return (self._edid[0x0B] << 8) + self._edid[0x0A]
+    return self.base_block.product_code
 
   @property
   def serial_number(self):
@@ -76,8 +149,7 @@ class Edid(object):
     Returns:
       An integer denoting serial number or None.
     """
-    sn = ((self._edid[0x0F] << 24) + (self._edid[0x0E] << 16) +
-          (self._edid[0x0D] << 8) + (self._edid[0x0C]))
+    sn = self.base_block.serial_number
 
     return sn if sn else None
 
@@ -88,10 +160,11 @@ class Edid(object):
     Returns:
       None, if unspecified, or an integer indicating the week number.
     """
-    if self._edid[0x10] in [0, 255]:
+    week = self.base_block.week
+    if week in [0, 255]:
       return None
     else:
-      return self._edid[0x10]
+      return week
 
   @property
   def manufacturing_year(self):
@@ -100,10 +173,11 @@ class Edid(object):
     Returns:
       None, if unspecified, or an integer indicating the year.
     """
-    if self._edid[0x10] == 255:
+    base = self.base_block
+    if base.week == 255:
       return None
     else:
-      return self._edid[0x11] + 1990
+      return base.year + 1990
 
   @property
   def model_year(self):
@@ -114,8 +188,9 @@ class Edid(object):
     Returns:
       None, if unspecified, or an integer indicating the model year.
     """
-    if self._edid[0x10] == 255:
-      return self._edid[0x11] + 1990
+    base = self.base_block
+    if base.week == 255:
+      return base.year + 1990
     else:
       return None
 
@@ -126,6 +201,7 @@ class Edid(object):
     Returns:
       An integer denoting the number of extensions.
     """
+    # Read directly, so that a truncated base block still reports it
     return self._edid[0x7E]
 
   def _ConvertToLetter(self, b):
@@ -141,58 +217,116 @@ class Edid(object):
     """
     return chr(b+64)
 
-  @property
+  @tools.CachedProperty
   def edid_version(self):
     """Fetches the EDID version (1.3 or 1.4).
 
     Returns:
       A string indicating the EDID version.
     """
+    # Read directly, so that a truncated base block still reports it
     return '%d.%d' % (self._edid[0x12], self._edid[0x13])
 
-  @property
+  @tools.CachedProperty
   def basic_display(self):
     """Fetches the Basic Display information in this EDID.
 
     Returns:
       A basic_display.BasicDisplay object.
     """
-    return basic_display.BasicDisplay(self._edid, self.edid_version)
+    return basic_display.BasicDisplay(self.base_block, self.edid_version)
 
-  @property
+  @tools.CachedProperty
   def chromaticity(self):
     """Fetches the Chromaticity information in this EDID.
 
     Returns:
       A chromaticity.Chromaticity object.
     """
-    return chromaticity.Chromaticity(self._edid)
+    return chromaticity.Chromaticity(self.base_block)
 
-  @property
+  @tools.CachedProperty
   def established_timings(self):
     """Fetches the Established Timings information in this EDID.
 
     Returns:
       An established_timings.EstablishedTimings object.
     """
-    return established_timings.EstablishedTimings(self._edid)
+    return established_timings.EstablishedTimings(self.base_block)
+
+  @property
+  def layout(self):
+    """Fetches the offsets of every structure in this EDID.
+
+    The layout is cheap to build and is not kept, so that an Edid object does
+    not hold a reference to itself through it.
+
+    Returns:
+      A layout.Layout object.
+    """
+    return layout.GetLayout(self._edid, self.GetExtension)
+
+  @tools.CachedProperty
+  def mode_index(self):
+    """Fetches the video modes this EDID supports, gathered once.
+
+    Returns:
+      A modes.ModeIndex object.
+    """
+    return modes.GetModeIndex(self)
 
   @property
   def standard_timings(self):
     """Fetches the Standard Timing information in this EDID.
 
     Returns:
-      A standard_timings.StandardTiming object.
+      A list of standard_timings.StandardTiming objects.
+    """
+    return list(self._GetCached('standard_timings', self._BuildStandardTimings))
+
+  def _BuildStandardTimings(self):
+    """Collects the used standard timings of the base EDID.
+
+    Returns:
+      A list of standard_timings.StandardTiming objects.
     """
-    base = 38
     sts = []
     for x in xrange(0, 8):
-      st = standard_timings.GetStandardTiming(self._edid, (base + (x * 2)),
-                                              self.edid_version)
+      st = self.GetStandardTiming(x)
       if st:
         sts.append(st)
     return sts
 
+  def GetStandardTiming(self, index):
+    """Fetches a single Standard Timing's information in this EDID.
+
+    Args:
+      index: The standard timing index (0-7) within the EDID.
+
+    Returns:
+      A standard_timings.StandardTiming object, or None if unused.
+
+    Raises:
+      IndexError: If index is not in the range 0-7.
+    """
+    return self._GetCached(('standard_timing', index),
+                           lambda: self._BuildStandardTiming(index))
+
+  def _BuildStandardTiming(self, index):
+    """Decodes a single standard timing of the base EDID.
+
+    Args:
+      index: The standard timing index (0-7) within the EDID.
+
+    Returns:
+      A standard_timings.StandardTiming object, or None if unused.
+    """
+    edid_layout = self.layout
+    region = edid_layout.Find(layout.REGION_STANDARD_TIMING,
+                              edid_layout.base_block)[index]
+    return standard_timings.GetStandardTiming(self._edid, region.start,
+                                              self.edid_version)
+
   def GetDescriptor(self, index):
     """Fetches a single Descriptor's information in this EDID.
 
@@ -205,14 +339,36 @@ class Edid(object):
     Raises:
       IndexError: If index is not in the range 0-3.
     """
-    base = 54  # Descriptor blocks begin at byte 54 in base EDID
-    return descriptor.GetDescriptor(self._edid, (base + (index * 18)),
+    return self._GetCached(('descriptor', index),
+                           lambda: self._BuildDescriptor(index))
+
+  def _BuildDescriptor(self, index):
+    """Decodes a single descriptor of the base EDID.
+
+    Args:
+      index: The descriptor index (0-3) within the EDID.
+
+    Returns:
+      A single descriptor.Descriptor object.
+    """
+    edid_layout = self.layout
+    region = edid_layout.Find(layout.REGION_DESCRIPTOR,
+                              edid_layout.base_block)[index]
+    return descriptor.GetDescriptor(self._edid, region.start,
                                     self.edid_version)
 
   @property
   def descriptors(self):
     """Fetches all descriptors in a base EDID.
 
+    Returns:
+      A list of descriptor.Descriptor objects.
+    """
+    return list(self._GetCached('descriptors', self._BuildDescriptors))
+
+  def _BuildDescriptors(self):
+    """Collects the four descriptors of the base EDID.
+
     Returns:
       A list of descriptor.Descriptor objects.
     """
@@ -232,7 +388,9 @@ class Edid(object):
     Returns:
       A single extensions.Extension object.
     """
-    return extensions.GetExtension(self._edid, index, self.edid_version)
+    return self._GetCached(
+        ('extension', index),
+        lambda: extensions.GetExtension(self._edid, index, self.edid_version))
 
   def GetErrors(self):
     """Checks an EDID for errors by calling error_check module.
@@ -240,7 +398,69 @@ class Edid(object):
     Returns:
       A list of error.Error objects.
     """
-    return error_check.GetErrors(self.GetData(), self.edid_version)
+    return list(self._GetCached('errors', self._CheckErrors))
+
+  def FirstError(self):
+    """Finds the first error that GetErrors would report, and stops there.
+
+    Returns:
+      An error.Error object, or None if the EDID has no errors.
+    """
+    if 'errors' in self._cache:
+      errors = self._cache['errors']
+      return errors[0] if errors else None
+    if self._SectionsDecoded():
+      errors = error_check.CheckEdid(self, first_only=True)
+      return errors[0] if errors else None
+    return error_check.FirstError(self._edid, self.edid_version)
+
+  def GetRangeLimitErrors(self):
+    """Checks the modes of the EDID against its Display Range Limits.
+
+    These checks are not part of GetErrors, FirstError or IsValid; see
+    error_check.GetRangeLimitErrors.
+
+    Returns:
+      A list of error.Error objects.
+    """
+    return error_check.GetRangeLimitErrors(self._edid, self.edid_version,
+                                           self.layout)
+
+  def IsValid(self):
+    """Checks whether this EDID has no errors, without describing any.
+
+    Returns:
+      True if the EDID has no errors.
+    """
+    return self.FirstError() is None
+
+  def _SectionsDecoded(self):
+    """Checks whether the sections of the base EDID are already decoded.
+
+    Returns:
+      True if the descriptors of the base EDID are cached on this Edid.
+    """
+    return ('descriptor', 0) in self._cache
+
+  def _CheckErrors(self):
+    """Runs the error checks, or fetches their result from the parse cache.
+
+    If the sections of the EDID are already decoded, the checks run on the
+    sections cached on this Edid; otherwise they run on the bytes alone, which
+    is faster than decoding and caching every section first.
+
+    Returns:
+      A list of error.Error objects.
+    """
+    def check():
+      if self._SectionsDecoded():
+        return error_check.CheckEdid(self)
+      return error_check.GetErrors(self._edid, self.edid_version,
+                                   edid_layout=self.layout)
+
+    if self._parse_cache:
+      return self._parse_cache.GetErrors(self._edid, check)
+    return check()
 
   def ConvertToBinary(self, filename):
     """Converts an EDID object into a binary blob.
@@ -249,5 +469,4 @@ class Edid(object):
       filename: The string filename of the text file.
     """
     with open(filename, 'wb') as myfile:
-      blob = array.array('B', self._edid).tostring()
-      myfile.write(blob)
+      myfile.write(self._edid)
@@ -0,0 +1,152 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for edid.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import edid
+import error
+import error_check
+import unittest_util
+import visitor
+
+
+_EDIDPARSER = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           os.pardir, 'edidparser')
+
+
+class ShortEdidTest(unittest.TestCase):
+  """Tests the properties that a truncated base block still holds."""
+
+  def setUp(self):
+    self.edid = unittest_util.ReadTestEdid()
+
+  def testVersionAndExtensionCount(self):
+    e = edid.Edid(self.edid[:127])
+    self.assertEqual(e.edid_version, '1.4')
+    self.assertEqual(e.extension_count, 2)
+
+  def testVersionOnly(self):
+    e = edid.Edid(self.edid[:0x14])
+    self.assertEqual(e.edid_version, '1.4')
+    self.assertRaises(IndexError, lambda: e.extension_count)
+
+  def testBaseSections(self):
+    full = edid.Edid(self.edid)
+    e = edid.Edid(self.edid[:100])
+    self.assertEqual(e.manufacturer_id, full.manufacturer_id)
+    self.assertEqual(e.product_code, full.product_code)
+    self.assertEqual(e.basic_display.display_gamma,
+                     full.basic_display.display_gamma)
+    self.assertEqual(e.chromaticity.wht_y, full.chromaticity.wht_y)
+    self.assertEqual(list(e.established_timings.supported_timings),
+                     list(full.established_timings.supported_timings))
+    self.assertEqual([st.GetBlock() for st in e.standard_timings],
+                     [st.GetBlock() for st in full.standard_timings])
+    self.assertRaises(IndexError, lambda: e.base_block.checksum)
+
+  def testFieldsPastTheEnd(self):
+    e = edid.Edid(self.edid[:0x19])
+    self.assertEqual(e.basic_display.vsync_pulse,
+                     edid.Edid(self.edid).basic_display.vsync_pulse)
+    self.assertRaises(IndexError, lambda: e.chromaticity.red_x)
+
+  def testParse(self):
+    directory = tempfile.mkdtemp()
+    try:
+      filename = os.path.join(directory, 'short_edid')
+      with open(filename, 'wb') as f:
+        f.write(self.edid[:100])
+      output = subprocess.check_output(
+          [sys.executable, _EDIDPARSER, 'parse', '-t', 'vendor,bd,dcc,et,st',
+           filename], stderr=subprocess.STDOUT)
+    finally:
+      shutil.rmtree(directory)
+
+    for section in ['[Manufacturing/vendor info]',
+                    '[Basic Display Information]',
+                    '[Chromaticity information]',
+                    '[Established timing bitmap]',
+                    '[Standard timing information]']:
+      self.assertIn(section, output)
+    self.assertIn('1920 x 1080', output)
+
+
+def _Describe(errors):
+  """Lists what tells errors apart, so that two lists can be compared.
+
+  Args:
+    errors: A list of error.Error objects.
+
+  Returns:
+    A list of tuples of the code, location and message of each error.
+  """
+  return [(err.code, err.location, err.message) for err in errors]
+
+
+class ErrorCheckTest(unittest.TestCase):
+  """Tests the checks on bytes against the walk of a decoded Edid."""
+
+  def setUp(self):
+    self.edid = unittest_util.ReadTestEdid()
+
+  def testSameErrors(self):
+    # Mostly with the checksums fixed, to reach the sections
+    blobs = unittest_util.MutatedEdids(200, 12, max_changes=4, fixed=0.8)
+    for blob in [self.edid] + blobs:
+      try:
+        expected = _Describe(error_check.GetErrors(blob))
+      except Exception:  # pylint: disable=broad-except
+        continue  # A section that does not decode
+      e = edid.Edid(blob)
+      e.descriptors  # pylint: disable=pointless-statement
+      self.assertEqual(_Describe(error_check.CheckEdid(e)), expected)
+      self.assertEqual(_Describe(e.GetErrors()), expected)
+      self.assertEqual(_Describe(edid.Edid(blob).GetErrors()), expected)
+
+      first = error_check.FirstError(blob)
+      self.assertEqual(_Describe([first] if first else []), expected[:1])
+      self.assertEqual(error_check.IsValid(blob), not expected)
+      self.assertEqual(edid.Edid(blob).IsValid(), not expected)
+
+  def testIsValidShortCircuits(self):
+    """IsValid must neither walk a decoded Edid nor build any error."""
+    def Fail(*unused_args, **unused_kwargs):
+      self.fail('IsValid left its fast path')
+
+    bad_week = bytearray(self.edid)
+    bad_week[0x10] = 60
+    bad_week[127] = (bad_week[127] - 60 + self.edid[0x10]) & 0xFF
+
+    saved = (visitor.Walk, edid.Edid.__init__)
+    visitor.Walk = Fail
+    edid.Edid.__init__ = Fail
+    try:
+      self.assertTrue(error_check.IsValid(self.edid))
+      self.assertFalse(error_check.IsValid(bad_week))
+
+      new_error = error.NewError
+      error.NewError = Fail
+      try:
+        self.assertTrue(error_check.IsValid(self.edid))
+      finally:
+        error.NewError = new_error
+    finally:
+      visitor.Walk, edid.Edid.__init__ = saved
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -3,14 +3,186 @@
 # found in the LICENSE file.
 
 
-"""Provides the Error class with methods for describing and reporting errors."""
+"""Provides the Error class with methods for describing and reporting errors.
+
+Errors found by the checks carry a stable numeric code, the index of the
+128-byte block and the byte offset they refer to, and the raw values that
+were checked. Their location, message, expected and found strings are only
+formatted when first asked for, so that errors can be counted and grouped by
+code without building any text.
+"""
+
+
+# Error codes. These are stable: new codes are added, never renumbered.
+ERROR_UNKNOWN = 0  # An Error created from strings only
+
+# Whole EDID and base block
+ERROR_HEADER = 1
+ERROR_CHECKSUM = 2
+ERROR_LENGTH = 3
+ERROR_WEEK = 4
+ERROR_EXTENSION_COUNT = 5
+
+# Descriptors
+ERROR_STRING_DESCRIPTOR_BYTE_5 = 100
+ERROR_RANGE_VERTICAL_RATES = 101
+ERROR_RANGE_HORIZONTAL_RATES = 102
+ERROR_RANGE_PIXEL_CLOCK = 103
+ERROR_RANGE_SUPPORT_FLAGS = 104
+ERROR_COLOR_POINT = 105
+ERROR_DUMMY_HEADER = 106
+ERROR_DUMMY_BODY = 107
+
+# Timings
+ERROR_ST_X_RESOLUTION = 200
+ERROR_CVT_PREFERRED_RATE = 201
+ERROR_CVT_RESERVED_BITS_1_0 = 202
+ERROR_CVT_RESERVED_BIT_7 = 203
+
+# Extensions
+ERROR_CEA_PADDING = 300
+ERROR_VTB_PADDING = 301
+ERROR_VTB_COUNTS = 302
+
+# Modes outside the Display Range Limits of the base EDID
+ERROR_MODE_VERTICAL_RATE = 400
+ERROR_MODE_HORIZONTAL_RATE = 401
+ERROR_MODE_PIXEL_CLOCK = 402
+
+
+def _Numbered(name, index):
+  """Formats the location of the nth element of some kind.
+
+  Args:
+    name: A string naming the kind of element.
+    index: The integer index of the element, or None.
+
+  Returns:
+    A string such as 'Display Product Name #2'.
+  """
+  return '%s %s' % (name, '#%d' % index if index else '')
+
+
+def _Extension(name, index):
+  """Formats the location of an extension.
+
+  Args:
+    name: A string naming the kind of extension.
+    index: The integer index of the extension, or None.
+
+  Returns:
+    A string such as 'CEA extension (Extension #1)'.
+  """
+  return '%s %s' % (name, '(Extension #%d)' % index if index else '')
+
+
+def _Mode(kind, number, block):
+  """Formats the location of a mode.
+
+  Args:
+    kind: A string naming the kind of structure that lists the mode.
+    number: The integer number of the structure (its index, or its VIC).
+    block: The index of the 128-byte block the structure is in.
+
+  Returns:
+    A string such as 'Detailed Timing Descriptor #1 (Extension #1)'.
+  """
+  location = '%s #%d' % (kind, number)
+  return location + ' (Extension #%d)' % block if block else location
+
+
+# For each code, a callable that takes the raw values of an error and returns
+# its location, message, expected and found descriptions.
+_DESCRIPTIONS = {
+    ERROR_HEADER: lambda header: (
+        'Bytes 0-7', 'Incorrect EDID header', '00FF FFFF FFFF FF00',
+        ''.join('%02X%s' % (b, ' ' if x % 2 else '')
+                for x, b in enumerate(header))),
+    ERROR_CHECKSUM: lambda block, remainder: (
+        'Block %d' % block, 'Checksum error', 'Sum % 256 = 0',
+        'Sum %% 256 = %d' % remainder),
+    ERROR_LENGTH: lambda remainder: (
+        'Overall EDID', 'Invalid length', 'Length % 128 = 0',
+        'Length %% 128 = %d' % remainder),
+    ERROR_WEEK: lambda week: (
+        'Manufacturer/Vendor section- byte 0x10', 'Invalid week value',
+        'Week in range 1-54', 'Week %d' % week),
+    ERROR_EXTENSION_COUNT: lambda expected, found: (
+        'Extensions', 'Extension count does not match EDID length',
+        '%d extensions' % expected, '%d extensions' % found),
+
+    ERROR_STRING_DESCRIPTOR_BYTE_5: lambda my_type, index, found: (
+        _Numbered(my_type, index), 'Byte 5', 0x00, found),
+    ERROR_RANGE_VERTICAL_RATES: lambda my_type, index, max_rate, min_rate: (
+        _Numbered(my_type, index), 'Maximum vertical rate less than minimum',
+        'Max vert: %d\tMin vert: %d' % (max_rate, min_rate), None),
+    ERROR_RANGE_HORIZONTAL_RATES: lambda my_type, index, max_rate, min_rate: (
+        _Numbered(my_type, index), 'Maximum horizontal rate less than '
+        'minimum', '', 'Max hor: %d\tMin hor: %d' % (max_rate, min_rate)),
+    ERROR_RANGE_PIXEL_CLOCK: lambda my_type, index, found: (
+        _Numbered(my_type, index), 'Pixel clock value invalid', 'Non-zero',
+        found),
+    ERROR_RANGE_SUPPORT_FLAGS: lambda my_type, index, found: (
+        _Numbered(my_type, index) + '- byte 10', 'Invalid value for Video '
+        'Timing Support Flags', '0x00 0x01 0x02 0x04', '0x%02X' % found),
+    ERROR_COLOR_POINT: lambda: (
+        'ColorPointDescriptor', 'First color point is invalid', 'Non-0 value',
+        0x00),
+    ERROR_DUMMY_HEADER: lambda my_type, index, found: (
+        _Numbered(my_type, index), 'Bytes 0-4', '0x00 0x00 0x00 0x10 0x00',
+        '0x%02X ' * 5 % tuple(found)),
+    ERROR_DUMMY_BODY: lambda my_type, index, found: (
+        _Numbered(my_type, index), 'Bytes 5-18', 'All 0x00',
+        '0x%02X ' * 13 % tuple(found)),
+
+    ERROR_ST_X_RESOLUTION: lambda index: (
+        'Standard Timing object %s' % ('#%d' % index if index else ''),
+        'X resolution unset/invalid', '256-2288 pixels',
+        'Value of 0 (converts to 248)'),
+    ERROR_CVT_PREFERRED_RATE: lambda index, preferred, supported: (
+        _Numbered('Coordinated video timing block', index),
+        'Preferred refresh rate not supported', '%s supported' % preferred,
+        'Supported: %s' % supported),
+    ERROR_CVT_RESERVED_BITS_1_0: lambda index, found: (
+        _Numbered('Coordinated video timing block', index),
+        'Bits 1-0 of byte 2 incorrectly set', 0x00, found),
+    ERROR_CVT_RESERVED_BIT_7: lambda index, found: (
+        _Numbered('Coordinated video timing block', index),
+        'Bit 7 of byte 3 incorrectly set', 0x00, found),
+
+    ERROR_CEA_PADDING: lambda index, padding: (
+        _Extension('CEA extension', index), 'All bytes after DTDs should be '
+        '0x00', 'All 0x00s', '%02X ' * len(padding) % tuple(padding)),
+    ERROR_VTB_PADDING: lambda index, padding: (
+        _Extension('VTB Extension', index), 'All bytes after STs should be '
+        '0x00', 'All 0x00s', '0x%02X ' * len(padding) % tuple(padding)),
+    ERROR_VTB_COUNTS: lambda index, dtbs, cvts, sts: (
+        _Extension('VTB Extension', index) + '- bytes 2-4', 'DTB, CVT and ST '
+        'counts do not fit in the block', 'At most 122 bytes of timings',
+        '%d DTBs, %d CVTs, %d STs (%d bytes)' % (
+            dtbs, cvts, sts, 18 * dtbs + 3 * cvts + 2 * sts)),
+
+    ERROR_MODE_VERTICAL_RATE: lambda kind, number, block, rate, low, high: (
+        _Mode(kind, number, block), 'Vertical rate outside display range '
+        'limits', 'Range %d-%d Hz' % (low, high), '%.2f Hz' % rate),
+    ERROR_MODE_HORIZONTAL_RATE: lambda kind, number, block, rate, low, high: (
+        _Mode(kind, number, block), 'Horizontal rate outside display range '
+        'limits', 'Range %d-%d kHz' % (low, high), '%.2f kHz' % rate),
+    ERROR_MODE_PIXEL_CLOCK: lambda kind, number, block, clock, high: (
+        _Mode(kind, number, block), 'Pixel clock above display range limit',
+        'At most %g MHz' % high, '%.2f MHz' % clock),
+}
 
 
 class Error(object):
   """Defines an Error object, with location, message, etc."""
 
+  __slots__ = ('_code', '_block', '_offset', '_values', '_text')
+
   def __init__(self, location, msg, expected=None, found=None):
-    """Creates an Error object.
+    """Creates an Error object from its descriptions.
+
+    Errors found by the checks are created with NewError instead.
 
     Args:
       location: A string describing the location of the Error.
@@ -18,10 +190,59 @@ class Error(object):
       expected: A string describing the expected value.
       found: A string describing the value found instead.
     """
-    self._location = location
-    self._message = msg
-    self._expected = expected
-    self._found = found
+    self._code = ERROR_UNKNOWN
+    self._block = None
+    self._offset = None
+    self._values = None
+    self._text = (location, msg, expected, found)
+
+  @property
+  def code(self):
+    """Fetches the code of the error.
+
+    Returns:
+      An integer, one of the ERROR_* codes.
+    """
+    return self._code
+
+  @property
+  def block(self):
+    """Fetches the index of the 128-byte block the error is in.
+
+    Returns:
+      An integer (0 for the base EDID), or None if unknown.
+    """
+    return self._block
+
+  @property
+  def offset(self):
+    """Fetches the offset of the byte the error refers to.
+
+    Returns:
+      An integer indicating the index of the byte within the EDID, or None if
+      unknown.
+    """
+    return self._offset
+
+  @property
+  def values(self):
+    """Fetches the raw values that were checked.
+
+    Returns:
+      A tuple whose contents depend on the code, or None for ERROR_UNKNOWN.
+    """
+    return self._values
+
+  def _GetText(self):
+    """Fetches the descriptions of the error, formatting them on first use.
+
+    Returns:
+      A tuple of the location, message, expected and found descriptions.
+    """
+    text = self._text
+    if text is None:
+      text = self._text = _DESCRIPTIONS[self._code](*self._values)
+    return text
 
   @property
   def location(self):
@@ -30,7 +251,7 @@ class Error(object):
     Returns:
       A string describing the location of the error.
     """
-    return self._location
+    return self._GetText()[0]
 
   @property
   def message(self):
@@ -39,7 +260,7 @@ class Error(object):
     Returns:
       A string describing the message of the error.
     """
-    return self._message
+    return self._GetText()[1]
 
   @property
   def expected(self):
@@ -48,7 +269,7 @@ class Error(object):
     Returns:
       A string describing the expected value.
     """
-    return self._expected
+    return self._GetText()[2]
 
   @property
   def found(self):
@@ -57,6 +278,122 @@ class Error(object):
     Returns:
       A string describing the value found in the EDID.
     """
-    return self._found
+    return self._GetText()[3]
+
+  def Place(self, start, block=None):
+    """Fetches a copy of the error, moved to where its structure is.
+
+    Checks within a descriptor or timing only know offsets relative to it;
+    the caller that knows where it lies in the EDID places its errors.
+
+    Args:
+      start: The index at which the structure that found the error starts.
+      block: The index of the 128-byte block the structure is in, if known.
+
+    Returns:
+      An Error object.
+    """
+    placed = _NewError(self._code, self._values, self._text)
+    placed._block = self._block if block is None else block
+    placed._offset = None if self._offset is None else self._offset + start
+    return placed
+
+
+def _NewError(code, values, text):
+  """Creates an Error object without going through Error.__init__.
+
+  Args:
+    code: An integer, one of the ERROR_* codes.
+    values: A tuple of the raw values that were checked.
+    text: The tuple of descriptions, or None to format them on first use.
+
+  Returns:
+    An Error object, with no block or offset.
+  """
+  err = Error.__new__(Error)
+  err._code = code
+  err._block = None
+  err._offset = None
+  err._values = values
+  err._text = text
+  return err
+
+
+def NewError(code, values=(), block=None, offset=None):
+  """Creates an Error object for a failed check, without formatting any text.
+
+  Args:
+    code: An integer, one of the ERROR_* codes other than ERROR_UNKNOWN.
+    values: A tuple of the raw values that were checked, as expected by the
+        description of the code.
+    block: The index of the 128-byte block the error is in, if known.
+    offset: The offset of the byte the error refers to, if known. Relative to
+        the structure that found the error until placed with Error.Place.
+
+  Returns:
+    An Error object.
+  """
+  err = _NewError(code, values, None)
+  err._block = block
+  err._offset = offset
+  return err
+
+
+def _ValuesFromJson(value):
+  """Converts values decoded from JSON back into the form the checks made.
+
+  JSON has no tuples, so the tuples of the raw values come back as lists.
+
+  Args:
+    value: A value decoded from JSON.
+
+  Returns:
+    The value, with every list turned back into a tuple.
+  """
+  if isinstance(value, list):
+    return tuple(_ValuesFromJson(v) for v in value)
+  return value
+
+
+def ErrorsToJson(errors):
+  """Converts Error objects into dictionary form.
+
+  Args:
+    errors: A list of Error objects.
+
+  Returns:
+    A list of dictionaries with location, message, expected, found, code,
+    block, offset and values keys.
+  """
+  return [{
+      'location': e.location,
+      'message': e.message,
+      'expected': e.expected,
+      'found': e.found,
+      'code': e.code,
+      'block': e.block,
+      'offset': e.offset,
+      'values': e.values
+  } for e in errors]
+
+
+def ErrorsFromJson(dicts):
+  """Converts the dictionary form produced by ErrorsToJson back into Errors.
 
+  Args:
+    dicts: A list of dictionaries with location, message, expected and found
+        keys, and optionally code, block, offset and values keys.
 
+  Returns:
+    A list of Error objects.
+  """
+  errors = []
+  for d in dicts:
+    values = d.get('values')
+    err = _NewError(d.get('code', ERROR_UNKNOWN),
+                    None if values is None else _ValuesFromJson(values),
+                    (d['location'], d['message'], d['expected'], d['found']))
+    err._block = d.get('block')
+    err._offset = d.get('offset')
+    errors.append(err)
+  return errors
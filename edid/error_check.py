@@ -6,19 +6,39 @@
 
 If errors are found, returns error.Error objects that store information about
 each error's location, message, expected data, and what data is found.
+
+A separate family of checks, GetRangeLimitErrors, compares the modes the EDID
+lists with its own Display Range Limits. Many displays list modes outside
+their limits on purpose (such as 24 Hz film modes), so these checks only run
+when asked for, and not as part of GetErrors by default. They read the timing
+numbers straight from the bytes of the EDID, without building an object per
+mode.
 """
 
 import descriptor
 import error
 import extensions
+import layout
 import standard_timings
+import video_block
+import visitor
+
+
+_MAGIC_HEADER = bytearray([0x00, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0x00])
+
+# The kinds of structure named by the errors of modes outside the range limits
+_MODE_DTD = 'Detailed Timing Descriptor'
+_MODE_VIC = 'VIC'
+_MODE_ST = 'Standard Timing'
+
+_VIDEO_DATA_BLOCK_TAG = 0x02
 
 
 def _LengthError(e):
   """Checks if the length of the EDID is a multiple of 128.
 
   Args:
-    e: The list form of the EDID to be checked.
+    e: The bytes of the EDID to be checked.
 
   Returns:
     A list of error.Error objects, or None.
@@ -26,8 +46,7 @@ def _LengthError(e):
   if not len(e) % 128:
     return None
   else:
-    return [error.Error('Overall EDID', 'Invalid length', 'Length % 128 = 0',
-                        'Length %% 128 = %d' % (len(e) % 128))]
+    return [error.NewError(error.ERROR_LENGTH, (len(e) % 128,))]
 
 
 def _HeaderError(e):
@@ -36,31 +55,17 @@ def _HeaderError(e):
   Header should be 0x00 0xFF 0xFF 0xFF 0xFF 0xFF 0xFF 0x00.
 
   Args:
-    e: The list form of the EDID to be checked.
+    e: The bytes of the EDID to be checked.
 
   Returns:
     A list of error.Error objects, or None.
   """
-  magic_header = [
-      0x00,
-      0xFF,
-      0xFF,
-      0xFF,
-      0xFF,
-      0xFF,
-      0xFF,
-      0x00
-  ]
-
-  header = '%02X%02X ' * 4 % tuple(e[0:8])
-
-  if e[0:8] == magic_header:
+  header = bytearray(e[0:8])
+
+  if header == _MAGIC_HEADER:
     return None
   else:
-    return [error.Error('Bytes 0-7', 'Incorrect EDID header',
-                        '00FF FFFF FFFF FF00', header)]
-
-  return None
+    return [error.NewError(error.ERROR_HEADER, (tuple(header),), 0, 0)]
 
 
 def _ChecksumError(e):
@@ -69,7 +74,7 @@ def _ChecksumError(e):
   Checksum for each 128-byte block should be divisible by 256.
 
   Args:
-    e: The list form of the EDID to be checked.
+    e: The bytes of the EDID to be checked.
 
   Returns:
     None, if no error, or a list of error.Error objects.
@@ -81,134 +86,383 @@ def _ChecksumError(e):
     my_sum = sum(e[x : x + 128])
     if my_sum % 256:
       block_id = x / 128
-      my_err = error.Error('Block %d' % block_id, 'Checksum error',
-                           'Sum % 256 = 0', 'Sum %% 256 = %d' % (my_sum % 256))
+      my_err = error.NewError(error.ERROR_CHECKSUM, (block_id, my_sum % 256),
+                              block_id, x + 127)
       cs_errors.append(my_err)
 
   return cs_errors
 
 
-def _DescriptorErrors(edid, version):
-  """Checks the descriptor blocks for errors.
+def _ExtensionCountError(edid):
+  """Checks if the extension count matches the length of the EDID.
 
   Args:
-    edid: The list form of the EDID to be checked.
-    version: The string indicating the version of the EDID.
+    edid: The bytes of the EDID being checked.
 
   Returns:
-    A list of error.Error objects.
+    A list of error.Error objects, or None.
   """
-  base = 54  # Descriptor blocks start at byte 54 in base EDID
+  num_ext = edid[0x7E]
 
-  errors = []
+  if (num_ext + 1) != (len(edid) / 128):
+    return [error.NewError(error.ERROR_EXTENSION_COUNT,
+                           (num_ext, (len(edid) / 128) - 1), 0, 0x7E)]
 
-  for x in xrange(0, 4):
 
-    desc = descriptor.GetDescriptor(edid, base + (x * 18), version)
+def _WeekError(edid):
+  """Checks if the manufacturer week is in the proper range of 1-54.
 
-    desc_errors = desc.CheckErrors(x + 1)
+  Args:
+    edid: The bytes of the EDID being checked.
 
-    if desc_errors:
-      errors.extend(desc_errors)
+  Returns:
+    An error.Error object, if there's an error.
+  """
+  if edid[0x10] > 54 and edid[0x10] != 255:
+    return [error.NewError(error.ERROR_WEEK, (edid[0x10],), 0, 0x10)]
 
-  return errors
 
+def _GetRangeLimits(edid, version, edid_layout):
+  """Fetches the Display Range Limits of the base EDID.
 
-def _BaseStErrors(edid, version):
-  """Checks the standard timing section for errors.
+  Args:
+    edid: The bytes of the EDID being checked.
+    version: The string representing the version of the EDID.
+    edid_layout: The layout.Layout of the EDID.
+
+  Returns:
+    A tuple of the minimum and maximum vertical rates (Hz), the minimum and
+    maximum horizontal rates (kHz) and the maximum pixel clock (MHz) of the
+    first Display Range Limits descriptor, or None if there is none or it has
+    errors of its own.
+  """
+  for region in edid_layout.Find(layout.REGION_DESCRIPTOR,
+                                 edid_layout.base_block):
+    start = region.start
+    if edid[start] or edid[start + 1] or edid[start + 2]:
+      continue  # Detailed timing descriptor
+    desc = descriptor.GetDescriptor(edid, start, version)
+    if isinstance(desc, descriptor.DisplayRangeDescriptor):
+      if desc.HasErrors():
+        return None
+      return (desc.min_vertical_rate, desc.max_vertical_rate,
+              desc.min_horizontal_rate, desc.max_horizontal_rate,
+              desc.pixel_clock)
+  return None
+
+
+def GetRangeLimitErrors(edid, version, edid_layout=None):
+  """Checks the modes of the EDID against its Display Range Limits.
+
+  The vertical rate, horizontal rate and pixel clock of detailed timings and
+  VICs, and the vertical rate of standard timings, must lie within the limits.
+  Rates are rounded to whole Hz and kHz, as the limits are.
 
   Args:
-    edid: The list form of the EDID to be checked.
-    version: A string indicating the EDID's version.
+    edid: The bytes of the EDID being checked.
+    version: The string representing the version of the EDID.
+    edid_layout: The layout.Layout of the EDID, if already computed.
 
   Returns:
     A list of error.Error objects.
   """
-  base = 38
-
+  if edid_layout is None:
+    edid_layout = layout.GetLayout(
+        edid, lambda x: extensions.GetExtension(edid, x, version))
+
+  limits = _GetRangeLimits(edid, version, edid_layout)
+  if limits is None:
+    return []
+  min_v, max_v, min_h, max_h, max_clock = limits
   errors = []
 
-  for x in xrange(0, 8):
-    st = standard_timings.GetStandardTiming(edid, base + (x * 2), version)
-    if st:
-      err = st.CheckErrors(x + 1)
-      if err:
-        errors.extend(err)
+  def Check(kind, number, block, offset, refresh, line_rate, clock):
+    values = (kind, number, block)
+    if not min_v <= round(refresh) <= max_v:
+      errors.append(error.NewError(error.ERROR_MODE_VERTICAL_RATE,
+                                   values + (refresh, min_v, max_v), block,
+                                   offset))
+    if line_rate is not None and not min_h <= round(line_rate) <= max_h:
+      errors.append(error.NewError(error.ERROR_MODE_HORIZONTAL_RATE,
+                                   values + (line_rate, min_h, max_h), block,
+                                   offset))
+    if clock is not None and clock > max_clock:
+      errors.append(error.NewError(error.ERROR_MODE_PIXEL_CLOCK,
+                                   values + (clock, max_clock), block, offset))
+
+  def CheckDtd(number, block, start):
+    if not (edid[start] or edid[start + 1] or edid[start + 2]):
+      return  # Display descriptor
+    clock = (edid[start + 1] << 8) + edid[start]  # In units of 10 kHz
+    h_total = (((edid[start + 4] & 0xF0) << 4) + edid[start + 2] +
+               ((edid[start + 4] & 0x0F) << 8) + edid[start + 3])
+    v_total = (((edid[start + 7] & 0xF0) << 4) + edid[start + 5] +
+               ((edid[start + 7] & 0x0F) << 8) + edid[start + 6])
+    if clock and h_total and v_total:
+      Check(_MODE_DTD, number, block, start,
+            clock * 10000.0 / (h_total * v_total), clock * 10.0 / h_total,
+            clock / 100.0)
+
+  base = edid_layout.base_block
+  for x, region in enumerate(edid_layout.Find(layout.REGION_DESCRIPTOR, base)):
+    CheckDtd(x + 1, 0, region.start)
+
+  for x, region in enumerate(edid_layout.Find(layout.REGION_STANDARD_TIMING,
+                                              base)):
+    st = standard_timings.GetStandardTiming(edid, region.start, version)
+    if st and not st.HasErrors():
+      Check(_MODE_ST, x + 1, 0, region.start, st.vertical_freq, None, None)
+
+  for ext_region in edid_layout.Find(layout.REGION_EXTENSION):
+    block = ext_region.start / 128
+
+    for x, region in enumerate(edid_layout.Find(layout.REGION_DTD,
+                                                ext_region)):
+      CheckDtd(x + 1, block, region.start)
+
+    for x, region in enumerate(edid_layout.Find(layout.REGION_STANDARD_TIMING,
+                                                ext_region)):
+      st = standard_timings.GetStandardTiming(edid, region.start, version)
+      if st and not st.HasErrors():
+        Check(_MODE_ST, x + 1, block, region.start, st.vertical_freq, None,
+              None)
+
+    for region in edid_layout.Find(layout.REGION_DATA_BLOCK, ext_region):
+      if edid[region.start] >> 5 != _VIDEO_DATA_BLOCK_TAG:
+        continue
+      for offset in xrange(region.start + 1, region.end):
+        svd = edid[offset]
+        # As data_block.ShortVideoDescriptor.vic
+        vic = svd & 0x7F if 1 <= svd <= 64 or 129 <= svd <= 192 else svd
+        fmt = video_block.GetVideoFormat(vic)
+        if fmt:
+          clock = fmt.pixel_clock  # In kHz
+          Check(_MODE_VIC, vic, block, offset, fmt.refresh,
+                clock / float(fmt.h_active_pixels + fmt.h_blanking_pixels),
+                clock / 1000.0)
 
   return errors
 
 
-def _ExtensionErrors(edid, version):
-  """Checks all extensions for errors.
+def _GetVersion(edid):
+  """Reads the version of an EDID from its bytes.
 
   Args:
-    edid: The EDID being checked.
-    version: A string indicating the EDID's version.
+    edid: The bytes of the EDID.
 
   Returns:
-    A list of error.Error objects.
+    A string indicating the EDID's version.
   """
-  num_ext = edid[0x7E]
+  return '%d.%d' % (edid[0x12], edid[0x13])
 
-  errors = []
 
-  if (num_ext + 1) != (len(edid) / 128):
-    errors.append(error.Error('Extensions', 'Extension count does not match '
-                              'EDID length', '%d extensions' % num_ext,
-                              '%d extensions' % ((len(edid) / 128) - 1)))
+def _IterErrors(edid, version, check_ranges, edid_layout, sections=None):
+  """Finds the errors of an EDID, one at a time, in the order GetErrors lists.
 
-  for x in xrange(1, num_ext + 1):
-    ext = extensions.GetExtension(edid, x, version)
+  This is the only place the order of the checks is written: header,
+  checksums, length, week, base descriptors, base standard timings, extension
+  count, extensions and, if asked for, modes outside the range limits. The
+  structural checks come first, so a consumer that stops at the first error
+  decodes no section of an EDID that fails them. Sections are tested with
+  their HasErrors methods before any of their errors are built.
 
-    err = ext.CheckErrors(x)
-    if err:
-      errors.extend(err)
+  Args:
+    edid: The bytes of the EDID being checked.
+    version: The string representing the version of the EDID, or None to read
+        it from the EDID.
+    check_ranges: Whether to also report the errors of GetRangeLimitErrors.
+    edid_layout: The layout.Layout of the EDID, or None to compute it when
+        needed.
+    sections: An optional edid.Edid of the same bytes, whose cached sections
+        are checked rather than decoding sections of its own.
+
+  Yields:
+    error.Error objects.
+  """
+  for check in (_HeaderError, _ChecksumError, _LengthError, _WeekError):
+    errors = check(edid)
+    if errors:
+      for err in errors:
+        yield err
+
+  if version is None:
+    version = _GetVersion(edid)
+  if edid_layout is None:
+    if sections is not None:
+      edid_layout = sections.layout
+    else:
+      edid_layout = layout.GetLayout(
+          edid, lambda x: extensions.GetExtension(edid, x, version))
+  base = edid_layout.base_block
+
+  regions = edid_layout.Find(layout.REGION_DESCRIPTOR, base)
+  for x, region in enumerate(regions):
+    if sections is not None:
+      desc = sections.GetDescriptor(x)
+    else:
+      desc = descriptor.GetDescriptor(edid, region.start, version)
+    if desc.HasErrors():
+      for err in desc.CheckErrors(x + 1):
+        yield err.Place(region.start, 0)
+
+  regions = edid_layout.Find(layout.REGION_STANDARD_TIMING, base)
+  for x, region in enumerate(regions):
+    if sections is not None:
+      st = sections.GetStandardTiming(x)
+    else:
+      st = standard_timings.GetStandardTiming(edid, region.start, version)
+    if st and st.HasErrors():
+      for err in st.CheckErrors(x + 1):
+        yield err.Place(region.start, 0)
+
+  for err in _ExtensionCountError(edid) or []:
+    yield err
+
+  for region in edid_layout.Find(layout.REGION_EXTENSION):
+    x = region.start / 128
+    if sections is not None:
+      ext = sections.GetExtension(x)
+    else:
+      ext = extensions.GetExtension(edid, x, version)
+    if ext.HasErrors():
+      for err in ext.GetErrors(x):
+        yield err
+
+  if check_ranges:
+    for err in GetRangeLimitErrors(edid, version, edid_layout):
+      yield err
+
+
+def CheckEdid(e, check_ranges=False, first_only=False):
+  """Checks an edid.Edid for errors, on the sections cached on it.
+
+  This is the cheaper way to check an EDID whose sections have already been
+  decoded (e.g., after printing it), or will be afterwards: sections are
+  taken from the Edid, and those decoded by the checks stay cached on it. To
+  check bytes alone, GetErrors, FirstError and IsValid are faster, as they
+  build no Edid and cache nothing on one.
 
-  return errors
+  Args:
+    e: The edid.Edid object.
+    check_ranges: Whether to also report the errors of GetRangeLimitErrors.
+    first_only: Whether to stop at the first error.
 
+  Returns:
+    A list of error.Error objects; at most one if first_only is set.
+  """
+  errors = _IterErrors(e.data, e.edid_version, check_ranges, None, e)
+  if first_only:
+    err = next(errors, None)
+    return [err] if err else []
+  return list(errors)
 
-def _WeekError(edid):
-  """Checks if the manufacturer week is in the proper range of 1-54.
+
+def GetErrors(edid, version=None, check_ranges=False, edid_layout=None):
+  """Checks EDID for all potential errors.
 
   Args:
-    edid: The list form of the EDID being checked.
+    edid: The bytes of the EDID being checked.
+    version: The string representing the version of the EDID, or None to read
+        it from the EDID.
+    check_ranges: Whether to also report the errors of GetRangeLimitErrors.
+    edid_layout: The layout.Layout of the EDID, if already computed.
 
   Returns:
-    An error.Error object, if there's an error.
+    A list of error.Error objects.
   """
-  if edid[0x10] > 54 and edid[0x10] != 255:
-    return [error.Error('Manufacturer/Vendor section- byte 0x10', 'Invalid week'
-                        ' value', 'Week in range 1-54', 'Week %d' % edid[0x10])]
+  return list(_IterErrors(edid, version, check_ranges, edid_layout))
 
 
-def GetErrors(edid, version):
-  """Checks EDID for all potential errors.
+def FirstError(edid, version=None, check_ranges=False, edid_layout=None):
+  """Finds the first error that GetErrors would report, and stops there.
+
+  Only the sections up to the first one with errors are decoded, and only the
+  errors of that section are built. Structural errors (header, checksums,
+  length) are found before any section is decoded, so a truncated EDID is
+  rejected rather than raising an exception.
 
   Args:
-    edid: The list form of the EDID being checked.
-    version: The string representing the version of the EDID.
+    edid: The bytes of the EDID being checked.
+    version: The string representing the version of the EDID, or None to read
+        it from the EDID.
+    check_ranges: Whether to also check the modes against the Display Range
+        Limits, as GetRangeLimitErrors does.
+    edid_layout: The layout.Layout of the EDID, if already computed.
 
   Returns:
-    A list of error.Error objects.
+    An error.Error object, or None if the EDID has no errors.
   """
-  errors = []
+  return next(_IterErrors(edid, version, check_ranges, edid_layout), None)
 
-  # Check for various errors, and add them to error list
 
-  error_check_functions = [
-      _HeaderError(edid),
-      _ChecksumError(edid),
-      _LengthError(edid),
-      _WeekError(edid),
-      _DescriptorErrors(edid, version),
-      _BaseStErrors(edid, version),
-      _ExtensionErrors(edid, version)
-  ]
+def IsValid(edid, version=None, check_ranges=False, edid_layout=None):
+  """Checks whether an EDID has no errors at all.
 
-  for err in error_check_functions:
-    if err:
-      errors.extend(err)
+  Equivalent to not GetErrors(edid, version, check_ranges), but stops at the
+  first error and builds no error for a valid EDID. A valid EDID still has
+  every descriptor, standard timing and extension decoded to be checked, so
+  this costs tens of microseconds per EDID (about 40 us on test_edid), not a
+  few. Extensions seen before are reused from the extension cache. To screen
+  large numbers of EDIDs on their header, checksums and length alone, use
+  corpus.CheckCorpus.
 
-  return errors
+  Args:
+    edid: The bytes of the EDID being checked.
+    version: The string representing the version of the EDID, or None to read
+        it from the EDID.
+    check_ranges: Whether to also check the modes against the Display Range
+        Limits, as GetRangeLimitErrors does.
+    edid_layout: The layout.Layout of the EDID, if already computed.
+
+  Returns:
+    True if the EDID has no errors.
+  """
+  return FirstError(edid, version, check_ranges, edid_layout) is None
 
 
+class ErrorCollector(visitor.Visitor):
+  """Collects the errors of an EDID that is walked by visitor.Walk.
+
+  Lets the checks share a walk with other visitors, e.g., a printer: the
+  sections the other visitors have decoded are cached on the edid.Edid, and
+  the checks run on them once the walk ends, as CheckEdid does. The collector
+  needs no section of the walk itself, so it never keeps a walk going. Use a
+  new ErrorCollector for each EDID.
+  """
+
+  def __init__(self, check_ranges=False, first_only=False):
+    """Creates an ErrorCollector object.
+
+    Args:
+      check_ranges: Whether to also report the errors of GetRangeLimitErrors.
+      first_only: Whether to stop at the first error.
+    """
+    self._check_ranges = check_ranges
+    self._first_only = first_only
+    self._errors = []
+
+  @property
+  def errors(self):
+    """Fetches the errors found in the walked EDID.
+
+    Returns:
+      A list of error.Error objects; at most one if first_only is set.
+    """
+    return self._errors
+
+  @property
+  def done(self):
+    """Tells Walk that this visitor needs no sections.
+
+    Returns:
+      True.
+    """
+    return True
+
+  def EndEdid(self, e):
+    """Checks the EDID, on the sections decoded during the walk.
+
+    Args:
+      e: The edid.Edid object being walked.
+    """
+    self._errors = CheckEdid(e, self._check_ranges, self._first_only)
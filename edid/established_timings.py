@@ -11,7 +11,7 @@ EstablishedTimings information is found in bytes 23h-25h of the base EDID.
 import tools
 
 
-_timings = [
+_timings = tools.FlagTable([
     [0x800000, '720x400 @ 70 Hz'],
     [0x400000, '720x400 @ 88 Hz'],
     [0x200000, '640x480 @ 60 Hz'],
@@ -36,28 +36,31 @@ _timings = [
     [0x4, 'Manufacturer specific display mode 5'],
     [0x2, 'Manufacturer specific display mode 6'],
     [0x1, 'Manufacturer specific display mode 7']
-]
+])
+
+# The names of all the established timings, from bit 7 of byte 23h on
+TIMING_NAMES = tuple(_timings.names)
 
 
 class EstablishedTimings(object):
   """Identifies and returns a list of supported Established Timings."""
 
-  def __init__(self, edid):
+  __slots__ = ('_base',)
+
+  def __init__(self, base):
     """Creates an EstablishedTimings object.
 
     Args:
-      edid: The EDID being analyzed.
+      base: The base_block.BaseBlock record of the EDID being analyzed.
     """
-    self._edid = edid
+    self._base = base
 
   @property
   def supported_timings(self):
     """Creates the list of supported timings.
 
     Returns:
-      The dict of strings and bools indicating supported timings.
+      A tools.FlagSet of the supported timings.
     """
     # Bytes 35, 36, 37
-    timing_byte = ((self._edid[0x23] << 16) + (self._edid[0x24] << 8)
-                   + (self._edid[0x25]))
-    return tools.DictFilter(_timings, timing_byte)
+    return _timings.Decode(self._base.established_timings)
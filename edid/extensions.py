@@ -13,7 +13,9 @@ import coordinated_video_timings as cvt_module
 import data_block
 import descriptor
 import error
+import layout
 import standard_timings
+import tools
 
 
 TYPE_TIMING_EXTENSION = 'Timing Extension'
@@ -28,19 +30,72 @@ TYPE_MANUFACTURER_EXTENSION = 'Extension defined by monitor manufacturer'
 TYPE_UNKNOWN = 'Unknown Extension type'
 
 
+# Maximum number of distinct extension blocks kept decoded by GetExtension
+DEFAULT_CACHE_ENTRIES = 1024
+
+# Decoded extensions, keyed by the bytes of their block and the EDID version.
+# The same extension block is often found in EDIDs that otherwise differ (for
+# instance, one scaler firmware used in several display models).
+_extension_cache = tools.LruCache(DEFAULT_CACHE_ENTRIES)
+
+# The decoder_generation of data_block and descriptor when the cached
+# extensions were decoded; registering a decoder changes it
+_cache_generations = (0, 0)
+
+
+def SetCacheSize(max_entries):
+  """Sets how many distinct extension blocks GetExtension keeps decoded.
+
+  Args:
+    max_entries: The maximum number of extensions held; 0 disables caching.
+  """
+  _extension_cache.Resize(max_entries)
+
+
+def ClearCache():
+  """Discards every extension kept decoded by GetExtension."""
+  _extension_cache.Clear()
+
+
 def GetExtension(edid, index, version):
   """Fetches an extension to an EDID.
 
+  Extensions are immutable once created, so an extension block with the same
+  bytes as one decoded before (in this or any other EDID) is answered with the
+  same Extension object, along with the data blocks, descriptors and errors
+  it has already decoded. The cache is emptied once a data block or
+  descriptor decoder has been registered since the last call.
+
   Args:
-    edid: The list form of the EDID being analyzed.
+    edid: The bytes of the EDID being analyzed.
     index: An integer indicating the index of the extension.
     version: The EDID version (usually 1.3 or 1.4).
 
   Returns:
     An Extension object.
   """
+  global _cache_generations
+  generations = (data_block.decoder_generation, descriptor.decoder_generation)
+  if generations != _cache_generations:
+    _extension_cache.Clear()
+    _cache_generations = generations
+
   block = edid[128 * index : 128 * (index + 1)]
 
+  return _extension_cache.Fetch((bytes(block), version),
+                                lambda: _DecodeExtension(block, version))
+
+
+def _DecodeExtension(block, version):
+  """Creates the Extension object for a block, according to its tag.
+
+  Args:
+    block: The bytes that make up the extension.
+    version: The EDID version (usually 1.3 or 1.4).
+
+  Returns:
+    An Extension object.
+  """
   tag = block[0]
 
   if tag == 0x00:
@@ -66,6 +121,8 @@ def GetExtension(edid, index, version):
 class Extension(object):
   """Defines a basic extension."""
 
+  __slots__ = ('_block', '_type', '_version', '_errors', '_has_errors')
+
   def __init__(self, block, my_type, version=None):
     """Creates an Extension object.
 
@@ -102,20 +159,125 @@ class Extension(object):
     Returns:
       A list of bytes that make up the extension.
     """
-    return self._block
+    return list(self._block)
+
+  @property
+  def layout(self):
+    """Fetches where the structures inside the extension are.
+
+    The checksum byte is not included. Extension types whose structure is not
+    decoded have no regions.
+
+    Returns:
+      A list of tuples of a layout.REGION_* kind, the start index and the end
+      index (exclusive) within the extension.
+    """
+    return []
+
+  def _FindRegions(self, kind):
+    """Fetches where the structures of a kind are, from the layout.
+
+    Args:
+      kind: The kind of region, e.g., layout.REGION_DTD.
+
+    Returns:
+      A list of tuples of the start index and the end index (exclusive)
+      within the extension, in byte order.
+    """
+    return [(start, end) for k, start, end in self.layout if k == kind]
 
   def CheckErrors(self, index=None):
-    """Creates a method for error checking to define in other Extensions.
+    """Checks the extension for errors.
 
     Args:
       index: The integer index of the extension being checked.
+
+    Returns:
+      A list of error.Error objects, empty if there are none.
+    """
+    return self._Place(list(self._IterErrors(index)), index)
+
+  def _IterErrors(self, index=None):
+    """Finds the errors of the extension, one at a time.
+
+    This is the only place the checks of an extension type are written;
+    extensions that have checks override it.
+
+    Args:
+      index: The integer index of the extension being checked.
+
+    Returns:
+      An iterator over error.Error objects, with offsets relative to the
+      extension.
+    """
+    return iter(())
+
+  def GetErrors(self, index=None):
+    """Fetches the result of CheckErrors, checking only once per index.
+
+    Args:
+      index: The integer index of the extension being checked.
+
+    Returns:
+      The result of CheckErrors(index).
+    """
+    try:
+      errors = self._errors
+    except AttributeError:
+      errors = self._errors = {}
+
+    try:
+      return errors[index]
+    except KeyError:
+      result = errors[index] = self.CheckErrors(index)
+      return result
+
+  def _Place(self, errors, index):
+    """Moves errors found within the extension to its position in the EDID.
+
+    Args:
+      errors: A list of error.Error objects, with offsets relative to the
+          extension.
+      index: The integer index of the extension, or None if unknown.
+
+    Returns:
+      A list of error.Error objects.
+    """
+    if not index:
+      return errors
+    return [err.Place(128 * index, index) for err in errors]
+
+  def HasErrors(self):
+    """Checks whether CheckErrors would find errors, without describing them.
+
+    The answer is computed once, so extensions shared between identical
+    EDIDs are only checked the first time.
+
+    Returns:
+      True if the extension has errors.
     """
-    pass
+    try:
+      return self._has_errors
+    except AttributeError:
+      self._has_errors = self._HasErrors()
+      return self._has_errors
+
+  def _HasErrors(self):
+    """Checks for errors, stopping at the first; called once by HasErrors.
+
+    Returns:
+      True if the extension has errors.
+    """
+    for _ in self._IterErrors():
+      return True
+    return False
 
 
 class TimingExtension(Extension):
   """Defines a Timing Extension."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a TimingExtension object.
 
@@ -128,6 +290,9 @@ class TimingExtension(Extension):
 class CEAExtension(Extension):
   """Defines a CEA Extension, perhaps the most common type."""
 
+  __slots__ = ('_dtd_start', '_data_blocks', '_dtds', '_data_block_starts',
+               '_pad_index', '_layout')
+
   def __init__(self, block, version):
     """Creates a CEAExtension object.
 
@@ -208,21 +373,87 @@ class CEAExtension(Extension):
     Returns:
       A list of Data Block objects.
     """
+    try:
+      dbs = self._data_blocks
+    except AttributeError:
+      dbs = self._data_blocks = self._DecodeDataBlocks()
+
+    return list(dbs) if dbs is not None else None
+
+  def _DecodeDataBlocks(self):
+    """Decodes the data blocks of the extension.
+
+    Returns:
+      A list of Data Block objects, or None if there are none.
+    """
     # DTDs begin immediately, meaning there are no data blocks
     if self._dtd_start == 4:
       return None
 
-    dbs = []
+    return [data_block.GetDataBlock(self._block, start)
+            for start in self._GetDataBlockStarts()]
+
+  def IterDataBlocks(self):
+    """Iterates over the Data Block objects, decoding each one when reached.
+
+    Unlike data_blocks, stops decoding as soon as the caller stops iterating.
+
+    Returns:
+      An iterator over Data Block objects.
+    """
+    try:
+      dbs = self._data_blocks
+    except AttributeError:
+      return (data_block.GetDataBlock(self._block, start)
+              for start in self._GetDataBlockStarts())
+
+    return iter(dbs or [])
+
+  def FindDataBlock(self, db_type, ieee_oui=None):
+    """Fetches the first Data Block of a type, decoding no further than it.
+
+    Args:
+      db_type: The type of the data block, e.g.,
+          data_block.DB_TYPE_VENDOR_SPECIFIC.
+      ieee_oui: An optional IEEE OUI string (as returned by the ieee_oui
+          property of vendor-specific blocks, e.g., '00-0c-03') that the data
+          block must also have.
+
+    Returns:
+      A Data Block object, or None if there is no such data block.
+    """
+    for db in self.IterDataBlocks():
+      if db.type == db_type and (
+          ieee_oui is None or getattr(db, 'ieee_oui', None) == ieee_oui):
+        return db
+    return None
+
+  def _GetDataBlockStarts(self):
+    """Fetches the start indices of the data blocks, computed once.
 
+    Only the header byte of each data block is read, for its length. If the
+    data blocks run past the end of the extension, the last start returned is
+    out of range.
+
+    Returns:
+      A tuple of integers indicating where each data block starts.
+    """
+    try:
+      return self._data_block_starts
+    except AttributeError:
+      pass
+
+    starts = []
     current = 4
 
     while current < self._dtd_start:
-      db = data_block.GetDataBlock(self._block, current)
-      dbs.append(db)
-
-      current += db.length + 1
+      starts.append(current)
+      if current >= len(self._block):
+        break  # Decoding this data block will fail, as it did before
+      current += (self._block[current] & 0x1F) + 1
 
-    return dbs
+    self._data_block_starts = tuple(starts)
+    return self._data_block_starts
 
   @property
   def dtds(self):
@@ -231,51 +462,110 @@ class CEAExtension(Extension):
     Returns:
       A list of descriptor.DetailedTimingDescriptor objects.
     """
-    dtds = []
+    try:
+      dtds = self._dtds
+    except AttributeError:
+      dtds = self._dtds = list(self._IterDecodeDtds())
+
+    return list(dtds)
+
+  def IterDtds(self):
+    """Iterates over the DTDs, decoding each one when reached.
+
+    Unlike dtds, stops decoding as soon as the caller stops iterating.
+
+    Returns:
+      An iterator over descriptor.DetailedTimingDescriptor objects.
+    """
+    try:
+      return iter(self._dtds)
+    except AttributeError:
+      return self._IterDecodeDtds()
+
+  def _IterDecodeDtds(self):
+    """Decodes the Detailed Timing Descriptors of the extension one by one.
+
+    Yields:
+      descriptor.DetailedTimingDescriptor objects.
+    """
+    for start, _ in self._FindRegions(layout.REGION_DTD):
+      yield descriptor.GetDescriptor(self._block, start, self._version)
 
-    for x in xrange(self._dtd_start, self._GetPadIndex(), 18):
-      dtd = descriptor.GetDescriptor(self._block, x, self._version)
-      dtds.append(dtd)
+  @property
+  def layout(self):
+    """Fetches where the header, data blocks, DTDs and padding are, once.
+
+    Returns:
+      A list of tuples of a layout.REGION_* kind, the start index and the end
+      index (exclusive) within the extension.
+    """
+    try:
+      return list(self._layout)
+    except AttributeError:
+      pass
 
-    return dtds
+    size = len(self._block)
+    regions = [layout.Intern(layout.REGION_EXTENSION_HEADER, 0, 4)]
+
+    for start in self._GetDataBlockStarts():
+      if start < size:
+        end = start + (self._block[start] & 0x1F) + 1
+        regions.append(layout.Intern(layout.REGION_DATA_BLOCK, start,
+                                     min(end, size)))
+
+    pad_index = self._GetPadIndex()
+    for start in xrange(self._dtd_start, pad_index, 18):
+      regions.append(layout.Intern(layout.REGION_DTD, start,
+                                   min(start + 18, size)))
+
+    regions.append(layout.Intern(layout.REGION_PADDING, pad_index, 127))
+
+    self._layout = tuple(regions)
+    return list(self._layout)
 
   def _GetPadIndex(self):
-    """Fetches the start index of post-DTD padding.
+    """Fetches the start index of post-DTD padding, computed once.
 
     Returns:
       An integer indicating the start index of post-DTD padding.
     """
+    try:
+      return self._pad_index
+    except AttributeError:
+      pass
+
     for x in xrange(self._dtd_start, 127, 18):
       if self._block[x] == self._block[x + 1] == 0:
+        self._pad_index = x
         return x
-    return 127 - (127 - self._dtd_start) % 18
 
-  def CheckErrors(self, index=None):
-    """Checks the extension for errors.
+    self._pad_index = 127 - (127 - self._dtd_start) % 18
+    return self._pad_index
+
+  def _IterErrors(self, index=None):
+    """Finds the errors of the extension.
 
     All bytes after the end of DTDs should be 0x00.
 
     Args:
       index: The integer index of the extension.
 
-    Returns:
-      An Error object.
+    Yields:
+      error.Error objects.
     """
-    ext_index = '(Extension #%d)' % index if index else ''
-    padding_start = self._GetPadIndex()
-    padding = self._block[padding_start : 127]
+    padding_start, padding_end = self._FindRegions(layout.REGION_PADDING)[0]
+    padding = self._block[padding_start : padding_end]
 
-    if padding != [0] * len(padding):
-      found = '%02X ' * len(padding) % tuple(padding,)
-      return [error.Error('CEA extension %s' % ext_index, 'All bytes after DTDs'
-                          ' should be 0x00', 'All 0x00s', found)]
-    else:
-      return None
+    if any(padding):
+      yield error.NewError(error.ERROR_CEA_PADDING, (index, tuple(padding)),
+                           offset=padding_start)
 
 
 class VTBExtension(Extension):
   """Defines a VTB Extension."""
 
+  __slots__ = ('_dtb_count', '_cvt_count', '_st_count', '_layout')
+
   def __init__(self, block, version):
     """Creates a VTBExtension object.
 
@@ -331,15 +621,8 @@ class VTBExtension(Extension):
     Returns:
       A list of descriptor.DetailedTimingDescriptors.
     """
-    dtbs = []
-    dtb_start = 5
-
-    for x in xrange(0, self._dtb_count):
-      dtd = descriptor.GetDescriptor(self._block, dtb_start + (x * 18),
-                                     self._version)
-      dtbs.append(dtd)
-
-    return dtbs
+    return [descriptor.GetDescriptor(self._block, start, self._version)
+            for start, _ in self._FindRegions(layout.REGION_DTD)]
 
   @property
   def cvts(self):
@@ -348,15 +631,8 @@ class VTBExtension(Extension):
     Returns:
       A list of coordinated_video_timings.CoordinatedVideoTiming objects.
     """
-    cvts = []
-    cvt_start = 5 + (18 * self._dtb_count)
-
-    for x in xrange(0, self._cvt_count):
-      cvt = cvt_module.GetCoordinatedVideoTiming(self._block,
-                                                 cvt_start + (x * 3))
-      cvts.append(cvt)
-
-    return cvts
+    return [cvt_module.GetCoordinatedVideoTiming(self._block, start)
+            for start, _ in self._FindRegions(layout.REGION_CVT)]
 
   @property
   def sts(self):
@@ -365,56 +641,79 @@ class VTBExtension(Extension):
     Returns:
       A list of standard_timings.StandardTiming objects.
     """
-    sts = []
-    st_start = 5 + (18 * self._dtb_count) + (3 * self._cvt_count)
+    return [standard_timings.GetStandardTiming(self._block, start,
+                                               self._version)
+            for start, _ in self._FindRegions(layout.REGION_STANDARD_TIMING)]
 
-    for x in xrange(0, self._st_count):
-      st = standard_timings.GetStandardTiming(self._block, st_start + (x * 2),
-                                              self._version)
-      sts.append(st)
+  @property
+  def layout(self):
+    """Fetches where the header, DTBs, CVTs, STs and padding are, once.
 
-    return sts
+    Returns:
+      A list of tuples of a layout.REGION_* kind, the start index and the end
+      index (exclusive) within the extension.
+    """
+    try:
+      return list(self._layout)
+    except AttributeError:
+      pass
 
-  def CheckErrors(self, index=None):
-    """Checks the extension for errors.
+    regions = [layout.Intern(layout.REGION_EXTENSION_HEADER, 0, 5)]
+    start = 5
 
-    Args:
-      index: The integer index of the extension.
+    for kind, count, size in [(layout.REGION_DTD, self._dtb_count, 18),
+                              (layout.REGION_CVT, self._cvt_count, 3),
+                              (layout.REGION_STANDARD_TIMING, self._st_count,
+                               2)]:
+      for _ in xrange(0, count):
+        if start + size <= 127:  # See _IterErrors for counts too large
+          regions.append(layout.Intern(kind, start, start + size))
+        start += size
 
-    Returns:
-      A list of error.Error objects.
-    """
-    errors = []
+    if start < 127:
+      regions.append(layout.Intern(layout.REGION_PADDING, start, 127))
 
-    cvts = self.cvts
-    for x in xrange(0, self._cvt_count):
-      err = cvts[x].CheckErrors(x + 1)
-      if err:
-        errors.extend(err)
+    self._layout = tuple(regions)
+    return list(self._layout)
 
-    sts = self.sts
-    for x in xrange(0, self._st_count):
-      err = sts[x].CheckErrors(x + 1)
-      if err:
-        errors.extend(err)
+  def _IterErrors(self, index=None):
+    """Finds the errors of the extension.
 
-    # Check that all bytes after standard timing blocks end are 0x00
-    unused_start = (5 + (18 * self._dtb_count) + (3 * self._cvt_count) +
-                    (2 * self._st_count))
+    Args:
+      index: The integer index of the extension.
+
+    Yields:
+      error.Error objects.
+    """
+    # Timings that would run past the checksum are left out of the layout
+    size = 18 * self._dtb_count + 3 * self._cvt_count + 2 * self._st_count
+    if 5 + size > 127:
+      yield error.NewError(error.ERROR_VTB_COUNTS,
+                           (index, self._dtb_count, self._cvt_count,
+                            self._st_count), offset=2)
+
+    for sections, kind in [(self.cvts, layout.REGION_CVT),
+                           (self.sts, layout.REGION_STANDARD_TIMING)]:
+      regions = self._FindRegions(kind)
+      for x in xrange(0, len(sections)):
+        if sections[x] is None:  # Unused standard timing
+          continue
+        for e in sections[x].CheckErrors(x + 1):
+          yield e.Place(regions[x][0])
 
-    ext_index = '(Extension #%d)' % index if index else ''
-    padding = self._block[unused_start : 127]
-    if padding != [0] * len(padding):
-      found = '0x%02X ' * len(padding) % tuple(padding,)
-      errors.append(error.Error('VTB Extension %s' % ext_index,
-                                'All bytes after STs should be 0x00',
-                                'All 0x00s', found))
-    return errors
+    # Check that all bytes after standard timing blocks end are 0x00
+    for unused_start, unused_end in self._FindRegions(layout.REGION_PADDING):
+      padding = self._block[unused_start : unused_end]
+      if any(padding):
+        yield error.NewError(error.ERROR_VTB_PADDING, (index, tuple(padding)),
+                             offset=unused_start)
 
 
 class DisplayInformationExtension(Extension):
   """Analyzes a Display Information Extension."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a DisplayInformationExtension object.
 
@@ -427,6 +726,8 @@ class DisplayInformationExtension(Extension):
 class LocalizedStringExtension(Extension):
   """Analyzes a Localized String Extension."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a LocalizedStringExtension object.
 
@@ -439,6 +740,8 @@ class LocalizedStringExtension(Extension):
 class DPVLExtension(Extension):
   """Analyzes a Digital Packet Video Link Extension."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a DPVLExtension object.
 
@@ -451,6 +754,8 @@ class DPVLExtension(Extension):
 class ExtensionBlockMap(Extension):
   """Defines an Extension Block Map (which is also an extension)."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates an ExtensionBlockMap object.
 
@@ -468,12 +773,14 @@ class ExtensionBlockMap(Extension):
     Returns:
       A list of 126 tags (integers) indicating the tag of each following block.
     """
-    return self._block[1:127]
+    return list(self._block[1:127])
 
 
 class ManufacturerExtension(Extension):
   """Defines a Manufacturer Extension."""
 
+  __slots__ = ()
+
   def __init__(self, block):
     """Creates a ManufacturerExtension object.
 
@@ -0,0 +1,132 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for extensions.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import unittest
+
+import data_block
+import error
+import extensions
+import layout
+import unittest_util
+
+
+def ReadBlock(index):
+  """Reads an extension block of the sample EDID of the repository.
+
+  Args:
+    index: The index of the extension (1 is VTB, 2 is CEA-861).
+
+  Returns:
+    A bytearray of the 128 bytes of the extension.
+  """
+  return unittest_util.ReadTestEdid()[128 * index : 128 * (index + 1)]
+
+
+def FindStarts(ext, kind):
+  """Lists where the regions of a kind start in the layout of an extension.
+
+  Args:
+    ext: An extensions.Extension object.
+    kind: The kind of region, e.g., layout.REGION_DTD.
+
+  Returns:
+    A list of integers.
+  """
+  return [start for k, start, _ in ext.layout if k == kind]
+
+
+class CEAExtensionTest(unittest.TestCase):
+  """Tests that CEAExtension decodes what its layout describes."""
+
+  def testDtdsFollowLayout(self):
+    ext = extensions.CEAExtension(ReadBlock(2), '1.4')
+    self.assertEqual([dtd.GetBlock() for dtd in ext.dtds],
+                     [list(ext.GetBlock()[start : start + 18])
+                      for start in FindStarts(ext, layout.REGION_DTD)])
+
+  def testPaddingError(self):
+    block = ReadBlock(2)
+    pad_start = FindStarts(extensions.CEAExtension(block, '1.4'),
+                           layout.REGION_PADDING)[0]
+    block[126] = 0x01
+    ext = extensions.CEAExtension(block, '1.4')
+    self.assertTrue(ext.HasErrors())
+    err = ext.CheckErrors(2)
+    self.assertEqual(len(err), 1)
+    self.assertEqual(err[0].code, error.ERROR_CEA_PADDING)
+    self.assertEqual(err[0].offset, 256 + pad_start)
+
+
+class VTBExtensionTest(unittest.TestCase):
+  """Tests that VTBExtension decodes what its layout describes."""
+
+  def testSectionsFollowLayout(self):
+    ext = extensions.VTBExtension(ReadBlock(1), '1.4')
+    for sections, kind in [(ext.dtbs, layout.REGION_DTD),
+                           (ext.cvts, layout.REGION_CVT),
+                           (ext.sts, layout.REGION_STANDARD_TIMING)]:
+      self.assertEqual([s.GetBlock()[0] for s in sections],
+                       [ext.GetBlock()[start]
+                        for start in FindStarts(ext, kind)])
+    self.assertFalse(ext.HasErrors())
+    self.assertEqual(ext.CheckErrors(1), [])
+
+  def testCountsTooLarge(self):
+    block = ReadBlock(1)
+    block[2] = 7  # The 7th DTB would end past the checksum
+    ext = extensions.VTBExtension(block, '1.4')
+    self.assertEqual(len(ext.dtbs), 6)
+    self.assertEqual(ext.cvts, [])
+    self.assertEqual(ext.sts, [])
+    self.assertTrue(ext.HasErrors())
+    err = ext.CheckErrors(1)
+    self.assertEqual(len(err), 1)
+    self.assertEqual(err[0].code, error.ERROR_VTB_COUNTS)
+    self.assertEqual(err[0].offset, 128 + 2)
+    self.assertEqual(err[0].values[1:], (7, block[3], block[4]))
+
+  def testCountsFillBlock(self):
+    block = bytearray(128)
+    block[0] = 0x10
+    block[2] = 6  # 6 DTBs and 7 STs use the 122 bytes exactly
+    block[4] = 7
+    for start in xrange(113, 127, 2):
+      block[start] = 0x01  # Unused STs
+      block[start + 1] = 0x01
+    ext = extensions.VTBExtension(block, '1.4')
+    self.assertEqual(FindStarts(ext, layout.REGION_PADDING), [])
+    self.assertNotIn(error.ERROR_VTB_COUNTS,
+                     [err.code for err in ext.CheckErrors(1)])
+
+
+class RegisterDataBlockTest(unittest.TestCase):
+  """Tests that cached extensions are decoded again after a registration."""
+
+  def testCachedExtensionIsDecodedAgain(self):
+    edid = unittest_util.ReadTestEdid()
+    ext = extensions.GetExtension(edid, 2, '1.4')
+    self.assertEqual(ext.data_blocks[1].type, data_block.DB_TYPE_AUDIO)
+
+    custom = lambda block: data_block.DataBlock(block, 'Custom audio')
+    previous = data_block.RegisterDataBlock(0x01, custom)
+    try:
+      ext = extensions.GetExtension(edid, 2, '1.4')
+      self.assertEqual(ext.data_blocks[1].type, 'Custom audio')
+    finally:
+      data_block.RegisterDataBlock(0x01, previous)
+
+    ext = extensions.GetExtension(edid, 2, '1.4')
+    self.assertEqual(ext.data_blocks[1].type, data_block.DB_TYPE_AUDIO)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,272 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Provides the Layout class, an index of where each structure of an EDID is.
+
+The layout lists, for every section of the base block and for the data
+blocks, descriptors and timings of each extension, the range of bytes it
+occupies and the region it belongs to. The parser, the error checks and the
+printers all look offsets up in it rather than each recomputing them.
+
+A layout keeps next to nothing per EDID: the regions of the base block are at
+fixed offsets and are shared by every layout, and those inside an extension are
+kept once per distinct extension block, on its cached Extension object.
+"""
+
+import collections
+
+
+REGION_BASE_BLOCK = 'Base EDID'
+REGION_HEADER = 'Header'
+REGION_VENDOR = 'Vendor & product identification'
+REGION_VERSION = 'EDID structure version & revision'
+REGION_BASIC_DISPLAY = 'Basic display parameters & features'
+REGION_CHROMATICITY = 'Color characteristics'
+REGION_ESTABLISHED_TIMINGS = 'Established timings'
+REGION_STANDARD_TIMINGS = 'Standard timings'
+REGION_STANDARD_TIMING = 'Standard timing'
+REGION_DESCRIPTOR = '18-byte descriptor'
+REGION_EXTENSION_COUNT = 'Extension count'
+REGION_CHECKSUM = 'Checksum'
+REGION_EXTENSION = 'Extension'
+REGION_EXTENSION_HEADER = 'Extension header'
+REGION_DATA_BLOCK = 'Data block'
+REGION_DTD = 'Detailed timing descriptor'
+REGION_CVT = 'Coordinated video timing'
+REGION_PADDING = 'Padding'
+
+
+# A range of bytes [start, end) of the EDID. parent is the Region that
+# contains it, or None for the base block and the extensions.
+Region = collections.namedtuple('Region', ['kind', 'start', 'end', 'parent'])
+
+
+# The sections of the base block, which are at fixed offsets
+_BASE_SECTIONS = [
+    (REGION_HEADER, 0x00, 0x08),
+    (REGION_VENDOR, 0x08, 0x12),
+    (REGION_VERSION, 0x12, 0x14),
+    (REGION_BASIC_DISPLAY, 0x14, 0x19),
+    (REGION_CHROMATICITY, 0x19, 0x23),
+    (REGION_ESTABLISHED_TIMINGS, 0x23, 0x26),
+    (REGION_STANDARD_TIMINGS, 0x26, 0x36)
+]
+
+_STANDARD_TIMING_START = 0x26
+_DESCRIPTOR_START = 0x36
+
+_NewTuple = tuple.__new__
+
+
+def _BuildBaseRegions():
+  """Lists the regions of the base block, which are the same in every EDID.
+
+  Returns:
+    A list of Region objects.
+  """
+  base = Region(REGION_BASE_BLOCK, 0, 128, None)
+  regions = [base]
+
+  for kind, start, end in _BASE_SECTIONS:
+    regions.append(Region(kind, start, end, base))
+
+  sts = regions[-1]
+  for x in xrange(0, 8):
+    start = _STANDARD_TIMING_START + (x * 2)
+    regions.append(Region(REGION_STANDARD_TIMING, start, start + 2, sts))
+
+  for x in xrange(0, 4):
+    start = _DESCRIPTOR_START + (x * 18)
+    regions.append(Region(REGION_DESCRIPTOR, start, start + 18, base))
+
+  regions.append(Region(REGION_EXTENSION_COUNT, 0x7E, 0x7F, base))
+  regions.append(Region(REGION_CHECKSUM, 0x7F, 0x80, base))
+
+  return regions
+
+
+def _IndexByKind(regions):
+  """Groups regions by their kind.
+
+  Args:
+    regions: A list of Region objects.
+
+  Returns:
+    A dict mapping each kind to the list of its Region objects, in order.
+  """
+  by_kind = {}
+  for r in regions:
+    by_kind.setdefault(r.kind, []).append(r)
+  return by_kind
+
+
+_BASE_REGIONS = _BuildBaseRegions()
+_BASE_BY_KIND = _IndexByKind(_BASE_REGIONS)
+
+
+_interned = {}
+
+
+def Intern(kind, start, end):
+  """Fetches the shared tuple for a region inside an extension.
+
+  Extensions keep their layout for as long as they are cached, and most of
+  them have their sections at the same few offsets, so they all hold the same
+  tuples rather than copies of them.
+
+  Args:
+    kind: The kind of region, e.g., REGION_DTD.
+    start: The start index within the extension.
+    end: The end index (exclusive) within the extension.
+
+  Returns:
+    A tuple of kind, start and end.
+  """
+  key = (kind, start, end)
+  return _interned.setdefault(key, key)
+
+
+class Layout(object):
+  """Defines the layout of an EDID: the list of its Regions, in byte order.
+
+  A layout holds no more than the size and the extension count of the EDID.
+  The regions of the extensions are built when they are asked for, those
+  inside an extension from the layout kept by its (shared) Extension object,
+  so that callers that only look at the base block and at the extensions as a
+  whole do not decode the extensions.
+  """
+
+  __slots__ = ('_size', '_num_ext', '_get_extension')
+
+  def __init__(self, size, num_ext, get_extension):
+    """Creates a Layout object.
+
+    Args:
+      size: The number of bytes in the EDID.
+      num_ext: The number of extensions the EDID claims to have.
+      get_extension: A callable that takes the index of an extension (starting
+          at 1) and returns its extensions.Extension object.
+    """
+    self._size = size
+    self._num_ext = num_ext
+    self._get_extension = get_extension
+
+  def _GetExtensions(self):
+    """Lists the regions of the extensions, cut short at the end of the EDID.
+
+    Returns:
+      A list of REGION_EXTENSION Region objects, in order.
+    """
+    size = self._size
+    return [_NewTuple(Region, (REGION_EXTENSION, start,
+                               max(start, min(start + 128, size)), None))
+            for start in xrange(128, 128 * (self._num_ext + 1), 128)]
+
+  def _GetChildren(self, ext):
+    """Lists the regions inside an extension.
+
+    Args:
+      ext: The REGION_EXTENSION Region object.
+
+    Returns:
+      A list of Region objects.
+    """
+    # The substructure of an extension that is cut short cannot be decoded
+    if ext.end - ext.start != 128:
+      return []
+
+    start = ext.start
+    children = [_NewTuple(Region, (kind, start + rel_start, start + rel_end,
+                                   ext))
+                for kind, rel_start, rel_end
+                in self._get_extension(start / 128).layout]
+    children.append(_NewTuple(Region, (REGION_CHECKSUM, start + 127,
+                                       start + 128, ext)))
+    return children
+
+  @property
+  def regions(self):
+    """Fetches every region of the EDID.
+
+    Returns:
+      A list of Region objects.
+    """
+    regions = list(_BASE_REGIONS)
+    for ext in self._GetExtensions():
+      regions.append(ext)
+      regions.extend(self._GetChildren(ext))
+    return regions
+
+  @property
+  def base_block(self):
+    """Fetches the region of the base block.
+
+    Returns:
+      A Region object.
+    """
+    return _BASE_REGIONS[0]
+
+  def Find(self, kind, within=None):
+    """Fetches the regions of a kind, in byte order.
+
+    Args:
+      kind: The kind of region, e.g., REGION_DESCRIPTOR.
+      within: An optional Region; if given, only regions inside it are
+          returned.
+
+    Returns:
+      A list of Region objects.
+    """
+    if within is None:
+      found = list(_BASE_BY_KIND.get(kind, []))
+      if kind == REGION_EXTENSION:
+        found.extend(self._GetExtensions())
+      else:
+        for ext in self._GetExtensions():
+          found.extend(r for r in self._GetChildren(ext) if r.kind == kind)
+      return found
+
+    if within is _BASE_REGIONS[0]:
+      return [r for r in _BASE_BY_KIND.get(kind, []) if r is not within]
+
+    if within.kind == REGION_EXTENSION and within in self._GetExtensions():
+      return [r for r in self._GetChildren(within) if r.kind == kind]
+
+    return [r for r in self.regions if r.kind == kind and r is not within and
+            within.start <= r.start and r.end <= within.end]
+
+  def GetRange(self, kind):
+    """Fetches the bytes occupied by the first region of a kind.
+
+    Args:
+      kind: The kind of region, e.g., REGION_CHROMATICITY.
+
+    Returns:
+      A tuple of the start index and the end index (exclusive).
+
+    Raises:
+      KeyError: If the EDID has no region of that kind.
+    """
+    found = _BASE_BY_KIND.get(kind) or self.Find(kind)
+    if not found:
+      raise KeyError(kind)
+    return found[0].start, found[0].end
+
+
+def GetLayout(edid, get_extension):
+  """Computes the layout of an EDID.
+
+  Args:
+    edid: The bytes of the EDID.
+    get_extension: A callable that takes the index of an extension (starting
+        at 1) and returns its extensions.Extension object.
+
+  Returns:
+    A Layout object.
+  """
+  size = len(edid)
+  # No extension fits in an EDID too short to hold an extension count
+  num_ext = edid[0x7E] if size > 0x7E else 0
+  return Layout(size, num_ext, get_extension)
@@ -0,0 +1,576 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Provides the ModeIndex class, the video modes an EDID supports.
+
+Modes are listed by established timings, standard timings, detailed timings,
+CVT codes and the short video descriptors of CEA extensions. The index
+gathers them all once, as numbers, merging a mode listed more than once, so
+that asking whether a mode is supported is a single dict lookup.
+
+The modes of an index can also be had as a ModeSet, a bitset with one bit per
+mode, so that the modes shared by several displays are found with a few
+integer operations. The modes of established timings and VICs, and the
+common modes of desktop displays, have fixed bits, a few hundred in all;
+other modes are held next to the bits in a set of their own.
+
+Typical use:
+
+  if e.mode_index.Supports(3840, 2160, 60):
+    ...
+
+  common = modes.CommonModes([e1, e2, e3])
+"""
+
+import collections
+import re
+
+import coordinated_video_timings as cvt_module
+import data_block
+import descriptor
+import established_timings
+import extensions
+import layout
+import standard_timings
+import tools
+import video_block
+import visitor
+
+
+SOURCE_ESTABLISHED_TIMING = 'Established timing'
+SOURCE_STANDARD_TIMING = 'Standard timing'
+SOURCE_DETAILED_TIMING = 'Detailed timing'
+SOURCE_CVT = 'Coordinated video timing'
+SOURCE_SVD = 'Short video descriptor'
+
+_SOURCE_FLAGS = [
+    [0x01, SOURCE_ESTABLISHED_TIMING],
+    [0x02, SOURCE_STANDARD_TIMING],
+    [0x04, SOURCE_DETAILED_TIMING],
+    [0x08, SOURCE_CVT],
+    [0x10, SOURCE_SVD]
+]
+_SOURCES = tools.FlagTable(_SOURCE_FLAGS)
+_SOURCE_BITS = dict((name, bit) for bit, name in _SOURCE_FLAGS)
+
+
+# refresh is the nominal refresh rate (the field rate of interlaced modes), in
+# Hz, rounded to an integer. height is the height of the whole frame, also for
+# interlaced modes. sources is a tools.FlagSet of the SOURCE_*, whose set_flags
+# are the sections listing the mode.
+Mode = collections.namedtuple('Mode', ['width', 'height', 'refresh',
+                                       'interlaced', 'sources'])
+
+
+# Height over width of the xy_pixel_ratio of standard timings
+_ST_RATIOS = {
+    '1:1': (1, 1),
+    '16:10': (10, 16),
+    '4:3': (3, 4),
+    '5:4': (4, 5),
+    '16:9': (9, 16)
+}
+
+# Width over height of the aspect_ratio of CVTs
+_CVT_RATIOS = {
+    '4:3 AR': (4, 3),
+    '16:9 AR': (16, 9),
+    '16:10 AR': (16, 10),
+    '15:9 AR': (15, 9)
+}
+
+# Established timing names, such as '1024x768 @ 87 Hz, interlaced (1024x768i)'
+# or '1280 x 768 @ 60 Hz (RB)'
+_TIMING_NAME_RE = re.compile(r'(\d+) ?x ?(\d+) @ (\d+) Hz')
+
+# The numeric mode of each established timing name, parsed on first use
+_named_modes = {}
+
+# The sizes and refresh rates of the common modes of desktop displays, which
+# detailed timings, standard timings and CVT codes list most often
+_COMMON_SIZES = [
+    (1280, 720), (1280, 768), (1280, 800), (1280, 960), (1280, 1024),
+    (1360, 768), (1366, 768), (1440, 900), (1400, 1050), (1600, 900),
+    (1600, 1200), (1680, 1050), (1920, 1080), (1920, 1200), (2048, 1152),
+    (2560, 1080), (2560, 1440), (2560, 1600), (3440, 1440), (3840, 1600),
+    (3840, 2160), (4096, 2160), (5120, 1440), (5120, 2160), (5120, 2880)
+]
+_COMMON_RATES = (60, 75, 50, 120, 144, 165, 240)
+
+
+def _ModeFromName(name):
+  """Fetches the numeric mode of an established timing.
+
+  Args:
+    name: The name of the established timing.
+
+  Returns:
+    A tuple of the width, height, refresh rate and whether the mode is
+    interlaced, or None for manufacturer specific timings.
+  """
+  try:
+    return _named_modes[name]
+  except KeyError:
+    pass
+
+  match = _TIMING_NAME_RE.match(name)
+  mode = None
+  if match:
+    mode = (int(match.group(1)), int(match.group(2)), int(match.group(3)),
+            'interlaced' in name)
+  _named_modes[name] = mode
+  return mode
+
+
+def _BuildVocabulary():
+  """Lists the modes that have a fixed bit in ModeSets, in order.
+
+  These are the modes of the established timings and of the VICs, then the
+  common modes of desktop displays, with the 60 Hz ones first.
+
+  Returns:
+    A list of tuples of the width, height, refresh rate and whether the mode
+    is interlaced, each listed once.
+  """
+  modes = []
+  seen = set()
+  named = [_ModeFromName(name) for name in
+           established_timings.TIMING_NAMES +
+           descriptor.ESTABLISHED_TIMINGS_III_NAMES]
+  vics = [video_block.GetSvdMode(vic) for vic in xrange(1, 256)]
+  common = [(width, height, rate, False) for rate in _COMMON_RATES
+            for width, height in _COMMON_SIZES]
+  for mode in named + vics + common:
+    if mode and mode not in seen:
+      seen.add(mode)
+      modes.append(mode)
+  return modes
+
+
+# The modes that have a fixed bit in ModeSets. A mode listed in several ways
+# has the first bit it is found at.
+_vocabulary = _BuildVocabulary()
+_vocabulary_bits = dict((mode, bit) for bit, mode in enumerate(_vocabulary))
+
+
+class ModeSet(object):
+  """Defines an immutable set of modes, held as an integer with a bit each.
+
+  Modes are tuples of the width, height, refresh rate and whether the mode is
+  interlaced, as the first four fields of Mode. Unlike a ModeIndex, a ModeSet
+  does not keep where each mode was listed.
+
+  The modes of established timings and VICs, and the common modes of desktop
+  displays, have fixed bits, so the integer of a set is at most a few hundred
+  bits long. Any other mode, such as that of a detailed timing of an unusual
+  size, is kept in the extra set of the ModeSet instead, so the modes of one
+  set never take bits for every other set.
+  """
+
+  __slots__ = ('_bits', '_extra')
+
+  def __init__(self, bits=0, extra=frozenset()):
+    """Creates a ModeSet object.
+
+    Args:
+      bits: The integer of the bits of the modes in the set.
+      extra: A frozenset of the modes in the set that have no bit.
+    """
+    self._bits = bits
+    self._extra = extra
+
+  @classmethod
+  def FromModes(cls, keys):
+    """Builds the set of some modes.
+
+    Args:
+      keys: An iterable of tuples of the width, height, refresh rate and
+          whether the mode is interlaced.
+
+    Returns:
+      A ModeSet object.
+    """
+    bits = 0
+    extra = []
+    for key in keys:
+      key = tuple(key[:4])
+      bit = _vocabulary_bits.get(key)
+      if bit is None:
+        extra.append(key)
+      else:
+        bits |= 1 << bit
+    return cls(bits, frozenset(extra))
+
+  @property
+  def bits(self):
+    """Fetches the bits of the modes in the set that have one.
+
+    The bits are only meaningful within one process: they are not meant to be
+    stored or sent elsewhere, as the vocabulary of modes with fixed bits may
+    change between versions of this module.
+
+    Returns:
+      An integer.
+    """
+    return self._bits
+
+  @property
+  def extra(self):
+    """Fetches the modes in the set that have no bit.
+
+    Returns:
+      A frozenset of tuples of the width, height, refresh rate and whether the
+      mode is interlaced.
+    """
+    return self._extra
+
+  def __iter__(self):
+    bits = self._bits
+    while bits:
+      low = bits & -bits
+      yield _vocabulary[low.bit_length() - 1]
+      bits ^= low
+    for key in sorted(self._extra):
+      yield key
+
+  def __len__(self):
+    return bin(self._bits).count('1') + len(self._extra)
+
+  def __nonzero__(self):
+    return self._bits != 0 or bool(self._extra)
+
+  def __contains__(self, key):
+    key = tuple(key)
+    if len(key) != 4:
+      return False
+    bit = _vocabulary_bits.get(key)
+    if bit is None:
+      return key in self._extra
+    return bool(self._bits >> bit & 1)
+
+  def __eq__(self, other):
+    return (isinstance(other, ModeSet) and self._bits == other._bits and
+            self._extra == other._extra)
+
+  def __ne__(self, other):
+    return not self == other
+
+  def __hash__(self):
+    return hash((self._bits, self._extra))
+
+  def __and__(self, other):
+    if not isinstance(other, ModeSet):
+      return NotImplemented
+    return ModeSet(self._bits & other._bits, self._extra & other._extra)
+
+  def __or__(self, other):
+    if not isinstance(other, ModeSet):
+      return NotImplemented
+    return ModeSet(self._bits | other._bits, self._extra | other._extra)
+
+  def __sub__(self, other):
+    if not isinstance(other, ModeSet):
+      return NotImplemented
+    return ModeSet(self._bits & ~other._bits, self._extra - other._extra)
+
+  def __xor__(self, other):
+    if not isinstance(other, ModeSet):
+      return NotImplemented
+    return ModeSet(self._bits ^ other._bits, self._extra ^ other._extra)
+
+  def __repr__(self):
+    return 'ModeSet(%r)' % list(self)
+
+
+def Intersection(mode_sets):
+  """Finds the modes that are in every one of several sets.
+
+  Args:
+    mode_sets: A non-empty iterable of ModeSet objects.
+
+  Returns:
+    A ModeSet object.
+  """
+  mode_sets = iter(mode_sets)
+  result = next(mode_sets)
+  for mode_set in mode_sets:
+    result &= mode_set
+  return result
+
+
+def Union(mode_sets):
+  """Finds the modes that are in any of several sets.
+
+  Args:
+    mode_sets: An iterable of ModeSet objects.
+
+  Returns:
+    A ModeSet object.
+  """
+  result = ModeSet()
+  for mode_set in mode_sets:
+    result |= mode_set
+  return result
+
+
+def CommonModes(edids):
+  """Finds the modes supported by every one of several EDIDs.
+
+  Args:
+    edids: A non-empty list of edid.Edid objects.
+
+  Returns:
+    A ModeSet object.
+  """
+  return Intersection(e.mode_index.mode_set for e in edids)
+
+
+class ModeIndex(object):
+  """Defines the set of modes an EDID supports, indexed by size and rate."""
+
+  __slots__ = ('_modes', '_by_rate', '_mode_set')
+
+  def __init__(self, modes):
+    """Creates a ModeIndex object.
+
+    Args:
+      modes: A list of Mode objects, each with a different width, height,
+          refresh rate and scan.
+    """
+    self._modes = modes
+    by_rate = {}
+    for mode in modes:
+      by_rate.setdefault(mode[:3], []).append(mode)
+    self._by_rate = by_rate
+    self._mode_set = None
+
+  @property
+  def modes(self):
+    """Fetches every supported mode.
+
+    Returns:
+      A list of Mode objects, in the order they are first listed in the EDID.
+    """
+    return list(self._modes)
+
+  @property
+  def mode_set(self):
+    """Fetches the supported modes as a bitset, computed once.
+
+    Returns:
+      A ModeSet object.
+    """
+    if self._mode_set is None:
+      self._mode_set = ModeSet.FromModes(self._modes)
+    return self._mode_set
+
+  def __len__(self):
+    return len(self._modes)
+
+  def Find(self, width, height, refresh):
+    """Fetches the supported modes of a size and refresh rate.
+
+    Args:
+      width: The width in pixels.
+      height: The height of the frame in lines.
+      refresh: The refresh rate in Hz, as an integer.
+
+    Returns:
+      A list of Mode objects (progressive, interlaced or both), empty if the
+      mode is not supported.
+    """
+    return list(self._by_rate.get((width, height, refresh), ()))
+
+  def Supports(self, width, height, refresh, interlaced=None):
+    """Checks whether a mode is supported.
+
+    Args:
+      width: The width in pixels.
+      height: The height of the frame in lines.
+      refresh: The refresh rate in Hz, as an integer.
+      interlaced: True or False to only accept interlaced or progressive
+          modes, or None to accept either.
+
+    Returns:
+      True if the mode is supported.
+    """
+    found = self._by_rate.get((width, height, refresh))
+    if not found or interlaced is None:
+      return bool(found)
+    return any(mode.interlaced == interlaced for mode in found)
+
+
+class ModeCollector(visitor.Visitor):
+  """Gathers the modes of an EDID as it is walked."""
+
+  def __init__(self):
+    """Creates a ModeCollector object."""
+    self._order = []
+    self._sources = {}
+    self._edid = None
+
+  def _Add(self, width, height, refresh, interlaced, source):
+    """Records a mode listed by a source.
+
+    Args:
+      width: The width in pixels.
+      height: The height of the frame in lines.
+      refresh: The refresh rate in Hz, as an integer.
+      interlaced: Whether the mode is interlaced.
+      source: One of the SOURCE_* constants.
+    """
+    key = (width, height, refresh, interlaced)
+    bits = self._sources.get(key)
+    if bits is None:
+      self._order.append(key)
+      bits = 0
+    self._sources[key] = bits | _SOURCE_BITS[source]
+
+  def _AddNamed(self, flags):
+    """Records the established timings of a set of flags.
+
+    Args:
+      flags: A tools.FlagSet of established timing names.
+    """
+    for name in flags.set_flags:
+      mode = _ModeFromName(name)
+      if mode:
+        self._Add(*(mode + (SOURCE_ESTABLISHED_TIMING,)))
+
+  def _AddStandardTiming(self, st):
+    """Records the mode of a standard timing.
+
+    Args:
+      st: A standard_timings.StandardTiming object, or None if unused.
+    """
+    if st and not st.HasErrors():
+      width = st.x_resolution
+      num, den = _ST_RATIOS[st.xy_pixel_ratio]
+      self._Add(width, width * num // den, st.vertical_freq, False,
+                SOURCE_STANDARD_TIMING)
+
+  def _AddDetailedTiming(self, desc):
+    """Records the mode of a detailed timing descriptor.
+
+    Args:
+      desc: A descriptor.Descriptor object; only detailed timings are used.
+    """
+    if isinstance(desc, descriptor.DetailedTimingDescriptor):
+      refresh = desc.refresh_rate
+      if refresh:
+        interlaced = desc.interlaced
+        height = desc.v_active_lines * (2 if interlaced else 1)
+        self._Add(desc.h_active_pixels, height, int(round(refresh)),
+                  interlaced, SOURCE_DETAILED_TIMING)
+
+  def _AddCvt(self, cvt):
+    """Records the modes of a CVT code, one per supported refresh rate.
+
+    Args:
+      cvt: A coordinated_video_timings.CoordinatedVideoTiming object, or None
+          if unused.
+    """
+    if not cvt:
+      return
+    height = cvt.active_vertical_lines
+    num, den = _CVT_RATIOS[cvt.aspect_ratio]
+    width = 8 * ((height * num // den) // 8)  # CVT widths are multiples of 8
+    for rate in cvt.supported_vertical_rates.set_flags:
+      # Every rate starts with two digits, e.g., '60Hz (reduced blanking)'
+      self._Add(width, height, int(rate[:2]), False, SOURCE_CVT)
+
+  def VisitEdid(self, e):
+    """Records the established timings of the base block.
+
+    Args:
+      e: The edid.Edid object being walked.
+    """
+    self._edid = e
+    self._AddNamed(e.established_timings.supported_timings)
+
+  def VisitStandardTiming(self, st, index):
+    """Records a standard timing of the base block.
+
+    Args:
+      st: A standard_timings.StandardTiming object.
+      index: The index (0-7) of the standard timing within the base EDID.
+    """
+    self._AddStandardTiming(st)
+
+  def VisitDescriptor(self, desc, index):
+    """Records the modes of a descriptor of the base block.
+
+    Args:
+      desc: A descriptor.Descriptor object.
+      index: The index (0-3) of the descriptor within the base EDID.
+    """
+    if isinstance(desc, descriptor.StandardTimingDescriptor):
+      for st in desc.standard_timings:
+        self._AddStandardTiming(st)
+    elif isinstance(desc, descriptor.CoordinatedVideoTimingsDescriptor):
+      for cvt in desc.coordinated_video_timings:
+        self._AddCvt(cvt)
+    elif isinstance(desc, descriptor.EstablishedTimingsIIIDescriptor):
+      self._AddNamed(desc.established_timings)
+    else:
+      self._AddDetailedTiming(desc)
+
+  def VisitExtension(self, ext, index):
+    """Records the modes of a CEA or VTB extension.
+
+    Args:
+      ext: An extensions.Extension object.
+      index: The index of the extension (starting at 1).
+    """
+    if isinstance(ext, extensions.CEAExtension):
+      for desc in ext.dtds:
+        self._AddDetailedTiming(desc)
+      for db in ext.data_blocks or []:
+        if db.type == data_block.DB_TYPE_VIDEO:
+          for svd in db.short_video_descriptors:
+            mode = video_block.GetSvdMode(svd.vic)
+            if mode:
+              self._Add(*(mode + (SOURCE_SVD,)))
+
+    elif isinstance(ext, extensions.VTBExtension):
+      # The counts of a VTB may claim more timings than fit in the block; the
+      # layout only has regions for those that do.
+      block = ext.GetBlock()
+      edid_layout = self._edid.layout
+      region = edid_layout.Find(layout.REGION_EXTENSION)[index - 1]
+      for r in edid_layout.Find(layout.REGION_DTD, region):
+        self._AddDetailedTiming(descriptor.GetDescriptor(
+            block, r.start - region.start, self._edid.edid_version))
+      for r in edid_layout.Find(layout.REGION_CVT, region):
+        self._AddCvt(cvt_module.GetCoordinatedVideoTiming(
+            block, r.start - region.start))
+      for r in edid_layout.Find(layout.REGION_STANDARD_TIMING, region):
+        self._AddStandardTiming(standard_timings.GetStandardTiming(
+            block, r.start - region.start, self._edid.edid_version))
+
+  @property
+  def index(self):
+    """Fetches the modes gathered so far.
+
+    Returns:
+      A ModeIndex object.
+    """
+    sources = self._sources
+    return ModeIndex([Mode(*(key + (_SOURCES.Decode(sources[key]),)))
+                      for key in self._order])
+
+
+def GetModeIndex(e):
+  """Gathers the modes supported by an EDID.
+
+  Args:
+    e: The edid.Edid object.
+
+  Returns:
+    A ModeIndex object.
+  """
+  collector = ModeCollector()
+  visitor.Walk(e, [collector])
+  return collector.index
@@ -0,0 +1,126 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for modes.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import unittest
+
+import edid
+import modes
+import unittest_util
+
+
+class ModeSetTest(unittest.TestCase):
+  """Tests ModeSet."""
+
+  def testMatchesModeIndex(self):
+    index = edid.Edid(unittest_util.ReadTestEdid()).mode_index
+    mode_set = index.mode_set
+    keys = [tuple(mode[:4]) for mode in index.modes]
+    self.assertEqual(sorted(mode_set), sorted(keys))
+    self.assertEqual(len(mode_set), len(keys))
+    for key in keys:
+      self.assertIn(key, mode_set)
+
+  def testFixedBits(self):
+    # The third established timing
+    self.assertEqual(modes.ModeSet.FromModes([(640, 480, 60, False)]).bits,
+                     1 << 2)
+    # An established timing III, a VIC and common desktop modes
+    for key in [(1280, 1024, 60, False), (1920, 1080, 60, True),
+                (1280, 800, 60, False), (1920, 1200, 50, False),
+                (2560, 1440, 60, False), (1600, 900, 60, False)]:
+      mode_set = modes.ModeSet.FromModes([key])
+      self.assertTrue(mode_set.bits)
+      self.assertFalse(mode_set.extra)
+      self.assertEqual(list(mode_set), [key])
+
+  def testSetsStaySmall(self):
+    index = edid.Edid(unittest_util.ReadTestEdid()).mode_index
+    self.assertTrue(index.mode_set.bits.bit_length() <= 512)
+    for key in [(2560, 1440, 60, False), (1600, 900, 60, False),
+                (3840, 2160, 144, False)]:
+      self.assertTrue(
+          modes.ModeSet.FromModes([key]).bits.bit_length() <= 512)
+
+    # A standard timing and a CVT code of less common sizes have no bit
+    for key in [(1152, 720, 85, False), (1704, 960, 85, False)]:
+      mode_set = modes.ModeSet.FromModes([key])
+      self.assertEqual(mode_set.bits, 0)
+      self.assertEqual(mode_set.extra, frozenset([key]))
+      self.assertIn(key, mode_set)
+
+  def testExtraModes(self):
+    odd = (1024, 600, 60, False)
+    a = modes.ModeSet.FromModes([odd, (640, 480, 60, False)])
+    b = modes.ModeSet.FromModes([odd, (800, 600, 60, False)])
+    self.assertEqual(a.extra, frozenset([odd]))
+    self.assertIn(odd, a)
+    self.assertEqual(list(a & b), [odd])
+    self.assertEqual(len(a | b), 3)
+    self.assertEqual(list(a - b), [(640, 480, 60, False)])
+    self.assertEqual(modes.Intersection([a, b]), a & b)
+    self.assertEqual(modes.Union([a, b]), a | b)
+    self.assertFalse(modes.ModeSet.FromModes([]))
+
+  def testCommonModes(self):
+    e = edid.Edid(unittest_util.ReadTestEdid())
+    other = edid.Edid(unittest_util.ReadTestEdid())
+    self.assertEqual(modes.CommonModes([e, other]), e.mode_index.mode_set)
+
+
+class ModeIndexTest(unittest.TestCase):
+  """Tests ModeIndex and the modes gathered from an EDID."""
+
+  def setUp(self):
+    self.index = edid.Edid(unittest_util.ReadTestEdid()).mode_index
+
+  def testSupports(self):
+    self.assertTrue(self.index.Supports(1920, 1080, 60))
+    self.assertTrue(self.index.Supports(1920, 1080, 60, interlaced=False))
+    self.assertFalse(self.index.Supports(1920, 1080, 60, interlaced=True))
+    self.assertTrue(self.index.Supports(640, 480, 60))
+    self.assertFalse(self.index.Supports(1920, 1080, 30))
+    self.assertFalse(self.index.Supports(1080, 1920, 60))
+
+  def testFind(self):
+    found = self.index.Find(1280, 720, 60)
+    self.assertEqual([mode[:4] for mode in found], [(1280, 720, 60, False)])
+    self.assertEqual(self.index.Find(1280, 720, 30), [])
+
+  def testFindBothScans(self):
+    sources = modes._SOURCES.Decode(0x10)  # SOURCE_SVD
+    index = modes.ModeIndex([modes.Mode(1920, 1080, 60, False, sources),
+                             modes.Mode(1920, 1080, 60, True, sources)])
+    self.assertEqual(len(index), 2)
+    self.assertEqual([mode.interlaced for mode in index.Find(1920, 1080, 60)],
+                     [False, True])
+    self.assertTrue(index.Supports(1920, 1080, 60, interlaced=True))
+    self.assertTrue(index.Supports(1920, 1080, 60, interlaced=False))
+
+  def testSourcesMerged(self):
+    # Listed by a DTD and a standard timing of the base block, and by an SVD
+    mode = self.index.Find(1920, 1080, 60)[0]
+    self.assertEqual(sorted(k for k, v in mode.sources.iteritems() if v),
+                     sorted([modes.SOURCE_DETAILED_TIMING,
+                             modes.SOURCE_STANDARD_TIMING,
+                             modes.SOURCE_SVD]))
+    mode = self.index.Find(640, 480, 60)[0]
+    self.assertEqual([k for k, v in mode.sources.iteritems() if v],
+                     [modes.SOURCE_ESTABLISHED_TIMING])
+
+  def testEachModeOnce(self):
+    keys = [tuple(mode[:4]) for mode in self.index.modes]
+    self.assertEqual(len(keys), len(set(keys)))
+    self.assertEqual(len(self.index), len(keys))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,205 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Caches results computed from EDIDs on disk, keyed by a hash of their bytes.
+
+Many EDIDs seen in practice are byte-identical copies of each other (the same
+display model attached to many machines), so the result of parsing one copy
+can be reused for all of them. Results are stored as JSON files in a
+directory, one per EDID and kind of result, and the least recently used ones
+are removed once the directory grows beyond a size limit.
+
+The cache may be shared by several processes. Files are written to a
+temporary name and renamed into place, so a reader never sees a partial
+result.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import tempfile
+
+import error
+
+
+NAMESPACE_ERRORS = 'errors'
+
+# Default limit on the total size of the cached results
+DEFAULT_MAX_SIZE = 64 << 20
+
+# Bump when the parser changes in a way that affects cached results, so that
+# results computed by an older parser are no longer found.
+_FORMAT_VERSION = 5
+
+_SUFFIX = '.json'
+
+
+class ParseCache(object):
+  """An on-disk least recently used cache of results computed from EDIDs.
+
+  Typical use:
+
+    cache = ParseCache('/var/cache/edid')
+    result = cache.Fetch('json', data, lambda: BuildJson(data))
+
+  An edid.Edid object created with a ParseCache uses it for GetErrors.
+  """
+
+  def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+    """Creates a ParseCache object, creating its directory if needed.
+
+    Args:
+      directory: The directory that holds the cached results.
+      max_size: The limit, in bytes, on the total size of the cached results.
+    """
+    self._directory = directory
+    self._max_size = max_size
+    self._size = None  # Unknown until the directory is first scanned
+
+    try:
+      os.makedirs(directory)
+    except OSError as e:
+      if e.errno != errno.EEXIST:
+        raise
+
+  @property
+  def directory(self):
+    """Fetches the directory that holds the cached results.
+
+    Returns:
+      A string naming the directory.
+    """
+    return self._directory
+
+  def _GetPath(self, namespace, data):
+    """Fetches the file name of a cached result.
+
+    Args:
+      namespace: A string naming the kind of result.
+      data: The bytes of the EDID (a str or bytearray).
+
+    Returns:
+      The path of the file holding the result.
+    """
+    digest = hashlib.sha1(bytes(data)).hexdigest()
+    name = '%s-%d-%s%s' % (namespace, _FORMAT_VERSION, digest, _SUFFIX)
+    return os.path.join(self._directory, name)
+
+  def Fetch(self, namespace, data, build):
+    """Fetches a cached result, computing and storing it if it is missing.
+
+    Args:
+      namespace: A string naming the kind of result, e.g., NAMESPACE_ERRORS.
+      data: The bytes of the EDID (a str or bytearray).
+      build: A callable with no arguments that computes the result. The result
+          must be JSON serializable.
+
+    Returns:
+      The result, as decoded from JSON if it came from the cache.
+    """
+    path = self._GetPath(namespace, data)
+
+    try:
+      with open(path, 'rb') as f:
+        result = json.load(f)
+    except (IOError, ValueError):
+      result = build()
+      self._Store(path, result)
+    else:
+      self._Touch(path)
+
+    return result
+
+  def GetErrors(self, data, check):
+    """Fetches the errors of an EDID, checking it only on a cache miss.
+
+    Args:
+      data: The bytes of the EDID (a str or bytearray).
+      check: A callable with no arguments that returns the list of
+          error.Error objects of the EDID.
+
+    Returns:
+      A list of error.Error objects.
+    """
+    found = self.Fetch(NAMESPACE_ERRORS, data,
+                       lambda: error.ErrorsToJson(check()))
+    return error.ErrorsFromJson(found)
+
+  def _Touch(self, path):
+    """Marks a cached result as recently used.
+
+    Args:
+      path: The path of the file holding the result.
+    """
+    try:
+      os.utime(path, None)
+    except OSError:
+      pass  # Evicted by another process in the meantime
+
+  def _Store(self, path, result):
+    """Writes a result into the cache, evicting old results if needed.
+
+    Args:
+      path: The path of the file to hold the result.
+      result: The JSON serializable result.
+    """
+    text = json.dumps(result)
+
+    fd, temp = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        f.write(text)
+      os.rename(temp, path)
+    except Exception:
+      os.unlink(temp)
+      raise
+
+    if self._size is not None:
+      self._size += len(text)
+    if self._size is None or self._size > self._max_size:
+      self._Evict()
+
+  def _Evict(self):
+    """Removes the least recently used results until within the size limit.
+
+    Rescans the directory, since other processes may have added or removed
+    results since this one last looked.
+    """
+    entries = []
+    size = 0
+
+    for name in os.listdir(self._directory):
+      if not name.endswith(_SUFFIX):
+        continue
+      path = os.path.join(self._directory, name)
+      try:
+        st = os.stat(path)
+      except OSError:
+        continue
+      entries.append((st.st_mtime, st.st_size, path))
+      size += st.st_size
+
+    entries.sort()
+    for _, file_size, path in entries:
+      if size <= self._max_size:
+        break
+      try:
+        os.unlink(path)
+      except OSError:
+        pass
+      size -= file_size
+
+    self._size = size
+
+  def Clear(self):
+    """Removes every cached result."""
+    for name in os.listdir(self._directory):
+      if name.endswith(_SUFFIX):
+        try:
+          os.unlink(os.path.join(self._directory, name))
+        except OSError:
+          pass
+    self._size = 0
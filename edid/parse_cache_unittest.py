@@ -0,0 +1,162 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for parse_cache.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import edid
+import parse_cache
+import unittest_util
+
+
+_FIELDS = ('code', 'block', 'offset', 'values', 'location', 'message',
+           'expected', 'found')
+
+
+def ReadBrokenEdid():
+  """Reads the sample EDID of the repository and breaks several of its checks.
+
+  Returns:
+    A bytearray.
+  """
+  data = unittest_util.ReadTestEdid()
+  data[0] = 0x01  # Header
+  data[0x10] = 60  # Week
+  data[0x7F] = 0x00  # Checksum of the base block
+  data[256 + 126] = 0x01  # Padding of the CEA extension
+  return data
+
+
+class GetErrorsTest(unittest.TestCase):
+  """Tests that errors found in the cache match those found by checking."""
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def testCachedErrorsMatch(self):
+    data = ReadBrokenEdid()
+    expected = edid.Edid(data).GetErrors()
+    self.assertTrue(len(expected) > 1)
+
+    for _ in xrange(2):  # A cache miss, then a hit
+      cache = parse_cache.ParseCache(self.directory)
+      found = edid.Edid(data, cache).GetErrors()
+      self.assertEqual(len(found), len(expected))
+      for err, expected_err in zip(found, expected):
+        for field in _FIELDS:
+          self.assertEqual(getattr(err, field), getattr(expected_err, field),
+                           '%s of error %d' % (field, expected_err.code))
+
+
+class EvictTest(unittest.TestCase):
+  """Tests that the least recently used results go first past the limit."""
+
+  # A result, and the size of the file that holds it
+  _RESULT = 'x' * 100
+  _SIZE = len(json.dumps(_RESULT))
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.cache = parse_cache.ParseCache(self.directory,
+                                        max_size=3 * self._SIZE)
+    self.built = []
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def _Fetch(self, key):
+    """Fetches the result for an EDID, noting whether it had to be built.
+
+    Args:
+      key: An integer standing for the bytes of an EDID.
+    """
+    def Build():
+      self.built.append(key)
+      return self._RESULT
+
+    self.assertEqual(self.cache.Fetch('test', bytearray([key]), Build),
+                     self._RESULT)
+
+  def _SetUsed(self, key, when):
+    """Sets when the result for an EDID was last used.
+
+    Args:
+      key: An integer standing for the bytes of an EDID.
+      when: The time of last use, in seconds since the epoch.
+    """
+    path = self.cache._GetPath('test', bytearray([key]))
+    os.utime(path, (when, when))
+
+  def _Cached(self):
+    """Lists the EDIDs whose results are in the cache.
+
+    Returns:
+      A sorted list of integers.
+    """
+    return sorted(key for key in xrange(256) if os.path.exists(
+        self.cache._GetPath('test', bytearray([key]))))
+
+  def testLeastRecentlyUsedGoFirst(self):
+    for key in xrange(3):
+      self._Fetch(key)
+    self.assertEqual(self._Cached(), [0, 1, 2])
+
+    past = time.time() - 1000
+    self._SetUsed(0, past + 20)
+    self._SetUsed(1, past)
+    self._SetUsed(2, past + 10)
+
+    self._Fetch(3)
+    self.assertEqual(self._Cached(), [0, 2, 3])
+    self._Fetch(4)
+    self.assertEqual(self._Cached(), [0, 3, 4])
+    self.assertEqual(self.built, [0, 1, 2, 3, 4])
+
+  def testHitRefreshes(self):
+    for key in xrange(3):
+      self._Fetch(key)
+
+    past = time.time() - 1000
+    for key in xrange(3):
+      self._SetUsed(key, past + key)
+
+    self._Fetch(0)  # A hit makes 0 the most recently used
+    self.assertEqual(self.built, [0, 1, 2])
+
+    self._Fetch(3)
+    self.assertEqual(self._Cached(), [0, 2, 3])
+    self._Fetch(0)
+    self.assertEqual(self.built, [0, 1, 2, 3])
+
+  def testLimitSeenAcrossInstances(self):
+    for key in xrange(3):
+      self._Fetch(key)
+    past = time.time() - 1000
+    for key in xrange(3):
+      self._SetUsed(key, past + key)
+
+    # A new instance scans the directory before its first store
+    self.cache = parse_cache.ParseCache(self.directory,
+                                        max_size=3 * self._SIZE)
+    self._Fetch(3)
+    self.assertEqual(self._Cached(), [1, 2, 3])
+
+
+if __name__ == '__main__':
+  unittest.main()
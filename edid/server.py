@@ -0,0 +1,340 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Serves EDID parsing requests over a local Unix socket.
+
+A long-lived server lets other processes have EDIDs parsed without paying
+interpreter start-up and module import costs for every EDID. Connections are
+accepted by a threaded front end, and the parsing itself runs in a pool of
+worker processes.
+
+Requests and responses are framed as follows:
+
+  request:  1-byte command, 4-byte big-endian length, raw EDID bytes
+  response: 4-byte big-endian length, JSON object (UTF-8)
+
+The JSON object holds either a 'result' or an 'error' string. Requests may be
+pipelined on a single connection; responses come back in request order.
+"""
+
+import errno
+import json
+import multiprocessing
+import os
+import Queue
+import socket
+import SocketServer
+import struct
+import threading
+
+import edid
+import error
+
+
+COMMAND_ERRORS = 'E'
+COMMAND_PARSE = 'P'
+
+
+_HEADER = struct.Struct('>cI')
+_LENGTH = struct.Struct('>I')
+
+# The largest EDID has a base block and 255 extensions
+_MAX_EDID_LENGTH = 256 * 128
+
+# Requests read ahead of their responses on a single connection
+_MAX_PIPELINE = 64
+
+
+class ServerError(Exception):
+  """Raised by Client when the server could not handle a request."""
+
+
+def _GetErrors(e):
+  """Handles a COMMAND_ERRORS request.
+
+  Args:
+    e: The edid.Edid object.
+
+  Returns:
+    A list of dictionaries describing the errors in the EDID.
+  """
+  return error.ErrorsToJson(e.GetErrors())
+
+
+# The commands every Server answers; a Server adds its own handlers to a copy
+_DEFAULT_HANDLERS = {COMMAND_ERRORS: _GetErrors}
+
+# The handlers of the Server a worker process belongs to, set by _InitWorker
+_handlers = {}
+
+
+def _InitWorker(handlers):
+  """Installs the handlers of a Server in one of its worker processes.
+
+  The pool forks the workers, so the handlers reach them without being
+  pickled.
+
+  Args:
+    handlers: A dict of command characters and handler functions.
+  """
+  global _handlers
+  _handlers = handlers
+
+
+def _HandleRequest(command, data):
+  """Parses a single EDID; runs in a worker process.
+
+  Args:
+    command: The single character command of the request.
+    data: The string of raw EDID bytes.
+
+  Returns:
+    The JSON encoded response.
+  """
+  handler = _handlers.get(command)
+  if not handler:
+    return json.dumps({'error': 'Unknown command %r' % command})
+
+  try:
+    result = handler(edid.Edid(data))
+  except Exception as e:  # pylint: disable=broad-except
+    return json.dumps({'error': '%s: %s' % (type(e).__name__, e)})
+
+  return json.dumps({'result': result})
+
+
+def _RecvExactly(sock, size):
+  """Reads exactly size bytes from a socket.
+
+  Args:
+    sock: The connected socket.
+    size: The number of bytes to read.
+
+  Returns:
+    The string of bytes read, or None if the peer closed the connection before
+    sending any of them.
+
+  Raises:
+    EOFError: If the peer closed the connection part way through.
+  """
+  chunks = []
+  remaining = size
+
+  while remaining:
+    chunk = sock.recv(remaining)
+    if not chunk:
+      if remaining == size:
+        return None
+      raise EOFError('Connection closed in the middle of a frame')
+    chunks.append(chunk)
+    remaining -= len(chunk)
+
+  return ''.join(chunks)
+
+
+class _RequestHandler(SocketServer.BaseRequestHandler):
+  """Reads pipelined requests from one connection and answers them in order."""
+
+  def handle(self):
+    """Submits each request to the worker pool as soon as it is read."""
+    pending = Queue.Queue(_MAX_PIPELINE)
+    writer = threading.Thread(target=self._WriteResponses, args=(pending,))
+    writer.daemon = True
+    writer.start()
+
+    try:
+      while True:
+        header = _RecvExactly(self.request, _HEADER.size)
+        if header is None:
+          break
+
+        command, length = _HEADER.unpack(header)
+        if length > _MAX_EDID_LENGTH:
+          # The rest of the stream cannot be framed, so answer and hang up
+          pending.put(json.dumps({'error': 'EDID too long'}))
+          break
+
+        data = _RecvExactly(self.request, length) if length else ''
+        if data is None:
+          break
+
+        pending.put(self.server.pool.apply_async(_HandleRequest,
+                                                 (command, data)))
+    except (EOFError, socket.error):
+      pass
+    finally:
+      pending.put(None)
+      writer.join()
+
+  def _WriteResponses(self, pending):
+    """Writes the responses back in the order the requests arrived.
+
+    Args:
+      pending: A Queue.Queue of multiprocessing AsyncResult objects (or of
+          responses ready to send), ending with None.
+    """
+    connected = True
+
+    while True:
+      result = pending.get()
+      if result is None:
+        return
+
+      response = result if isinstance(result, str) else result.get()
+      if not connected:
+        continue
+
+      try:
+        self.request.sendall(_LENGTH.pack(len(response)) + response)
+      except socket.error:
+        connected = False  # Keep draining so the reader is never blocked
+
+
+class Server(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+  """Accepts connections on a Unix socket and parses EDIDs in worker processes.
+
+  Typical use:
+
+    server = Server('/tmp/edid.sock')
+    try:
+      server.serve_forever()
+    finally:
+      server.server_close()
+  """
+
+  daemon_threads = True
+
+  def __init__(self, path, handlers=None, processes=None):
+    """Creates a Server object listening on path.
+
+    Args:
+      path: The file name of the Unix socket.
+      handlers: An optional dict of additional command characters and
+          functions that take an edid.Edid object and return a JSON
+          serializable result.
+      processes: The number of worker processes (default: one per CPU).
+
+    Raises:
+      socket.error: If another server is already listening on path.
+    """
+    self.handlers = dict(_DEFAULT_HANDLERS)
+    if handlers:
+      self.handlers.update(handlers)
+
+    _RemoveStaleSocket(path)
+
+    self.pool = multiprocessing.Pool(processes, _InitWorker, (self.handlers,))
+    SocketServer.UnixStreamServer.__init__(self, path, _RequestHandler)
+
+  def server_close(self):
+    """Stops the worker pool and removes the socket file."""
+    SocketServer.UnixStreamServer.server_close(self)
+    self.pool.terminate()
+    self.pool.join()
+
+    try:
+      os.unlink(self.server_address)
+    except OSError:
+      pass
+
+
+def _RemoveStaleSocket(path):
+  """Removes a socket file left behind by a server that is no longer running.
+
+  Args:
+    path: The file name of the Unix socket.
+
+  Raises:
+    socket.error: If a server is still accepting connections on path.
+  """
+  if not os.path.exists(path):
+    return
+
+  sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  try:
+    sock.connect(path)
+  except socket.error as e:
+    if e.errno not in (errno.ECONNREFUSED, errno.ENOENT):
+      raise
+    os.unlink(path)
+  else:
+    raise socket.error(errno.EADDRINUSE, 'Server already running on %s' % path)
+  finally:
+    sock.close()
+
+
+class Client(object):
+  """Sends EDIDs to a Server and reads back the results.
+
+  Parse and GetErrors wait for each answer. To pipeline, call Send several
+  times and then Receive once per request sent.
+  """
+
+  def __init__(self, path):
+    """Creates a Client object connected to the server at path.
+
+    Args:
+      path: The file name of the Unix socket.
+    """
+    self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    self._sock.connect(path)
+
+  def Send(self, command, data):
+    """Sends a single request without waiting for the response.
+
+    Args:
+      command: A command character, e.g. COMMAND_PARSE.
+      data: The raw EDID bytes (a string, bytearray or list of integers).
+    """
+    data = str(bytearray(data))
+    self._sock.sendall(_HEADER.pack(command, len(data)) + data)
+
+  def Receive(self):
+    """Reads the response to the oldest outstanding request.
+
+    Returns:
+      The result of the request.
+
+    Raises:
+      ServerError: If the server reported an error or closed the connection.
+    """
+    header = _RecvExactly(self._sock, _LENGTH.size)
+    if header is None:
+      raise ServerError('Connection closed by server')
+
+    response = json.loads(_RecvExactly(self._sock, _LENGTH.unpack(header)[0]))
+    if 'error' in response:
+      raise ServerError(response['error'])
+    return response['result']
+
+  def Parse(self, data):
+    """Fetches the jsonedid dictionary form of an EDID.
+
+    Requires a server started through jsonedid, which registers COMMAND_PARSE.
+
+    Args:
+      data: The raw EDID bytes.
+
+    Returns:
+      A dictionary of information about the EDID, or None if it has errors.
+    """
+    self.Send(COMMAND_PARSE, data)
+    return self.Receive()
+
+  def GetErrors(self, data):
+    """Checks an EDID for errors.
+
+    Args:
+      data: The raw EDID bytes.
+
+    Returns:
+      A list of dictionaries describing the errors (see error.ErrorsToJson).
+    """
+    self.Send(COMMAND_ERRORS, data)
+    return self.Receive()
+
+  def Close(self):
+    """Closes the connection to the server."""
+    self._sock.close()
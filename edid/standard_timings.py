@@ -7,11 +7,25 @@
 
 StandardTiming objects are found in bytes 26h-35h of the base EDID, as well as
 in StandardTimingDescriptor objects.
+
+A standard timing is a 2-byte code, so there are only 65536 of them. Each is
+decoded the first time it is found, and the StandardTiming object is shared by
+every later occurrence of the same code.
 """
 
 import error
 
 
+# xy_pixel_ratio, by bits 7-6 of byte 1. Before EDID 1.3, 0 meant 1:1.
+_PIXEL_RATIOS = ('16:10', '4:3', '5:4', '16:9')
+_PIXEL_RATIOS_BEFORE_1_3 = ('1:1',) + _PIXEL_RATIOS[1:]
+
+# Whether the EDID version is before 1.3 (the only difference the version
+# makes), mapped to the StandardTiming objects of the 65536 codes (byte 0 << 8
+# | byte 1). Each object is created the first time its code is decoded.
+_timings = {}
+
+
 def GetStandardTiming(edid, start_index, version):
   """Checks if a potential standard timing block is valid.
 
@@ -21,18 +35,31 @@ def GetStandardTiming(edid, start_index, version):
     version: The EDID version.
 
   Returns:
-    A StandardTiming object, if valid; else, None.
+    A StandardTiming object, if valid; else, None. The same object is returned
+    for every standard timing with the same bytes.
   """
-  if not edid[start_index] == edid[start_index + 1] == 0x01:
-    return StandardTiming(edid, start_index, version)
-  else:
+  code = (edid[start_index] << 8) | edid[start_index + 1]
+  if code == 0x0101:  # Unused
     return None
 
+  before_1_3 = version < '1.3'
+  try:
+    table = _timings[before_1_3]
+  except KeyError:
+    table = _timings[before_1_3] = [None] * 0x10000
+
+  st = table[code]
+  if st is None:
+    st = table[code] = StandardTiming(edid, start_index, version)
+  return st
+
 
 # Used in base EDID as well as StandardTimingDescriptors
 class StandardTiming(object):
   """Defines a single supported Standard Timing and its properties."""
 
+  __slots__ = ('_block', '_xy_pixel_ratio', '_vertical_freq')
+
   def __init__(self, edid, start_index, version):
     """Creates a StandardTiming object.
 
@@ -42,8 +69,11 @@ class StandardTiming(object):
           objects.
       version: The version of the EDID.
     """
-    self._block = edid[start_index:start_index + 2]
-    self._version = version
+    self._block = block = edid[start_index:start_index + 2]
+
+    ratios = _PIXEL_RATIOS_BEFORE_1_3 if version < '1.3' else _PIXEL_RATIOS
+    self._xy_pixel_ratio = ratios[(block[1] >> 6) & 0x03]
+    self._vertical_freq = (block[1] & 0x3F) + 60
 
   def GetBlock(self):
     """Fetches the data block of the StandardTiming object.
@@ -51,7 +81,7 @@ class StandardTiming(object):
     Returns:
       A list of bytes that make up this StandardTiming object.
     """
-    return self._block
+    return list(self._block)
 
   @property
   def x_resolution(self):
@@ -69,16 +99,31 @@ class StandardTiming(object):
       index: The integer index of this StandardTiming object.
 
     Returns:
-      A list of error.Error objects.
+      A list of error.Error objects, empty if there are none.
     """
-    st_index = '#%d' % index if index else ''
+    return list(self._IterErrors(index))
+
+  def HasErrors(self):
+    """Checks whether CheckErrors would find errors, stopping at the first.
 
+    Returns:
+      True if the standard timing has errors.
+    """
+    for _ in self._IterErrors():
+      return True
+    return False
+
+  def _IterErrors(self, index=None):
+    """Finds the errors of the standard timing, one at a time.
+
+    Args:
+      index: The integer index of this StandardTiming object.
+
+    Yields:
+      error.Error objects.
+    """
     if self._block[0] == 0:
-      return [error.Error('Standard Timing object %s' % st_index,
-                          'X resolution unset/invalid', '256-2288 pixels',
-                          'Value of 0 (converts to 248)')]
-    else:
-      return None
+      yield error.NewError(error.ERROR_ST_X_RESOLUTION, (index,), offset=0)
 
   @property
   def xy_pixel_ratio(self):
@@ -87,18 +132,7 @@ class StandardTiming(object):
     Returns:
       A string that indicates xy pixel ratio.
     """
-    pixel_ratio = ''
-    code = (self._block[1] >> 6) & 0x03
-    if code == 0x0:
-      pixel_ratio = '1:1' if self._version < '1.3' else '16:10'
-    elif code == 0x1:
-      pixel_ratio = '4:3'
-    elif code == 0x2:
-      pixel_ratio = '5:4'
-    else:
-      pixel_ratio = '16:9'
-
-    return pixel_ratio
+    return self._xy_pixel_ratio
 
   @property
   def vertical_freq(self):
@@ -109,5 +143,5 @@ class StandardTiming(object):
     Returns:
       An integer indicating vertical frequency (in Hz).
     """
-    return (self._block[1] & 0x3F) + 60
+    return self._vertical_freq
 
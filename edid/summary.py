@@ -0,0 +1,121 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Reads the identity of a display from an EDID, for indexing many EDIDs.
+
+Only the vendor/product section (bytes 08h-0Fh) and the four descriptors of
+the base EDID are read, and no descriptor, extension or layout object is
+built. The values are the same as those of the corresponding properties of
+edid.Edid and of the descriptors it decodes.
+"""
+
+import collections
+import struct
+
+
+# Header (skipped), manufacturer ID (2 bytes, big endian), product code and
+# serial number (little endian).
+_VENDOR_FORMAT = struct.Struct('<8x2BHI')
+
+_DESCRIPTOR_STARTS = (0x36, 0x48, 0x5A, 0x6C)
+_PRODUCT_NAME_TAG = 0xFC
+
+
+Summary = collections.namedtuple('Summary', [
+    'manufacturer_id',  # Three letters, as edid.Edid.manufacturer_id
+    'product_code',
+    'serial_number',  # None if unset
+    'product_name',  # String of the Display Product Name descriptor, or None
+    'preferred_timing'  # PreferredTiming record, or None
+])
+
+# The first descriptor of the base EDID, when it is a Detailed Timing
+# Descriptor. The fields are the values of the properties of
+# descriptor.DetailedTimingDescriptor of the same names.
+PreferredTiming = collections.namedtuple('PreferredTiming', [
+    'pixel_clock',  # MHz
+    'h_active_pixels',
+    'v_active_lines',
+    'interlaced',
+    'refresh_rate'  # Hz, None if either total is 0
+])
+
+# Manufacturer IDs already converted to letters, by their 16-bit packed value
+_manufacturer_ids = {}
+
+
+def _GetManufacturerId(packed):
+  """Converts a packed manufacturer ID into its three letters.
+
+  Args:
+    packed: The 16-bit manufacturer ID of bytes 08h-09h.
+
+  Returns:
+    A three letter string.
+  """
+  try:
+    return _manufacturer_ids[packed]
+  except KeyError:
+    letters = _manufacturer_ids[packed] = (chr(((packed >> 10) & 0x1F) + 64) +
+                                           chr(((packed >> 5) & 0x1F) + 64) +
+                                           chr((packed & 0x1F) + 64))
+    return letters
+
+
+def _GetPreferredTiming(edid, start):
+  """Decodes the timing of the first descriptor of the base EDID.
+
+  Args:
+    edid: The bytes of the EDID, as a bytearray.
+    start: The index of the first byte of the descriptor.
+
+  Returns:
+    A PreferredTiming record, or None if the descriptor is a display
+    descriptor.
+  """
+  if not (edid[start] or edid[start + 1] or edid[start + 2]):
+    return None
+
+  clock = (edid[start + 1] << 8) + edid[start]  # In units of 10 kHz
+  h_active = ((edid[start + 4] & 0xF0) << 4) + edid[start + 2]
+  v_active = ((edid[start + 7] & 0xF0) << 4) + edid[start + 5]
+  total = ((h_active + ((edid[start + 4] & 0x0F) << 8) + edid[start + 3]) *
+           (v_active + ((edid[start + 7] & 0x0F) << 8) + edid[start + 6]))
+
+  return PreferredTiming(
+      clock / 100.0, h_active, v_active, edid[start + 17] & 0x80 != 0,
+      clock * 10000.0 / total if total else None)
+
+
+def GetSummary(edid, offset=0):
+  """Reads the identity and preferred timing of a display from its EDID.
+
+  Args:
+    edid: The bytes of the EDID, as a bytearray.
+    offset: The index at which the base block starts.
+
+  Returns:
+    A Summary record.
+
+  Raises:
+    IndexError: If fewer than 128 bytes are available at offset.
+  """
+  if len(edid) - offset < 128:
+    raise IndexError('Base EDID block is shorter than 128 bytes')
+
+  m_hi, m_lo, product, serial = _VENDOR_FORMAT.unpack_from(edid, offset)
+
+  name = None
+  for start in _DESCRIPTOR_STARTS:
+    start += offset
+    if (edid[start + 3] == _PRODUCT_NAME_TAG and not edid[start] and
+        not edid[start + 1] and not edid[start + 2]):
+      # As descriptor.StringDescriptor.string, up to the first 0x0A
+      name = str(edid[start + 5:start + 18]).partition('\n')[0]
+      break
+
+  return Summary(
+      _GetManufacturerId((m_hi << 8) + m_lo), product, serial or None, name,
+      _GetPreferredTiming(edid, offset + _DESCRIPTOR_STARTS[0]))
@@ -0,0 +1,109 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for summary.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import random
+import unittest
+
+import descriptor
+import edid
+import summary
+import unittest_util
+
+
+# The vendor/product section and the four descriptors, the bytes GetSummary
+# reads
+_READ_OFFSETS = range(0x08, 0x12) + range(0x36, 0x7E)
+
+# A Display Product Name descriptor, 'PANEL' padded as the standard asks
+_NAME = bytearray([0x00, 0x00, 0x00, 0xFC, 0x00]) + bytearray('PANEL\n       ')
+
+
+def ExpectedSummary(e):
+  """Builds the summary of an EDID from edid.Edid and its descriptors.
+
+  Args:
+    e: The edid.Edid object.
+
+  Returns:
+    A summary.Summary record.
+  """
+  name = None
+  for desc in e.descriptors:
+    if desc.type == descriptor.TYPE_DISPLAY_PRODUCT_NAME:
+      name = desc.string
+      break
+
+  preferred = None
+  desc = e.GetDescriptor(0)
+  if desc.type == descriptor.TYPE_DETAILED_TIMING:
+    preferred = summary.PreferredTiming(
+        desc.pixel_clock, desc.h_active_pixels, desc.v_active_lines,
+        desc.interlaced, desc.refresh_rate)
+
+  return summary.Summary(e.manufacturer_id, e.product_code, e.serial_number,
+                         name, preferred)
+
+
+class GetSummaryTest(unittest.TestCase):
+  """Tests GetSummary against edid.Edid."""
+
+  def setUp(self):
+    self.edid = unittest_util.ReadTestEdid()
+
+  def testTestEdid(self):
+    s = summary.GetSummary(self.edid)
+    self.assertEqual(s, ExpectedSummary(edid.Edid(self.edid)))
+    # The product name is in the last descriptor
+    self.assertEqual(s.product_name, 'ASUS VE258')
+    self.assertEqual((s.preferred_timing.h_active_pixels,
+                      s.preferred_timing.v_active_lines), (1920, 1080))
+
+  def testNameNotFirst(self):
+    # A name in the second descriptor, before the one of test_edid
+    self.edid[0x48:0x5A] = _NAME
+    s = summary.GetSummary(self.edid)
+    self.assertEqual(s.product_name, 'PANEL')
+    self.assertEqual(s, ExpectedSummary(edid.Edid(self.edid)))
+
+  def testNoPreferredTiming(self):
+    # A name in place of the Detailed Timing Descriptor
+    self.edid[0x36:0x48] = _NAME
+    s = summary.GetSummary(self.edid)
+    self.assertIsNone(s.preferred_timing)
+    self.assertEqual(s, ExpectedSummary(edid.Edid(self.edid)))
+
+  def testUnsetSerialNumber(self):
+    self.edid[0x0C:0x10] = bytearray(4)
+    s = summary.GetSummary(self.edid)
+    self.assertIsNone(s.serial_number)
+    self.assertEqual(s, ExpectedSummary(edid.Edid(self.edid)))
+
+  def testOffset(self):
+    s = summary.GetSummary(bytearray(5) + self.edid, offset=5)
+    self.assertEqual(s, summary.GetSummary(self.edid))
+
+  def testShortEdid(self):
+    self.assertRaises(IndexError, summary.GetSummary, self.edid[:127])
+
+  def testRandomBytes(self):
+    rand = random.Random(25)
+    for _ in xrange(500):
+      blob = bytearray(self.edid)
+      for offset in rand.sample(_READ_OFFSETS, 4):
+        blob[offset] = rand.choice((0x00, 0x0A, 0xFC, rand.randrange(256)))
+      self.assertEqual(summary.GetSummary(blob),
+                       ExpectedSummary(edid.Edid(blob)),
+                       str(blob).encode('hex'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -6,6 +6,7 @@
 
 
 import collections
+import threading
 
 
 def DictFilter(alist, bits):
@@ -34,4 +35,367 @@ def ListTrueOnly(adict):
   Returns:
     A list of strings for which the boolean values were True in the dictionary.
   """
+  if isinstance(adict, FlagSet):
+    return adict.set_flags
   return [x for x in adict if adict[x]]
+
+
+class FlagTable(object):
+  """Defines the names of the flags of a bit field, in order, and their bits.
+
+  Tables are built once, at module level, and decode any number of bit fields
+  into FlagSet objects.
+  """
+
+  __slots__ = ('_flags', '_bits_by_name', '_mask')
+
+  def __init__(self, alist):
+    """Creates a FlagTable object.
+
+    Args:
+      alist: A list of tuples, with the first being a number and second a
+          string, as taken by DictFilter.
+    """
+    self._flags = tuple((x, s) for x, s in alist)
+    self._bits_by_name = dict((s, x) for x, s in alist)
+    self._mask = 0
+    for x, _ in alist:
+      self._mask |= x
+
+  @property
+  def names(self):
+    """Fetches the names of all the flags.
+
+    Returns:
+      A list of strings, in table order.
+    """
+    return [s for _, s in self._flags]
+
+  def Decode(self, bits):
+    """Decodes a bit field.
+
+    Args:
+      bits: The bits from EDID that indicate whether each flag is set.
+
+    Returns:
+      A FlagSet object.
+    """
+    return FlagSet(self, bits & self._mask)
+
+  def FromNames(self, names):
+    """Builds the set of some of the flags.
+
+    Args:
+      names: An iterable of the names of the flags that are set.
+
+    Returns:
+      A FlagSet object.
+
+    Raises:
+      KeyError: If a name is not one of the table.
+    """
+    bits = 0
+    for s in names:
+      bits |= self._bits_by_name[s]
+    return FlagSet(self, bits)
+
+
+class FlagSet(object):
+  """Defines an immutable set of flags, held as the integer of their bits.
+
+  A FlagSet is a read-only mapping with the same keys and values as the dict
+  returned by DictFilter: it maps the name of every flag of its table, set or
+  not, to whether that flag is set. The names of the flags that are set are
+  given by set_flags. Names are only looked up when asked for.
+  """
+
+  __slots__ = ('_table', '_bits')
+
+  def __init__(self, table, bits):
+    """Creates a FlagSet object.
+
+    Args:
+      table: The FlagTable of the flags.
+      bits: The integer of the bits of the flags that are set.
+    """
+    self._table = table
+    self._bits = bits
+
+  @property
+  def table(self):
+    """Fetches the table of the flags.
+
+    Returns:
+      A FlagTable object.
+    """
+    return self._table
+
+  @property
+  def bits(self):
+    """Fetches the bits of the flags that are set.
+
+    Returns:
+      An integer.
+    """
+    return self._bits
+
+  @property
+  def set_flags(self):
+    """Fetches the names of the flags that are set.
+
+    Returns:
+      A list of strings, in table order.
+    """
+    bits = self._bits
+    return [s for x, s in self._table._flags if bits & x]
+
+  def __iter__(self):
+    return (s for _, s in self._table._flags)
+
+  def __len__(self):
+    return len(self._table._flags)
+
+  def __contains__(self, name):
+    return name in self._table._bits_by_name
+
+  def __getitem__(self, name):
+    return bool(self._bits & self._table._bits_by_name[name])
+
+  def __eq__(self, other):
+    if isinstance(other, FlagSet):
+      return self._SameTable(other) and self._bits == other._bits
+    if isinstance(other, collections.Mapping):
+      return dict(self.items()) == dict(other.items())
+    return False
+
+  def __ne__(self, other):
+    return not self == other
+
+  def __hash__(self):
+    return hash((id(self._table), self._bits))
+
+  def _SameTable(self, other):
+    """Checks whether a set operation can be done with another operand.
+
+    Args:
+      other: The other operand.
+
+    Returns:
+      True if other is a FlagSet of the same table.
+    """
+    return isinstance(other, FlagSet) and other._table is self._table
+
+  def __and__(self, other):
+    if not self._SameTable(other):
+      return NotImplemented
+    return FlagSet(self._table, self._bits & other._bits)
+
+  def __or__(self, other):
+    if not self._SameTable(other):
+      return NotImplemented
+    return FlagSet(self._table, self._bits | other._bits)
+
+  def __sub__(self, other):
+    if not self._SameTable(other):
+      return NotImplemented
+    return FlagSet(self._table, self._bits & ~other._bits)
+
+  def __xor__(self, other):
+    if not self._SameTable(other):
+      return NotImplemented
+    return FlagSet(self._table, self._bits ^ other._bits)
+
+  def __repr__(self):
+    return 'FlagSet(%r)' % self.set_flags
+
+  def get(self, name, default=None):
+    """Fetches whether a flag is set, as dict.get does.
+
+    Args:
+      name: The name of the flag.
+      default: The value returned if name is not one of the table.
+
+    Returns:
+      A bool, or default.
+    """
+    x = self._table._bits_by_name.get(name)
+    return default if x is None else bool(self._bits & x)
+
+  def keys(self):
+    """Fetches the names of all the flags, as the keys of AsDict.
+
+    Returns:
+      A list of strings.
+    """
+    return self._table.names
+
+  def values(self):
+    """Fetches whether each flag is set, as the values of AsDict.
+
+    Returns:
+      A list of bools.
+    """
+    return list(self.itervalues())
+
+  def items(self):
+    """Fetches the name of each flag and whether it is set, as in AsDict.
+
+    Returns:
+      A list of tuples of a string and a bool.
+    """
+    return list(self.iteritems())
+
+  def iterkeys(self):
+    """Iterates over the names of all the flags.
+
+    Returns:
+      An iterator over strings.
+    """
+    return iter(self)
+
+  def itervalues(self):
+    """Iterates over whether each flag is set.
+
+    Returns:
+      An iterator over bools.
+    """
+    bits = self._bits
+    return (bool(bits & x) for x, _ in self._table._flags)
+
+  def iteritems(self):
+    """Iterates over the name of each flag and whether it is set.
+
+    Returns:
+      An iterator over tuples of a string and a bool.
+    """
+    bits = self._bits
+    return ((s, bool(bits & x)) for x, s in self._table._flags)
+
+  def AsDict(self):
+    """Converts the set into the dict form returned by DictFilter.
+
+    Returns:
+      A dict of strings and bools, in table order.
+    """
+    return collections.OrderedDict(self.iteritems())
+
+
+collections.Mapping.register(FlagSet)
+
+
+class CachedProperty(object):
+  """Decorator for a read-only property that is computed once per instance.
+
+  The computed value is stored in the instance's __dict__ under the property's
+  name, so later lookups find it there without calling the function again.
+  ClearCachedProperties forces it to be recomputed.
+  """
+
+  def __init__(self, func):
+    """Creates a CachedProperty object.
+
+    Args:
+      func: The method that computes the value of the property.
+    """
+    self._func = func
+    self.__name__ = func.__name__
+    self.__doc__ = func.__doc__
+
+  def __get__(self, obj, cls=None):
+    """Computes the value and stores it on the instance.
+
+    Args:
+      obj: The instance the property is looked up on, or None.
+      cls: The class the property is looked up on.
+
+    Returns:
+      The value of the property, or this object if looked up on the class.
+    """
+    if obj is None:
+      return self
+    value = obj.__dict__[self.__name__] = self._func(obj)
+    return value
+
+
+def ClearCachedProperties(obj):
+  """Discards every CachedProperty value stored on an object.
+
+  Args:
+    obj: The object whose cached values are discarded.
+  """
+  for cls in type(obj).__mro__:
+    for name, attr in vars(cls).iteritems():
+      if isinstance(attr, CachedProperty):
+        obj.__dict__.pop(name, None)
+
+
+class LruCache(object):
+  """A bounded cache that discards its least recently used entries.
+
+  Safe to share between threads.
+  """
+
+  def __init__(self, max_entries):
+    """Creates an LruCache object.
+
+    Args:
+      max_entries: The maximum number of entries held; 0 disables caching.
+    """
+    self._max_entries = max_entries
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  @property
+  def max_entries(self):
+    """Fetches the maximum number of entries held.
+
+    Returns:
+      An integer indicating the maximum number of entries.
+    """
+    return self._max_entries
+
+  def Resize(self, max_entries):
+    """Changes the maximum number of entries, discarding entries as needed.
+
+    Args:
+      max_entries: The new maximum number of entries; 0 disables caching.
+    """
+    with self._lock:
+      self._max_entries = max_entries
+      while len(self._entries) > max_entries:
+        self._entries.popitem(last=False)
+
+  def Clear(self):
+    """Discards every entry."""
+    with self._lock:
+      self._entries.clear()
+
+  def Fetch(self, key, build):
+    """Fetches the value of a key, building and adding it if it is missing.
+
+    Args:
+      key: A hashable key.
+      build: A callable with no arguments that builds the value. It is called
+          without holding the lock, so may run more than once for a key.
+
+    Returns:
+      The cached or newly built value.
+    """
+    with self._lock:
+      try:
+        value = self._entries.pop(key)
+      except KeyError:
+        pass
+      else:
+        self._entries[key] = value  # Now the most recently used
+        return value
+
+    value = build()
+
+    with self._lock:
+      if self._max_entries:
+        self._entries[key] = value
+        if len(self._entries) > self._max_entries:
+          self._entries.popitem(last=False)
+
+    return value
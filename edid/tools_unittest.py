@@ -0,0 +1,78 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for tools.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import collections
+import unittest
+
+import tools
+
+
+_FLAGS = [
+    [0x04, 'Red'],
+    [0x02, 'Green'],
+    [0x01, 'Blue']
+]
+
+_TABLE = tools.FlagTable(_FLAGS)
+
+
+class FlagSetTest(unittest.TestCase):
+  """Tests that a FlagSet is the mapping DictFilter returns."""
+
+  def testMatchesDictFilter(self):
+    for bits in xrange(0, 8):
+      flags = _TABLE.Decode(bits)
+      expected = tools.DictFilter(_FLAGS, bits)
+      self.assertEqual(list(flags), list(expected))
+      self.assertEqual(len(flags), len(expected))
+      self.assertEqual(flags.keys(), expected.keys())
+      self.assertEqual(flags.values(), expected.values())
+      self.assertEqual(flags.items(), expected.items())
+      self.assertEqual(list(flags.itervalues()), list(expected.itervalues()))
+      self.assertEqual(list(flags.iteritems()), list(expected.iteritems()))
+      self.assertEqual(flags.AsDict(), expected)
+      self.assertEqual(flags, expected)
+      for name in expected:
+        self.assertIn(name, flags)
+        self.assertEqual(flags[name], expected[name])
+        self.assertEqual(flags.get(name), expected.get(name))
+
+  def testSetFlags(self):
+    flags = _TABLE.Decode(0x05)
+    self.assertEqual(flags.set_flags, ['Red', 'Blue'])
+    self.assertEqual(tools.ListTrueOnly(flags), ['Red', 'Blue'])
+    self.assertEqual(_TABLE.FromNames(['Blue', 'Red']), flags)
+    self.assertEqual(_TABLE.Decode(0).set_flags, [])
+
+  def testUnknownName(self):
+    flags = _TABLE.Decode(0x07)
+    self.assertNotIn('Alpha', flags)
+    self.assertIsNone(flags.get('Alpha'))
+    self.assertFalse(flags.get('Alpha', False))
+    self.assertRaises(KeyError, lambda: flags['Alpha'])
+
+  def testIsMapping(self):
+    self.assertIsInstance(_TABLE.Decode(0), collections.Mapping)
+    self.assertEqual(dict(_TABLE.Decode(0x02)),
+                     {'Red': False, 'Green': True, 'Blue': False})
+
+  def testSetOperations(self):
+    a = _TABLE.Decode(0x06)
+    b = _TABLE.Decode(0x03)
+    self.assertEqual((a & b).set_flags, ['Green'])
+    self.assertEqual((a | b).set_flags, ['Red', 'Green', 'Blue'])
+    self.assertEqual((a - b).set_flags, ['Red'])
+    self.assertEqual((a ^ b).set_flags, ['Red', 'Blue'])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,76 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Provides the sample EDID and the EDID mutations shared by the unit tests."""
+
+import os
+import random
+
+
+TEST_EDID = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, 'test_edid')
+
+
+def ReadTestEdid():
+  """Reads the sample EDID of the repository.
+
+  Returns:
+    A bytearray of the bytes of test_edid.
+  """
+  with open(TEST_EDID, 'rb') as f:
+    return bytearray(f.read())
+
+
+def SetByte(blob, offset, value):
+  """Changes a byte of an EDID, keeping the checksum of its block right.
+
+  Args:
+    blob: The bytearray of the EDID, changed in place.
+    offset: The index of the byte.
+    value: The new value of the byte.
+  """
+  checksum = (offset // 128) * 128 + 127
+  blob[checksum] = (blob[checksum] + blob[offset] - value) & 0xFF
+  blob[offset] = value
+
+
+def FixChecksums(blob):
+  """Sets the checksum of every complete block of an EDID right.
+
+  Args:
+    blob: The bytearray of the EDID, changed in place.
+  """
+  for end in xrange(127, len(blob), 128):
+    blob[end] = (blob[end] - sum(blob[end - 127:end + 1])) & 0xFF
+
+
+def MutatedEdids(count, seed, offsets=None, max_changes=8, fixed=0.0):
+  """Creates copies of test_edid with a few random bytes changed.
+
+  Args:
+    count: The number of EDIDs to create.
+    seed: The seed of the random changes.
+    offsets: The sequence of the offsets of the bytes that may be changed, or
+        None for any byte.
+    max_changes: The largest number of bytes changed in each copy.
+    fixed: The share of the copies whose checksums are set right again, so
+        that checks past the checksums are reached.
+
+  Returns:
+    A list of bytearrays.
+  """
+  rand = random.Random(seed)
+  original = ReadTestEdid()
+  if offsets is None:
+    offsets = xrange(len(original))
+  blobs = []
+  for _ in xrange(count):
+    blob = bytearray(original)
+    for _ in xrange(rand.randint(1, max_changes)):
+      blob[rand.choice(offsets)] = rand.randint(0, 255)
+    if fixed and rand.random() < fixed:
+      FixChecksums(blob)
+    blobs.append(blob)
+  return blobs
@@ -3,7 +3,16 @@
 # found in the LICENSE file.
 
 
-"""Looks up Short Video Descriptor specs, listed in Video Data Block."""
+"""Looks up Short Video Descriptor specs, listed in Video Data Block.
+
+Besides the spec strings printed for each Video Identification Code (VIC),
+the timing of each video format is held as numbers, with indexes from size
+and rate and from detailed timing parameters back to VICs, so that neither
+needs any string parsing.
+"""
+
+import collections
+
 
 _svds = [
     'No Video Identification Code Available (Used with AVI InfoFrame only)',
@@ -132,3 +141,271 @@ def GetSvd(code):
     return 'Reserved for Future'
 
 
+# The timing of each video format of CEA-861-F, indexed by VIC (VIC 0 has
+# none). Horizontal values are in transmitted pixels, and vertical values in
+# lines per field, as in a Detailed Timing Descriptor. The pixel clock is in
+# kHz, at the integer refresh rate. The scan and sync column holds 'p' or 'i'
+# and the polarities of the horizontal and vertical syncs.
+#   (refresh, aspect ratio, pixel clock,
+#    h active, h sync offset, h sync pulse, h blanking,
+#    v active, v sync offset, v sync pulse, v blanking,
+#    scan and sync, pixel repetition)
+_VIC_TIMINGS = [
+    None,
+    (60, '4:3', 25200, 640, 16, 96, 160, 480, 10, 2, 45, 'p--', 1),
+    (60, '4:3', 27027, 720, 16, 62, 138, 480, 9, 6, 45, 'p--', 1),
+    (60, '16:9', 27027, 720, 16, 62, 138, 480, 9, 6, 45, 'p--', 1),
+    (60, '16:9', 74250, 1280, 110, 40, 370, 720, 5, 5, 30, 'p++', 1),
+    (60, '16:9', 74250, 1920, 88, 44, 280, 540, 2, 5, 22, 'i++', 1),
+    (60, '4:3', 27027, 1440, 38, 124, 276, 240, 4, 3, 22, 'i--', 2),
+    (60, '16:9', 27027, 1440, 38, 124, 276, 240, 4, 3, 22, 'i--', 2),
+    (60, '4:3', 27000, 1440, 38, 124, 276, 240, 4, 3, 22, 'p--', 2),
+    (60, '16:9', 27000, 1440, 38, 124, 276, 240, 4, 3, 22, 'p--', 2),
+    (60, '4:3', 54054, 2880, 76, 248, 552, 240, 4, 3, 22, 'i--', 1),
+    (60, '16:9', 54054, 2880, 76, 248, 552, 240, 4, 3, 22, 'i--', 1),
+    (60, '4:3', 54000, 2880, 76, 248, 552, 240, 4, 3, 22, 'p--', 1),
+    (60, '16:9', 54000, 2880, 76, 248, 552, 240, 4, 3, 22, 'p--', 1),
+    (60, '4:3', 54054, 1440, 32, 124, 276, 480, 9, 6, 45, 'p--', 1),
+    (60, '16:9', 54054, 1440, 32, 124, 276, 480, 9, 6, 45, 'p--', 1),
+    (60, '16:9', 148500, 1920, 88, 44, 280, 1080, 4, 5, 45, 'p++', 1),
+    (50, '4:3', 27000, 720, 12, 64, 144, 576, 5, 5, 49, 'p--', 1),
+    (50, '16:9', 27000, 720, 12, 64, 144, 576, 5, 5, 49, 'p--', 1),
+    (50, '16:9', 74250, 1280, 440, 40, 700, 720, 5, 5, 30, 'p++', 1),
+    (50, '16:9', 74250, 1920, 528, 44, 720, 540, 2, 5, 22, 'i++', 1),
+    (50, '4:3', 27000, 1440, 24, 126, 288, 288, 2, 3, 24, 'i--', 2),
+    (50, '16:9', 27000, 1440, 24, 126, 288, 288, 2, 3, 24, 'i--', 2),
+    (50, '4:3', 27000, 1440, 24, 126, 288, 288, 2, 3, 24, 'p--', 2),
+    (50, '16:9', 27000, 1440, 24, 126, 288, 288, 2, 3, 24, 'p--', 2),
+    (50, '4:3', 54000, 2880, 48, 252, 576, 288, 2, 3, 24, 'i--', 1),
+    (50, '16:9', 54000, 2880, 48, 252, 576, 288, 2, 3, 24, 'i--', 1),
+    (50, '4:3', 54000, 2880, 48, 252, 576, 288, 2, 3, 24, 'p--', 1),
+    (50, '16:9', 54000, 2880, 48, 252, 576, 288, 2, 3, 24, 'p--', 1),
+    (50, '4:3', 54000, 1440, 24, 128, 288, 576, 5, 5, 49, 'p+-', 1),
+    (50, '16:9', 54000, 1440, 24, 128, 288, 576, 5, 5, 49, 'p+-', 1),
+    (50, '16:9', 148500, 1920, 528, 44, 720, 1080, 4, 5, 45, 'p++', 1),
+    (24, '16:9', 74250, 1920, 638, 44, 830, 1080, 4, 5, 45, 'p++', 1),
+    (25, '16:9', 74250, 1920, 528, 44, 720, 1080, 4, 5, 45, 'p++', 1),
+    (30, '16:9', 74250, 1920, 88, 44, 280, 1080, 4, 5, 45, 'p++', 1),
+    (60, '4:3', 108108, 2880, 64, 248, 552, 480, 9, 6, 45, 'p--', 1),
+    (60, '16:9', 108108, 2880, 64, 248, 552, 480, 9, 6, 45, 'p--', 1),
+    (50, '4:3', 108000, 2880, 48, 256, 576, 576, 5, 5, 49, 'p--', 1),
+    (50, '16:9', 108000, 2880, 48, 256, 576, 576, 5, 5, 49, 'p--', 1),
+    (50, '16:9', 72000, 1920, 32, 168, 384, 540, 23, 5, 85, 'i+-', 1),
+    (100, '16:9', 148500, 1920, 528, 44, 720, 540, 2, 5, 22, 'i++', 1),
+    (100, '16:9', 148500, 1280, 440, 40, 700, 720, 5, 5, 30, 'p++', 1),
+    (100, '4:3', 54000, 720, 12, 64, 144, 576, 5, 5, 49, 'p--', 1),
+    (100, '16:9', 54000, 720, 12, 64, 144, 576, 5, 5, 49, 'p--', 1),
+    (100, '4:3', 54000, 1440, 24, 126, 288, 288, 2, 3, 24, 'i--', 2),
+    (100, '16:9', 54000, 1440, 24, 126, 288, 288, 2, 3, 24, 'i--', 2),
+    (120, '16:9', 148500, 1920, 88, 44, 280, 540, 2, 5, 22, 'i++', 1),
+    (120, '16:9', 148500, 1280, 110, 40, 370, 720, 5, 5, 30, 'p++', 1),
+    (120, '4:3', 54054, 720, 16, 62, 138, 480, 9, 6, 45, 'p--', 1),
+    (120, '16:9', 54054, 720, 16, 62, 138, 480, 9, 6, 45, 'p--', 1),
+    (120, '4:3', 54054, 1440, 38, 124, 276, 240, 4, 3, 22, 'i--', 2),
+    (120, '16:9', 54054, 1440, 38, 124, 276, 240, 4, 3, 22, 'i--', 2),
+    (200, '4:3', 108000, 720, 12, 64, 144, 576, 5, 5, 49, 'p--', 1),
+    (200, '16:9', 108000, 720, 12, 64, 144, 576, 5, 5, 49, 'p--', 1),
+    (200, '4:3', 108000, 1440, 24, 126, 288, 288, 2, 3, 24, 'i--', 2),
+    (200, '16:9', 108000, 1440, 24, 126, 288, 288, 2, 3, 24, 'i--', 2),
+    (240, '4:3', 108108, 720, 16, 62, 138, 480, 9, 6, 45, 'p--', 1),
+    (240, '16:9', 108108, 720, 16, 62, 138, 480, 9, 6, 45, 'p--', 1),
+    (240, '4:3', 108108, 1440, 38, 124, 276, 240, 4, 3, 22, 'i--', 2),
+    (240, '16:9', 108108, 1440, 38, 124, 276, 240, 4, 3, 22, 'i--', 2),
+    (24, '16:9', 59400, 1280, 1760, 40, 2020, 720, 5, 5, 30, 'p++', 1),
+    (25, '16:9', 74250, 1280, 2420, 40, 2680, 720, 5, 5, 30, 'p++', 1),
+    (30, '16:9', 74250, 1280, 1760, 40, 2020, 720, 5, 5, 30, 'p++', 1),
+    (120, '16:9', 297000, 1920, 88, 44, 280, 1080, 4, 5, 45, 'p++', 1),
+    (100, '16:9', 297000, 1920, 528, 44, 720, 1080, 4, 5, 45, 'p++', 1),
+    (24, '64:27', 59400, 1280, 1760, 40, 2020, 720, 5, 5, 30, 'p++', 1),
+    (25, '64:27', 74250, 1280, 2420, 40, 2680, 720, 5, 5, 30, 'p++', 1),
+    (30, '64:27', 74250, 1280, 1760, 40, 2020, 720, 5, 5, 30, 'p++', 1),
+    (50, '64:27', 74250, 1280, 440, 40, 700, 720, 5, 5, 30, 'p++', 1),
+    (60, '64:27', 74250, 1280, 110, 40, 370, 720, 5, 5, 30, 'p++', 1),
+    (100, '64:27', 148500, 1280, 440, 40, 700, 720, 5, 5, 30, 'p++', 1),
+    (120, '64:27', 148500, 1280, 110, 40, 370, 720, 5, 5, 30, 'p++', 1),
+    (24, '64:27', 74250, 1920, 638, 44, 830, 1080, 4, 5, 45, 'p++', 1),
+    (25, '64:27', 74250, 1920, 528, 44, 720, 1080, 4, 5, 45, 'p++', 1),
+    (30, '64:27', 74250, 1920, 88, 44, 280, 1080, 4, 5, 45, 'p++', 1),
+    (50, '64:27', 148500, 1920, 528, 44, 720, 1080, 4, 5, 45, 'p++', 1),
+    (60, '64:27', 148500, 1920, 88, 44, 280, 1080, 4, 5, 45, 'p++', 1),
+    (100, '64:27', 297000, 1920, 528, 44, 720, 1080, 4, 5, 45, 'p++', 1),
+    (120, '64:27', 297000, 1920, 88, 44, 280, 1080, 4, 5, 45, 'p++', 1),
+    (24, '64:27', 59400, 1680, 1360, 40, 1620, 720, 5, 5, 30, 'p++', 1),
+    (25, '64:27', 59400, 1680, 1228, 40, 1488, 720, 5, 5, 30, 'p++', 1),
+    (30, '64:27', 59400, 1680, 700, 40, 960, 720, 5, 5, 30, 'p++', 1),
+    (50, '64:27', 82500, 1680, 260, 40, 520, 720, 5, 5, 30, 'p++', 1),
+    (60, '64:27', 99000, 1680, 260, 40, 520, 720, 5, 5, 30, 'p++', 1),
+    (100, '64:27', 165000, 1680, 60, 40, 320, 720, 5, 5, 105, 'p++', 1),
+    (120, '64:27', 198000, 1680, 60, 40, 320, 720, 5, 5, 105, 'p++', 1),
+    (24, '64:27', 99000, 2560, 998, 44, 1190, 1080, 4, 5, 20, 'p++', 1),
+    (25, '64:27', 90000, 2560, 448, 44, 640, 1080, 4, 5, 45, 'p++', 1),
+    (30, '64:27', 118800, 2560, 768, 44, 960, 1080, 4, 5, 45, 'p++', 1),
+    (50, '64:27', 185625, 2560, 548, 44, 740, 1080, 4, 5, 45, 'p++', 1),
+    (60, '64:27', 198000, 2560, 248, 44, 440, 1080, 4, 5, 20, 'p++', 1),
+    (100, '64:27', 371250, 2560, 218, 44, 410, 1080, 4, 5, 170, 'p++', 1),
+    (120, '64:27', 495000, 2560, 548, 44, 740, 1080, 4, 5, 170, 'p++', 1),
+    (24, '16:9', 297000, 3840, 1276, 88, 1660, 2160, 8, 10, 90, 'p++', 1),
+    (25, '16:9', 297000, 3840, 1056, 88, 1440, 2160, 8, 10, 90, 'p++', 1),
+    (30, '16:9', 297000, 3840, 176, 88, 560, 2160, 8, 10, 90, 'p++', 1),
+    (50, '16:9', 594000, 3840, 1056, 88, 1440, 2160, 8, 10, 90, 'p++', 1),
+    (60, '16:9', 594000, 3840, 176, 88, 560, 2160, 8, 10, 90, 'p++', 1),
+    (24, '256:135', 297000, 4096, 1020, 88, 1404, 2160, 8, 10, 90, 'p++', 1),
+    (25, '256:135', 297000, 4096, 968, 88, 1184, 2160, 8, 10, 90, 'p++', 1),
+    (30, '256:135', 297000, 4096, 88, 88, 304, 2160, 8, 10, 90, 'p++', 1),
+    (50, '256:135', 594000, 4096, 968, 88, 1184, 2160, 8, 10, 90, 'p++', 1),
+    (60, '256:135', 594000, 4096, 88, 88, 304, 2160, 8, 10, 90, 'p++', 1),
+    (24, '64:27', 297000, 3840, 1276, 88, 1660, 2160, 8, 10, 90, 'p++', 1),
+    (25, '64:27', 297000, 3840, 1056, 88, 1440, 2160, 8, 10, 90, 'p++', 1),
+    (30, '64:27', 297000, 3840, 176, 88, 560, 2160, 8, 10, 90, 'p++', 1),
+    (50, '64:27', 594000, 3840, 1056, 88, 1440, 2160, 8, 10, 90, 'p++', 1),
+    (60, '64:27', 594000, 3840, 176, 88, 560, 2160, 8, 10, 90, 'p++', 1),
+]
+
+# Refresh rates that are also used at 1000/1001 of their value (59.94 Hz, etc.)
+_FRACTIONAL_RATES = frozenset([24, 30, 60, 120, 240])
+
+# The largest difference allowed between the pixel clock of a detailed timing
+# and that of a video format, as a fraction of the latter. A detailed timing
+# holds the pixel clock in units of 10 kHz, and 1000/1001 rates are about
+# 0.1% slower.
+_CLOCK_TOLERANCE = 0.005
+
+
+VideoFormat = collections.namedtuple('VideoFormat', [
+    'vic',
+    'width',  # Active pixels, before pixel repetition
+    'height',  # Active lines per frame
+    'interlaced',
+    'refresh',  # Integer refresh rate (field rate if interlaced), in Hz
+    'refresh_rates',  # Tuple of (numerator, denominator) rates, in Hz
+    'aspect_ratio',  # Picture aspect ratio, such as '16:9'
+    'pixel_clock',  # In kHz, at the integer refresh rate
+    'pixel_repetition',  # Number of times each pixel is sent
+    'h_active_pixels',
+    'h_sync_offset',
+    'h_sync_pulse',
+    'h_blanking_pixels',
+    'v_active_lines',  # Per field
+    'v_sync_offset',
+    'v_sync_pulse',
+    'v_blanking_lines',  # Per field
+    'h_sync_positive',
+    'v_sync_positive'
+])
+
+
+def _BuildVideoFormat(vic, timing):
+  """Builds the VideoFormat of a VIC from its row of the timing table.
+
+  Args:
+    vic: The integer VIC.
+    timing: The tuple of the VIC in _VIC_TIMINGS.
+
+  Returns:
+    A VideoFormat record.
+  """
+  (refresh, aspect, clock, h_active, h_offset, h_pulse, h_blank, v_active,
+   v_offset, v_pulse, v_blank, scan_sync, repetition) = timing
+  interlaced = scan_sync[0] == 'i'
+  rates = ((refresh, 1),)
+  if refresh in _FRACTIONAL_RATES:
+    rates += ((refresh * 1000, 1001),)
+  return VideoFormat(
+      vic, h_active // repetition, v_active * 2 if interlaced else v_active,
+      interlaced, refresh, rates, aspect, clock, repetition, h_active,
+      h_offset, h_pulse, h_blank, v_active, v_offset, v_pulse, v_blank,
+      scan_sync[1] == '+', scan_sync[2] == '+')
+
+
+_video_formats = [None] + [_BuildVideoFormat(vic, _VIC_TIMINGS[vic])
+                           for vic in xrange(1, len(_VIC_TIMINGS))]
+
+# The numeric mode of each VIC, as returned by GetSvdMode
+_svd_modes = [None] + [(f.width, f.height, f.refresh, f.interlaced)
+                       for f in _video_formats[1:]]
+
+# The VICs of each (width, height, refresh) and of each (h active, h blanking,
+# v active, v blanking, interlaced), in increasing order
+_vics_by_mode = {}
+_vics_by_timing = {}
+for _f in _video_formats[1:]:
+  _vics_by_mode.setdefault((_f.width, _f.height, _f.refresh), []).append(
+      _f.vic)
+  _vics_by_timing.setdefault(
+      (_f.h_active_pixels, _f.h_blanking_pixels, _f.v_active_lines,
+       _f.v_blanking_lines, _f.interlaced), []).append(_f.vic)
+del _f
+
+
+def GetVideoFormat(code):
+  """Fetches the timing of the video format for a given VIC.
+
+  Args:
+    code: An integer indicating the short video descriptor.
+
+  Returns:
+    A VideoFormat record, or None if the code is not a known video format.
+  """
+  if code < len(_video_formats):
+    return _video_formats[code]
+  else:
+    return None
+
+
+def GetSvdMode(code):
+  """Fetches the numeric mode of the Short Video Descriptor for a given code.
+
+  Args:
+    code: An integer indicating the short video descriptor.
+
+  Returns:
+    A tuple of the width, height, nominal refresh rate (in Hz) and whether the
+    mode is interlaced, or None if the code is not a known video format.
+  """
+  if code < len(_svd_modes):
+    return _svd_modes[code]
+  else:
+    return None
+
+
+def FindVics(width, height, refresh, interlaced=None):
+  """Finds the VICs of the video formats of a given size and rate.
+
+  Args:
+    width: The integer number of active pixels, before pixel repetition.
+    height: The integer number of active lines per frame.
+    refresh: The refresh rate (field rate if interlaced), in Hz. 1000/1001
+        rates, such as 59.94, match the formats of the integer rate.
+    interlaced: True or False to match only interlaced or progressive formats,
+        or None to match both.
+
+  Returns:
+    A list of integer VICs, one for each aspect ratio, in increasing order.
+  """
+  vics = _vics_by_mode.get((width, height, int(round(refresh))), [])
+  if interlaced is None:
+    return list(vics)
+  return [vic for vic in vics if _video_formats[vic].interlaced == interlaced]
+
+
+def FindDtdVics(dtd):
+  """Finds the VICs whose timing a Detailed Timing Descriptor matches.
+
+  The active and blanking sizes must match exactly, and the pixel clock must
+  be that of the integer or the 1000/1001 refresh rate.
+
+  Args:
+    dtd: A descriptor.DetailedTimingDescriptor object.
+
+  Returns:
+    A list of integer VICs, one for each aspect ratio, in increasing order.
+  """
+  vics = _vics_by_timing.get((dtd.h_active_pixels, dtd.h_blanking_pixels,
+                              dtd.v_active_lines, dtd.v_blanking_lines,
+                              dtd.interlaced))
+  if not vics:
+    return []
+  clock = dtd.pixel_clock * 1000
+  return [vic for vic in vics
+          if abs(clock - _video_formats[vic].pixel_clock) <=
+          _video_formats[vic].pixel_clock * _CLOCK_TOLERANCE]
@@ -0,0 +1,111 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Unit tests for video_block.py.
+
+Run from the top of the repository with:
+
+  python -m unittest discover -s edid -p '*_unittest.py'
+"""
+
+import re
+import unittest
+
+import descriptor
+import video_block
+
+
+# The 1920x1080 @ 60 Hz preferred timing of test_edid (148.5 MHz)
+_DTD = bytearray([0x02, 0x3A, 0x80, 0x18, 0x71, 0x38, 0x2D, 0x40, 0x58, 0x2C,
+                  0x45, 0x00, 0x0F, 0x48, 0x42, 0x00, 0x00, 0x1E])
+
+# The size, scan and refresh rate of a spec string, such as
+# '720(1440)x480i        59.94Hz/60Hz  4:3     8:9'; the last rate is the
+# integer one
+_SVD_RE = re.compile(r'(\d+)(?:\(\d+\))?x(\d+)([pi])(?:\(\d+total\))?\s+'
+                     r'(?:[\d.]+(?:Hz)?/)?([\d.]+)Hz')
+
+
+def MakeDtd(clock):
+  """Creates the 1920x1080 DTD of test_edid with another pixel clock.
+
+  Args:
+    clock: The pixel clock, in units of 10 kHz.
+
+  Returns:
+    A descriptor.DetailedTimingDescriptor object.
+  """
+  block = bytearray(_DTD)
+  block[0] = clock & 0xFF
+  block[1] = clock >> 8
+  return descriptor.GetDescriptor(block, 0, '1.4')
+
+
+class FindVicsTest(unittest.TestCase):
+  """Tests FindVics."""
+
+  def testOneFormat(self):
+    self.assertEqual(video_block.FindVics(640, 480, 60), [1])
+
+  def testAspectRatiosAndScans(self):
+    # 16:9 and 64:27, progressive, and 16:9 interlaced
+    self.assertEqual(video_block.FindVics(1920, 1080, 60), [5, 16, 76])
+    self.assertEqual(video_block.FindVics(1920, 1080, 60, interlaced=False),
+                     [16, 76])
+    self.assertEqual(video_block.FindVics(1920, 1080, 60, interlaced=True),
+                     [5])
+
+  def testPixelRepetition(self):
+    # 720(1440)x480i is sent as 1440 pixels, each twice
+    self.assertEqual(video_block.FindVics(720, 480, 60), [2, 3, 6, 7])
+    self.assertEqual(video_block.FindVics(1440, 480, 60, interlaced=True), [])
+
+  def testFractionalRate(self):
+    self.assertEqual(video_block.FindVics(1920, 1080, 59.94),
+                     video_block.FindVics(1920, 1080, 60))
+
+  def testUnknownMode(self):
+    self.assertEqual(video_block.FindVics(1920, 1080, 61), [])
+    self.assertEqual(video_block.FindVics(1920, 1200, 60), [])
+
+
+class FindDtdVicsTest(unittest.TestCase):
+  """Tests FindDtdVics."""
+
+  def testIntegerRate(self):
+    self.assertEqual(video_block.FindDtdVics(MakeDtd(14850)), [16, 76])
+
+  def testFractionalRate(self):
+    # 148.35 MHz, for 59.94 Hz
+    self.assertEqual(video_block.FindDtdVics(MakeDtd(14835)), [16, 76])
+
+  def testClockTooFar(self):
+    self.assertEqual(video_block.FindDtdVics(MakeDtd(15000)), [])
+
+
+class SvdModeTest(unittest.TestCase):
+  """Tests that GetSvdMode agrees with the spec strings of GetSvd."""
+
+  def testEveryCode(self):
+    for code in xrange(0x100):
+      mode = video_block.GetSvdMode(code)
+      match = _SVD_RE.match(video_block.GetSvd(code))
+      if not match:
+        self.assertIsNone(mode, code)
+        continue
+      width, height, scan, rate = match.groups()
+      self.assertEqual(mode, (int(width), int(height),
+                              int(round(float(rate))), scan == 'i'),
+                       video_block.GetSvd(code))
+
+  def testKnownCodes(self):
+    self.assertEqual(video_block.GetSvdMode(5), (1920, 1080, 60, True))
+    self.assertEqual(video_block.GetSvdMode(16), (1920, 1080, 60, False))
+    self.assertIsNone(video_block.GetSvdMode(0))
+    self.assertIsNone(video_block.GetSvdMode(0xFF))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,135 @@
+# Copyright 2014 The Chromium OS Authors. All rights reserved.
+# Use of this source code is governed by a BSD-style license that can be
+# found in the LICENSE file.
+
+
+"""Walks the decoded sections of an EDID once, feeding several visitors.
+
+Producing more than one result from an EDID (e.g., its errors and its JSON
+form) used to mean walking its descriptors, standard timings and extensions
+once per result. Walk goes over them once and hands each decoded object to
+every visitor in turn, so the objects are built a single time.
+
+Sections are cached on edid.Edid anyway, so the saving is small: building the
+JSON form or printing an EDID costs far more than decoding it. To check bytes
+alone, error_check.GetErrors and IsValid are faster than a walk.
+
+Typical use:
+
+  collector = error_check.ErrorCollector()
+  builder = MyBuilder()
+  visitor.Walk(e, [collector, builder])
+"""
+
+
+class Visitor(object):
+  """Defines the methods called by Walk, which do nothing by default.
+
+  Subclasses override the methods for the sections they are interested in.
+  """
+
+  @property
+  def done(self):
+    """Tells Walk whether this visitor needs to see more sections.
+
+    Returns:
+      True if the visitor has all it needs. Walk stops visiting sections once
+      every visitor is done.
+    """
+    return False
+
+  def VisitEdid(self, e):
+    """Called first, before any section of an EDID is visited.
+
+    Args:
+      e: The edid.Edid object being walked.
+    """
+    pass
+
+  def VisitStandardTiming(self, st, index):
+    """Called for each used standard timing of the base EDID.
+
+    Args:
+      st: A standard_timings.StandardTiming object.
+      index: The index (0-7) of the standard timing within the base EDID.
+    """
+    pass
+
+  def VisitDescriptor(self, desc, index):
+    """Called for each of the four descriptors of the base EDID.
+
+    Args:
+      desc: A descriptor.Descriptor object.
+      index: The index (0-3) of the descriptor within the base EDID.
+    """
+    pass
+
+  def VisitExtension(self, ext, index):
+    """Called for each extension.
+
+    Args:
+      ext: An extensions.Extension object.
+      index: The index of the extension (starting at 1).
+    """
+    pass
+
+  def EndEdid(self, e):
+    """Called last, after every section of an EDID has been visited.
+
+    Args:
+      e: The edid.Edid object being walked.
+    """
+    pass
+
+
+def Walk(e, visitors):
+  """Visits the sections of an EDID, in byte order, with several visitors.
+
+  Each section is decoded once and passed to every visitor before moving on
+  to the next. Once every visitor is done, the remaining sections are skipped
+  (and not decoded); EndEdid is still called.
+
+  Args:
+    e: The edid.Edid object.
+    visitors: A list of Visitor objects.
+  """
+  for v in visitors:
+    v.VisitEdid(e)
+
+  for x in xrange(0, 8):
+    if _Done(visitors):
+      break
+    st = e.GetStandardTiming(x)
+    if st:
+      for v in visitors:
+        v.VisitStandardTiming(st, x)
+
+  for x in xrange(0, 4):
+    if _Done(visitors):
+      break
+    desc = e.GetDescriptor(x)
+    for v in visitors:
+      v.VisitDescriptor(desc, x)
+
+  # The extension count is only read if needed: a truncated EDID has none
+  x = 1
+  while not _Done(visitors) and x <= e.extension_count:
+    ext = e.GetExtension(x)
+    for v in visitors:
+      v.VisitExtension(ext, x)
+    x += 1
+
+  for v in visitors:
+    v.EndEdid(e)
+
+
+def _Done(visitors):
+  """Checks whether every visitor is done.
+
+  Args:
+    visitors: A list of Visitor objects.
+
+  Returns:
+    True if no visitor needs to see more sections.
+  """
+  return all(v.done for v in visitors)
@@ -5,9 +5,12 @@
 # found in the LICENSE file.
 
 
+files=()
 for i in $(ls edids); do
-    if [[ $i != *.txt && ! -d $i ]]; then
-        ./edidparser parse edids/$i #> edids/extEdids/$i.txt
-        printf "\n\n\n\n\n"
+    if [[ $i != *.txt && ! -d edids/$i ]]; then
+        files+=("edids/$i")
     fi
 done
+
+# Parse all EDIDs in one interpreter, spread over one worker per CPU
+./edidparser parse -j 0 "${files[@]}"